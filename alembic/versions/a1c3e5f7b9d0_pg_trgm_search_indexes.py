@@ -0,0 +1,65 @@
+"""pg_trgm search indexes
+
+Revision ID: a1c3e5f7b9d0
+Revises: 
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.db.utils.search import TRGM_EXTENSION, TRGM_OPS, trgm_index_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f7b9d0'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# таблица -> колонка поиска (name / brand / number)
+SEARCH_COLUMNS = {
+    'material_category': 'name',
+    'gost': 'number',
+    'assortment_type': 'name',
+    'material': 'brand',
+    'operation_type': 'name',
+    'method': 'name',
+    'machine_type': 'name',
+    'machine': 'name',
+    'tooling': 'name',
+    'tool': 'name',
+}
+
+
+def _existing_tables() -> set[str]:
+    # на пустой базе таблиц ещё нет - индексы создаст миграция схемы (они есть в моделях)
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(f'CREATE EXTENSION IF NOT EXISTS {TRGM_EXTENSION}')
+    tables = _existing_tables()
+    for table, column in SEARCH_COLUMNS.items():
+        if table not in tables:
+            continue
+        op.create_index(
+            trgm_index_name(table, column),
+            table,
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: TRGM_OPS},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = _existing_tables()
+    for table, column in SEARCH_COLUMNS.items():
+        if table not in tables:
+            continue
+        op.drop_index(trgm_index_name(table, column), table_name=table, if_exists=True)
@@ -0,0 +1,36 @@
+"""refresh token previous_hash / rotated_at for reuse detection
+
+Revision ID: a7c9e1b3d5f6
+Revises: f6b8d0a2c4e5
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1b3d5f6'
+down_revision: Union[str, Sequence[str], None] = 'f6b8d0a2c4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'token' not in sa.inspect(op.get_bind()).get_table_names():
+        # на пустой базе таблицу создаст миграция схемы
+        return
+    # у действующих сессий предыдущего токена нет - повтор до первой ротации не распознаётся
+    op.add_column('token', sa.Column('previous_hash', sa.String(64), nullable=True))
+    op.add_column('token', sa.Column('rotated_at', sa.DateTime(), nullable=True))
+    op.create_unique_constraint('token_previous_hash_key', 'token', ['previous_hash'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER TABLE token DROP CONSTRAINT IF EXISTS token_previous_hash_key')
+    op.execute('ALTER TABLE token DROP COLUMN IF EXISTS rotated_at')
+    op.execute('ALTER TABLE token DROP COLUMN IF EXISTS previous_hash')
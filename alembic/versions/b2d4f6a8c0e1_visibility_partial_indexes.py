@@ -0,0 +1,68 @@
+"""visibility partial indexes
+
+Revision ID: b2d4f6a8c0e1
+Revises: a1c3e5f7b9d0
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.db.utils.search import visibility_index_names
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c0e1'
+down_revision: Union[str, Sequence[str], None] = 'a1c3e5f7b9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# таблицы EnterpriseGeneralBase -> уникальное поле
+GENERAL_TABLES = {
+    'material_category': 'name',
+    'gost': 'number',
+    'assortment_type': 'name',
+    'operation_type': 'name',
+    'method': 'name',
+    'machine_type': 'name',
+}
+
+
+def _existing_tables() -> set[str]:
+    # на пустой базе таблиц ещё нет - индексы создаст миграция схемы (они есть в моделях)
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = _existing_tables()
+    for table, column in GENERAL_TABLES.items():
+        if table not in tables:
+            continue
+        own, general = visibility_index_names(table, column)
+        op.create_index(
+            own,
+            table,
+            ['enterprise_id', column],
+            postgresql_where=sa.text('NOT is_general'),
+            if_not_exists=True,
+        )
+        op.create_index(
+            general,
+            table,
+            [column],
+            postgresql_where=sa.text('is_general'),
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = _existing_tables()
+    for table, column in GENERAL_TABLES.items():
+        if table not in tables:
+            continue
+        for name in visibility_index_names(table, column):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,53 @@
+"""hashed refresh tokens, per-device sessions
+
+Revision ID: c3e5f7a9b1d2
+Revises: b2d4f6a8c0e1
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5f7a9b1d2'
+down_revision: Union[str, Sequence[str], None] = 'b2d4f6a8c0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# у старых токенов устройства нет - у каждой строки своё "legacy-{id}":
+# строк на пользователя могло быть несколько (создание в двух транзакциях,
+# параллельные входы), а (user_id, device_id) дальше уникальны
+LEGACY_DEVICE_PREFIX = 'legacy-'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'token' not in sa.inspect(op.get_bind()).get_table_names():
+        # на пустой базе таблицу создаст миграция схемы
+        return
+    op.add_column('token', sa.Column('device_id', sa.String(64), nullable=True))
+    op.add_column('token', sa.Column('token_hash', sa.String(64), nullable=True))
+    # действующие сессии сохраняем: sha256 от значения токена
+    op.execute(
+        f"UPDATE token SET device_id = '{LEGACY_DEVICE_PREFIX}' || id, "
+        "token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')"
+    )
+    op.alter_column('token', 'device_id', nullable=False)
+    op.alter_column('token', 'token_hash', nullable=False)
+    op.create_unique_constraint('token_token_hash_key', 'token', ['token_hash'])
+    op.create_unique_constraint('token_user_id_device_id_key', 'token', ['user_id', 'device_id'])
+    op.drop_column('token', 'token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # значения токенов не восстановить - все сессии завершаются
+    op.execute("DELETE FROM token")
+    op.add_column('token', sa.Column('token', sa.String(), nullable=False))
+    op.drop_constraint('token_user_id_device_id_key', 'token', type_='unique')
+    op.drop_constraint('token_token_hash_key', 'token', type_='unique')
+    op.drop_column('token', 'token_hash')
+    op.drop_column('token', 'device_id')
@@ -0,0 +1,72 @@
+"""unique (enterprise_id, name) for operation types, methods, machines, toolings, tools
+
+Revision ID: d4f6a8c0e2b3
+Revises: c3e5f7a9b1d2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6a8c0e2b3'
+down_revision: Union[str, Sequence[str], None] = 'c3e5f7a9b1d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# в machines.py ограничения были обёрнуты в tuple(...) и в схему не попадали
+UNIQUE_NAMES = {
+    'operation_type': 'uq_operationtype_enterprise_name',
+    'method': 'uq_method_enterprise_name',
+    'machine_type': 'uq_machinetype_enterprise_name',
+    'machine': 'uq_machine_enterprise_name',
+    'tooling': 'uq_tooling_enterprise_name',
+    'tool': 'uq_tool_enterprise_name',
+}
+
+
+def _missing() -> dict[str, str]:
+    # на пустой базе таблиц ещё нет - ограничения создаст миграция схемы (они есть в моделях)
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    return {
+        table: name
+        for table, name in UNIQUE_NAMES.items()
+        if table in tables and name not in {c['name'] for c in inspector.get_unique_constraints(table)}
+    }
+
+
+def _check_duplicates(table: str) -> None:
+    # общие строки (enterprise_id IS NULL) ограничению не мешают - NULL не равен NULL
+    duplicates = op.get_bind().execute(sa.text(
+        f"SELECT enterprise_id, name, count(*) FROM {table} "
+        "WHERE enterprise_id IS NOT NULL "
+        "GROUP BY enterprise_id, name HAVING count(*) > 1 "
+        "ORDER BY enterprise_id, name LIMIT 10"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"(enterprise_id={eid}, name={name!r}) x{count}" for eid, name, count in duplicates)
+        raise RuntimeError(
+            f"{table}: duplicate names, rename or delete them before this migration: {listed}"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    missing = _missing()
+    # сначала проверяем все таблицы - чтобы не упасть на середине
+    for table in missing:
+        _check_duplicates(table)
+    for table, name in missing.items():
+        op.create_unique_constraint(name, table, ['enterprise_id', 'name'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, name in UNIQUE_NAMES.items():
+        if table in tables:
+            op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}')
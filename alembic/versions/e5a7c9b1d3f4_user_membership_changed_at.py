@@ -0,0 +1,34 @@
+"""user.membership_changed_at for durable claims revocation
+
+Revision ID: e5a7c9b1d3f4
+Revises: d4f6a8c0e2b3
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9b1d3f4'
+down_revision: Union[str, Sequence[str], None] = 'd4f6a8c0e2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'user' not in sa.inspect(op.get_bind()).get_table_names():
+        # на пустой базе таблицу создаст миграция схемы
+        return
+    # NULL - членство не менялось с момента выкладки: досылать нечего
+    op.add_column('user', sa.Column('membership_changed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_user_membership_changed_at', 'user', ['membership_changed_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP INDEX IF EXISTS ix_user_membership_changed_at')
+    op.execute('ALTER TABLE "user" DROP COLUMN IF EXISTS membership_changed_at')
@@ -13,6 +13,28 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     EXPIRES_ACCESS_TOKEN_MINUTES: int
     EXPIRES_REFRESH_TOKEN_DAYS: int
+    # сколько после ротации старый refresh токен ещё принимается (параллельный refresh из другой вкладки),
+    # позже - считается украденным, сессия устройства удаляется
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10
+    # сколько проверенных access токенов воркер держит в памяти
+    ACCESS_TOKEN_CACHE_SIZE: int = 10000
+    # bcrypt: потоки на воркер и сколько вызовов может ждать (дальше - 503)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE: int = 16
+    # скользящие окна попыток входа и регистрации (по IP и по email)
+    LOGIN_LIMIT_PER_IP: int = 20
+    LOGIN_LIMIT_PER_EMAIL: int = 5
+    LOGIN_LIMIT_WINDOW_SECONDS: int = 60
+    REGISTER_LIMIT_PER_IP: int = 5
+    REGISTER_LIMIT_PER_EMAIL: int = 3
+    REGISTER_LIMIT_WINDOW_SECONDS: int = 3600
+    # чистка истёкших refresh токенов (celery beat): период, размер пачки, пачек за запуск
+    TOKEN_SWEEP_INTERVAL_SECONDS: int = 3600
+    TOKEN_SWEEP_BATCH_SIZE: int = 1000
+    TOKEN_SWEEP_MAX_BATCHES: int = 100
+    # срок жизни пачки invite токенов: по умолчанию и максимальный
+    INVITE_TOKEN_TTL_SECONDS: int = 24 * 60 * 60
+    INVITE_TOKEN_MAX_TTL_SECONDS: int = 7 * 24 * 60 * 60
 
     # Database
     DB_USER: str
@@ -23,6 +45,32 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
     DB_URL: str
+    DB_ECHO: bool = False
+    # пул соединений (на один воркер uvicorn)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # реплики только для чтения: host:port через запятую (пусто - всё читаем с primary)
+    DB_REPLICA_HOSTS: str = ""
+    # сколько секунд не ходим в реплику после ошибки подключения
+    DB_REPLICA_RETRY_SECONDS: float = 30
+    # как часто воркер сверяет версию снимка общего справочника
+    GENERAL_CATALOG_CHECK_SECONDS: float = 10
+    LIST_CACHE_TTL_SECONDS: int = 300
+    LIST_LOCAL_MAX_SIZE: int = 1000
+    # кеш user_id -> enterprise_id: Redis (L2) и память воркера (L1)
+    # L1 сбрасывается через pub/sub, TTL - страховка
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 300
+    MEMBERSHIP_LOCAL_TTL_SECONDS: float = 60
+    MEMBERSHIP_LOCAL_MAX_SIZE: int = 10000
+    # как часто celery досылает в Redis отзыв claims по user.membership_changed_at
+    MEMBERSHIP_RESYNC_INTERVAL_SECONDS: int = 30
+    # закешированный EnterpriseOut (/enterprise/personal)
+    ENTERPRISE_CACHE_TTL_SECONDS: int = 600
+    ENTERPRISE_LOCAL_TTL_SECONDS: float = 60
+    ENTERPRISE_LOCAL_MAX_SIZE: int = 1000
 
     # Mail
     MAIL_SECRET: str
@@ -47,11 +95,19 @@ class Settings(BaseSettings):
     # Dadata
     DADATA_TOKEN: str
     DADATA_API_URL: str
+    # ответ по ИНН свежий сутки, ещё неделю отдаётся с обновлением в фоне
+    DADATA_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    DADATA_STALE_TTL_SECONDS: int = 7 * 24 * 60 * 60
 
     # Redis
     REDIS_PORT: int
     REDIS_PASSWORD: str
     REDIS_URL: str
+    # Redis недоступен или завис - не ждём дольше этого ни на подключении,
+    # ни на ответе команды, ни после коммита
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 0.5
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
+    AFTER_COMMIT_TIMEOUT_SECONDS: float = 1.0
 
     # База данных
     model_config = SettingsConfigDict(
@@ -65,5 +121,17 @@ class Settings(BaseSettings):
             f"{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def db_replica_urls(self) -> list[str]:
+        urls = []
+        for host in filter(None, (h.strip() for h in self.DB_REPLICA_HOSTS.split(","))):
+            if ":" not in host:
+                host = f"{host}:{self.DB_PORT}"
+            urls.append(
+                f"{self.DB_PROVIDER}+{self.DB_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@"
+                f"{host}/{self.DB_NAME}"
+            )
+        return urls
+
 
 settings = Settings()
@@ -6,6 +6,10 @@ until pg_isready -h db -p 5432 -U "$DB_USER"; do
   sleep 1
 done
 
+echo "Применяем миграции из репозитория (расширения, индексы)"
+
+poetry run alembic upgrade head
+
 echo "Инициализируем коммит для моделей"
 
 poetry run alembic revision --autogenerate -m "init"
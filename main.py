@@ -1,14 +1,37 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import RedirectResponse
 
 from src import handlers
+from src.auth.token import access_token_cache
+from src.db import db, request_session
+from src.db.general_catalog import general_catalog
 from src.handlers.error_handler import register_exception_handlers
-from src.logging.access import access_middleware
+from src.handlers.resources.pagination import NEXT_CURSOR_HEADER
+from src.infrastructure.redis.tiered_cache import invalidation_listener
+from src.logging.access import AccessMiddleware
 
 # from src.auth import AuthMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # движок и пул соединений живут столько же, сколько воркер
+    db.init_engine()
+    # сбросы L1 кешей от других воркеров
+    invalidation_listener.start()
+    # снимок общего справочника (is_general) - до первого запроса
+    await general_catalog.refresh()
+    yield
+    await invalidation_listener.stop()
+    await db.dispose_engine()
+
+
+# одна сессия БД (unit of work) на весь запрос
+# scope="function": коммит - после хендлера, но до отправки ответа
+app = FastAPI(lifespan=lifespan, dependencies=[Depends(request_session, scope="function")])
 
 # MIDDLEWARE - CORS
 
@@ -21,11 +44,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["*"]
+    # с allow_credentials браузер понимает "*" буквально - заголовки только списком
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Retry-After", "X-Request-Id"]
 )
 
 # MIDDLEWARE - ACCESS LOGGER
-app.middleware("http")(access_middleware)
+app.add_middleware(AccessMiddleware)
 
 # ERRORS HANDLER
 register_exception_handlers(app)
@@ -41,3 +65,14 @@ app.include_router(handlers.resource_router, prefix="/resources", )
 @app.get('/')
 def swagger():
     return RedirectResponse(url="/docs")
+
+
+@app.get('/health/db-pool', include_in_schema=False)
+def db_pool_status() -> dict:
+    return db.pool_status()
+
+
+@app.get('/health/token-cache', include_in_schema=False)
+def token_cache_status() -> dict:
+    return access_token_cache.as_dict()
+
@@ -1,19 +1,25 @@
+import logging
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jwt import ExpiredSignatureError, InvalidTokenError
+from redis.exceptions import RedisError
 
-from src.auth.token import validate_token
+from src.auth.exceptions import InvalidTokenType
+from src.auth.token import AccessClaims, decode_access_token
+from src.db.enums import MemberRole
 from src.db.models import Enterprise, EnterpriseMember
+from src.infrastructure.redis import claims_revocation, membership_cache
+
+log = logging.getLogger("auth")
 
 bearer_scheme = HTTPBearer(auto_error=False)  # не кидает сам, даёт нам решить
 
 
-def get_current_user_id(
-        request: Request,
+def get_access_claims(
         credentials: Annotated[HTTPAuthorizationCredentials | None, Security(bearer_scheme)],
-) -> int:
+) -> AccessClaims:
     if credentials is None:
         # нет токена
         raise HTTPException(
@@ -24,42 +30,85 @@ def get_current_user_id(
 
     token = credentials.credentials
     try:
-        user_id = validate_token(token)  # должен вернуть int и кидать PyJWT-исключения если токен битый/просрочен
+        claims = decode_access_token(token)  # кидает PyJWT-исключения если токен битый/просрочен
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except InvalidTokenError:
+    except (InvalidTokenError, InvalidTokenType, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    # на случай если validate_token возвращает None
-    if not isinstance(user_id, int):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token subject",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return claims
 
+
+def get_current_user_id(
+        request: Request,
+        claims: AccessClaims = Depends(get_access_claims),
+) -> int:
+    user_id = claims["user_id"]
     request.state.user_id = user_id
     return user_id
 
 
+async def trusted_claims(claims: AccessClaims) -> AccessClaims | None:
+    """
+    Claims eid/role можно использовать без БД, если членство
+    не менялось после выпуска токена (проверка в Redis)
+    :param claims: claims access токена
+    :return: claims или None - тогда идём за членством в БД
+    """
+    if claims["enterprise_id"] is None:
+        return None
+    try:
+        if await claims_revocation.is_revoked(claims["user_id"], claims["issued_at"]):
+            return None
+    except (RedisError, OSError):
+        log.warning("claims revocation unavailable", exc_info=True)
+        return None
+    return claims
+
+
 company_not_found_exception = HTTPException(
     status_code=status.HTTP_404_NOT_FOUND,
     detail="company not found"
 )
 
 
+async def get_enterprise_id(user_id: int) -> int | None:
+    """
+    Компания пользователя: память воркера -> Redis -> БД
+    Сбрасывается моделью EnterpriseMember при вступлении и выходе
+    Если Redis недоступен - запрос в БД
+    """
+    try:
+        enterprise_id = await membership_cache.get(user_id)
+        if enterprise_id is not membership_cache.MISS:
+            return enterprise_id
+    except (RedisError, OSError):
+        log.warning("membership cache unavailable", exc_info=True)
+    enterprise_id = await EnterpriseMember.get_enterprise_id_by_user_id(user_id)
+    try:
+        await membership_cache.put(user_id, enterprise_id)
+    except (RedisError, OSError):
+        log.warning("membership cache unavailable", exc_info=True)
+    return enterprise_id
+
+
 async def get_enterprise_by_user_id(
         request: Request,
+        claims: AccessClaims = Depends(get_access_claims),
         user_id: int = Depends(get_current_user_id)
 ) -> int:
-    enterprise_id = await EnterpriseMember.get_enterprise_id_by_user_id(user_id)
+    trusted = await trusted_claims(claims)
+    if trusted is not None:
+        enterprise_id = trusted["enterprise_id"]
+    else:
+        enterprise_id = await get_enterprise_id(user_id)
     if not enterprise_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -80,10 +129,34 @@ async def get_enterprise_by_owner(
     return enterprise
 
 
-async def get_enterprise_inn_by_owner(
+async def get_enterprise_id_by_owner(
+        request: Request,
+        claims: AccessClaims = Depends(get_access_claims),
+        user_id: int = Depends(get_current_user_id)
+) -> int:
+    """
+    id компании владельца: по claims eid/role, иначе запрос в БД
+    (когда нужен только id, а не вся модель)
+    """
+    trusted = await trusted_claims(claims)
+    if trusted is not None and trusted["role"] == MemberRole.OWNER.value:
+        enterprise_id = trusted["enterprise_id"]
+    else:
+        enterprise = await Enterprise.get_enterprise_by_owner(user_id)
+        if not enterprise:
+            raise company_not_found_exception
+        enterprise_id = enterprise.id
+    request.state.enterprise_id = enterprise_id
+    return enterprise_id
+
+
+async def get_invite_target_by_owner(
         user_id: int = Depends(get_current_user_id)
-) -> str:
-    inn = await Enterprise.get_enterprise_inn_by_owner(user_id)
-    if not inn:
+):
+    """
+    id, ИНН и тип компании владельца - для выдачи invite токенов
+    """
+    target = await Enterprise.get_invite_target_by_owner(user_id)
+    if not target:
         raise company_not_found_exception
-    return inn
+    return target
@@ -1,11 +1,52 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from config import settings
+from src.services.errors import ServiceUnavailable
 
 # юзается щас argon 2 - надо почитать - это будет на экзамене
 
-def hash_password(password: str) -> str:
+# bcrypt отпускает GIL - хватает потоков; ~200 мс на вызов не блокируют event loop
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+# сколько вызовов может ждать своей очереди сверх занятых потоков
+_limit = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE
+_in_flight = 0
+
+
+def _hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 
-def validate(password: str, hashed: str) -> bool:
+def _validate(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+async def _run(func, *args):
+    """
+    Выполняет bcrypt в пуле потоков
+    Очередь переполнена - сразу 503, а не минуты ожидания у всех входящих
+    """
+    global _in_flight
+    if _in_flight >= _limit:
+        raise ServiceUnavailable(
+            "Too many password checks, try again later",
+            headers={"Retry-After": "1"}
+        )
+    _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash_password, password)
+
+
+async def validate(password: str, hashed: str) -> bool:
+    return await _run(_validate, password, hashed)
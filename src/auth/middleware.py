@@ -1,9 +1,10 @@
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.exceptions import HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.auth.token import validate_token
 from src.db import models
@@ -11,24 +12,38 @@ from src.db import models
 security = HTTPBearer()
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class AuthMiddleware:
+    """
+    Чистый ASGI: кладёт пользователя по Bearer токену в request.state.user
+    (None - если заголовка нет)
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         # вся суть в получении пользователя
-        request.state.user = None
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return await call_next(request)
-        token = auth_header.split(" ")[1]
-        try:
-            user_id = validate_token(token)
-        except Exception as e:
-            return JSONResponse(status_code=401, content={"detail": str(e)})
-        # Получаем пользователя и кладём в request.state
-        user = await models.User.get(user_id)
-        if user is None:
-            return JSONResponse(status_code=401, content={"detail": "User not found"})
-        request.state.user = user
-        return await call_next(request)
+        state = scope.setdefault("state", {})
+        state["user"] = None
+        auth_header = Headers(scope=scope).get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            token = auth_header.split(" ")[1]
+            try:
+                user_id = validate_token(token)
+            except Exception as e:
+                response = JSONResponse(status_code=401, content={"detail": str(e)})
+                await response(scope, receive, send)
+                return
+            user = await models.User.get(user_id)
+            if user is None:
+                response = JSONResponse(status_code=401, content={"detail": "User not found"})
+                await response(scope, receive, send)
+                return
+            state["user"] = user
+        await self.app(scope, receive, send)
 
 
 class VerifiedUser:
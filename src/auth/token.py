@@ -1,7 +1,11 @@
+import hashlib
 import secrets
 import string
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import TypedDict
+from typing import Any, TypedDict
 
 import jwt
 
@@ -9,31 +13,140 @@ from config import settings
 from src.auth.exceptions import InvalidTokenType
 
 
-def generate_access_token(_id: int) -> str:
+def generate_access_token(
+        _id: int,
+        enterprise_id: int | None = None,
+        role: str | None = None,
+        issued_at: datetime | None = None
+) -> str:
+    """
+    Access токен
+    :param _id: id пользователя
+    :param enterprise_id: компания пользователя (claim eid)
+    :param role: роль в компании (claim role)
+    :param issued_at: момент, на который прочитано членство (по умолчанию - сейчас)
+    :return: JWT
+    """
     # utc не должно быть!
     now = datetime.now(timezone.utc)
     payload = {
         'exp': now + timedelta(minutes=settings.EXPIRES_ACCESS_TOKEN_MINUTES),
-        'iat': now,
+        'iat': issued_at or now,
         'sub': str(_id),
         'type': 'access'
     }
+    if enterprise_id is not None:
+        payload['eid'] = enterprise_id
+        payload['role'] = role
     secret_key = settings.SECRET_KEY
     token = jwt.encode(payload, secret_key, algorithm='HS256')
     return token
 
 
-def validate_token(token: str) -> int | None:
+class AccessClaims(TypedDict):
+    user_id: int
+    enterprise_id: int | None
+    role: str | None
+    issued_at: int
+
+
+ACCESS_LEEWAY = 10
+
+
+class AccessTokenCache:
+    """
+    LRU уже проверенных access токенов: один и тот же токен приходит
+    сотни раз за жизнь - подпись и claims проверяем только в первый раз
+    Ключ - sha256 токена (сами токены в памяти не держим),
+    запись живёт до exp токена (+ leeway), как и сам токен
+    get_access_claims синхронная - FastAPI зовёт её из потоков threadpool,
+    поэтому LRU и счётчики меняются только под замком
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._data: OrderedDict[bytes, tuple[float, AccessClaims]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> AccessClaims | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, claims = item
+            if expires_at <= time.time():
+                # истёк - пусть jwt.decode сам выдаст ExpiredSignatureError
+                del self._data[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, key: bytes, expires_at: float, claims: AccessClaims) -> None:
+        with self._lock:
+            self._data[key] = (expires_at, claims)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evicted += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            size, expired, evicted = len(self._data), self.expired, self.evicted
+        lookups = hits + misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "hits": hits,
+            "misses": misses,
+            "expired": expired,
+            "evicted": evicted,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+access_token_cache = AccessTokenCache(settings.ACCESS_TOKEN_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> AccessClaims:
+    key = access_token_cache.key(token)
+    claims = access_token_cache.get(key)
+    if claims is not None:
+        return claims
     payload = jwt.decode(
         token,
         settings.SECRET_KEY,
         algorithms=["HS256"],
         options={"require": ["exp", "iat", "sub", "type"]},
-        leeway=10
+        leeway=ACCESS_LEEWAY
     )
     if payload.get('type') != 'access':
         raise InvalidTokenType()
-    return int(payload['sub'])
+    enterprise_id = payload.get('eid')
+    claims: AccessClaims = {
+        "user_id": int(payload['sub']),
+        "enterprise_id": int(enterprise_id) if enterprise_id is not None else None,
+        "role": payload.get('role'),
+        "issued_at": int(payload['iat'])
+    }
+    access_token_cache.put(key, payload['exp'] + ACCESS_LEEWAY, claims)
+    return claims
+
+
+def validate_token(token: str) -> int | None:
+    return decode_access_token(token)["user_id"]
 
 
 def generate_join_email_token(enterprise_id: int, email: str) -> str:
@@ -1,6 +1,12 @@
+import asyncio
+import logging
+import time
+
 import httpx
+from redis.exceptions import RedisError
 
 from config import settings
+from src.infrastructure.redis import dadata_cache
 from src.serializers.clients import (
     DadataOrganization,
     OrganizationForm,
@@ -9,6 +15,12 @@ from src.serializers.clients import (
     OrganizationName,
     Management
 )
+from src.services.errors import ExternalServiceError
+
+log = logging.getLogger("dadata")
+
+# ИНН -> текущий запрос в DaData: параллельные запросы ждут один и тот же
+_in_flight: dict[str, asyncio.Task] = {}
 
 
 def parse_dadata_organization(dadata_response: dict) -> DadataOrganization:
@@ -37,19 +49,78 @@ def parse_dadata_organization(dadata_response: dict) -> DadataOrganization:
         ) if dadata_response.get("address") else None
     )
 
-async def suggest_company_by_inn(query: str) -> DadataOrganization:
+async def fetch_company_by_inn(query: str) -> DadataOrganization | None:
+    """
+    Запрос в DaData без кеша
+    :param query: ИНН
+    :return: организация или None, если DaData её не знает
+    """
     headers = {
         "Content-Type": "application/json",
         "Accept": "application/json",
         "Authorization": f"Token {settings.DADATA_TOKEN}"
     }
     body = {"query": query}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            settings.DADATA_API_URL,
-            headers=headers,
-            json=body
-        )
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                settings.DADATA_API_URL,
+                headers=headers,
+                json=body,
+                timeout=5
+            )
+            response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise ExternalServiceError("DaData is unavailable") from exc
     suggestions = response.json().get("suggestions", [])
-    dadata_data = suggestions[0]["data"]
-    return parse_dadata_organization(dadata_data)
+    if not suggestions:
+        return None
+    return parse_dadata_organization(suggestions[0]["data"])
+
+
+async def _fetch_and_store(query: str) -> DadataOrganization | None:
+    organization = await fetch_company_by_inn(query)
+    try:
+        await dadata_cache.put(query, organization.model_dump() if organization else None)
+    except (RedisError, OSError):
+        log.warning("dadata cache unavailable", exc_info=True)
+    return organization
+
+
+def _done(query: str, task: asyncio.Task) -> None:
+    _in_flight.pop(query, None)
+    if not task.cancelled() and task.exception() is not None:
+        log.warning("dadata request for %s failed", query, exc_info=task.exception())
+
+
+def _single_flight(query: str) -> asyncio.Task:
+    # один запрос в DaData на ИНН, сколько бы запросов ни пришло одновременно
+    task = _in_flight.get(query)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_store(query))
+        _in_flight[query] = task
+        task.add_done_callback(lambda t: _done(query, t))
+    return task
+
+
+async def suggest_company_by_inn(query: str) -> DadataOrganization | None:
+    """
+    Организация по ИНН через кеш Redis
+    Свежий ответ - из кеша, устаревший - из кеша с обновлением в фоне,
+    нет в кеше - один общий запрос в DaData на все параллельные запросы
+    :param query: ИНН
+    :return: организация или None
+    """
+    try:
+        cached = await dadata_cache.get(query)
+    except (RedisError, OSError):
+        log.warning("dadata cache unavailable", exc_info=True)
+        cached = None
+    if cached is not None:
+        data, fetched_at = cached
+        if time.time() - fetched_at >= settings.DADATA_CACHE_TTL_SECONDS:
+            # stale-while-revalidate
+            _single_flight(query)
+        return DadataOrganization.model_validate(data) if data is not None else None
+    # shield: отключение одного клиента не отменяет общий запрос
+    return await asyncio.shield(_single_flight(query))
@@ -1,2 +1,2 @@
 from src.db import db
-from src.db.func import get_session
\ No newline at end of file
+from src.db.func import get_session, get_read_session, unit_of_work, request_session, read_only_session, read_from_primary, independent_session
@@ -1,10 +1,13 @@
 from typing import TypeVar, Type, Any, List
 
-from sqlalchemy import update, select, and_
+from sqlalchemy import update, select, and_, insert, delete, exists, event, DDL
 from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Load
 
 from src.db import get_session
+from src.db.utils import orm
+from src.db.utils.search import TRGM_EXTENSION
+from src.services.errors import Conflict
 
 T = TypeVar('T', bound='Base')
 
@@ -14,6 +17,15 @@ class Base(AsyncAttrs, DeclarativeBase):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
+    @classmethod
+    def version_field(cls: Type[T]) -> str | None:
+        """
+        Колонка версии для оптимистичной блокировки
+        По умолчанию её нет - модель переопределяет, если нужно
+        :return: имя колонки или None
+        """
+        return None
+
     @classmethod
     async def get_with_session(
             cls: Type[T],
@@ -27,7 +39,7 @@ class Base(AsyncAttrs, DeclarativeBase):
     @classmethod
     async def get(cls: Type[T], id_: int) -> T | None:
         async with get_session() as session:
-            return await cls.get_with_session(id_, session)
+            return await cls.get_with_session(session, id_)
 
     @classmethod
     async def create(cls: Type[T], **kwargs: Any) -> T:
@@ -40,11 +52,40 @@ class Base(AsyncAttrs, DeclarativeBase):
             session: AsyncSession,
             **kwargs: Any
     ) -> T:
-        obj = cls(**kwargs)
-        session.add(obj)
-        await session.flush()
-        await session.refresh(obj)
-        return obj
+        """
+        INSERT ... RETURNING: один запрос вместо INSERT + SELECT (refresh)
+        Объект сразу заполнен, включая значения по умолчанию из БД
+        :param session: асинхронная сессия
+        :param kwargs: поля модели (только колонки, без relationship)
+        :return: созданная модель
+        """
+        stmt = insert(cls).values(**kwargs).returning(cls)
+        result = await session.scalars(stmt)
+        return result.one()
+
+    @classmethod
+    async def create_many(cls: Type[T], rows: List[dict[str, Any]]) -> List[T]:
+        async with get_session() as session:
+            return await cls.create_many_with_session(session, rows)
+
+    @classmethod
+    async def create_many_with_session(
+            cls: Type[T],
+            session: AsyncSession,
+            rows: List[dict[str, Any]]
+    ) -> List[T]:
+        """
+        Многострочный INSERT ... RETURNING
+        Порядок результата совпадает с порядком rows
+        :param session: асинхронная сессия
+        :param rows: список словарей с полями моделей
+        :return: созданные модели
+        """
+        if not rows:
+            return []
+        stmt = insert(cls).returning(cls, sort_by_parameter_order=True)
+        result = await session.scalars(stmt, rows)
+        return list(result.all())
 
     async def delete_with_session(self: T, session: AsyncSession) -> bool:
         await session.delete(self)
@@ -66,16 +107,12 @@ class Base(AsyncAttrs, DeclarativeBase):
             session: AsyncSession,
             **kwargs: Any
     ) -> T:
-        stmt = (
-            update(type(self))
-            .where(type(self).id == self.id)
-            .values(**kwargs)
-            .execution_options(synchronize_session='fetch')
+        obj = await type(self).update_where_with_session(
+            session,
+            [type(self).id == self.id],
+            kwargs
         )
-        await session.execute(stmt)
-        await session.flush()
-        await session.refresh(self)
-        return self
+        return obj or self
 
     async def update(self: T, **kwargs) -> T:
         async with get_session() as session:
@@ -103,3 +140,104 @@ class Base(AsyncAttrs, DeclarativeBase):
 
         result = await session.execute(stmt)
         return list(result.scalars().all())
+
+    @classmethod
+    def _has_cascade_delete(cls: Type[T]) -> bool:
+        # каскады ORM (cascade='delete') не срабатывают на DELETE без загрузки объекта
+        return any(rel.cascade.delete for rel in cls.__mapper__.relationships)
+
+    @classmethod
+    def _version_criteria(cls: Type[T], version: int | None) -> List:
+        if version is None:
+            return []
+        field = cls.version_field()
+        if field is None:
+            raise ValueError(f'{cls.__name__} has no version column')
+        return [getattr(cls, field) == version]
+
+    @classmethod
+    async def _raise_if_stale(cls: Type[T], session: AsyncSession, criteria: List) -> None:
+        """
+        Вызывается только когда условный запрос не затронул строк:
+        если строка есть, но с другой версией - это конфликт
+        """
+        stmt = select(exists().where(*criteria))
+        if (await session.execute(stmt)).scalar():
+            raise Conflict(f'{cls.__name__} was modified concurrently')
+
+    @classmethod
+    async def update_where_with_session(
+            cls: Type[T],
+            session: AsyncSession,
+            criteria: List,
+            values: dict[str, Any],
+            load_options: List[Load] | None = None,
+            version: int | None = None
+    ) -> T | None:
+        """
+        UPDATE ... WHERE ... RETURNING - один запрос вместо SELECT + UPDATE + refresh
+        :param session: асинхронная сессия
+        :param criteria: условия WHERE (id, enterprise_id и т.д.)
+        :param values: новые значения полей
+        :param load_options: зависимости, которые нужно подгрузить в ответ
+        :param version: ожидаемая версия строки (оптимистичная блокировка)
+        :return: обновлённая модель или None, если строка не найдена
+        """
+        where = [*criteria, *cls._version_criteria(version)]
+        field = cls.version_field()
+        if values and field is not None:
+            # версия растёт при любом изменении, а не только при проверке:
+            # иначе клиент с версией не заметил бы правку без неё
+            values = {**values, field: getattr(cls, field) + 1}
+        if not values:
+            stmt = select(cls).where(*where)
+        else:
+            stmt = (
+                update(cls)
+                .where(*where)
+                .values(**values)
+                .returning(cls)
+                .execution_options(populate_existing=True)
+            )
+        stmt = orm.apply_load_options(stmt, load_options)
+        result = await session.scalars(stmt)
+        obj = result.one_or_none()
+        if obj is None and version is not None:
+            await cls._raise_if_stale(session, criteria)
+        return obj
+
+    @classmethod
+    async def delete_where_with_session(
+            cls: Type[T],
+            session: AsyncSession,
+            criteria: List,
+            version: int | None = None
+    ) -> bool:
+        """
+        DELETE ... WHERE ... RETURNING id - один запрос без предварительного SELECT
+        Если у модели есть ORM-каскады, объект загружается и удаляется через сессию
+        :param session: асинхронная сессия
+        :param criteria: условия WHERE (id, enterprise_id и т.д.)
+        :param version: ожидаемая версия строки (оптимистичная блокировка)
+        :return: bool - удалена строка или нет
+        """
+        where = [*criteria, *cls._version_criteria(version)]
+        if cls._has_cascade_delete():
+            result = await session.execute(select(cls).where(*where))
+            obj = result.scalar_one_or_none()
+            deleted = obj is not None and await obj.delete_with_session(session)
+        else:
+            stmt = delete(cls).where(*where).returning(cls.id)
+            result = await session.execute(stmt)
+            deleted = result.scalar_one_or_none() is not None
+        if not deleted and version is not None:
+            await cls._raise_if_stale(session, criteria)
+        return deleted
+
+
+# индексы pg_trgm требуют расширения - создаём его до таблиц (create_all в тестах/скриптах)
+event.listen(
+    Base.metadata,
+    'before_create',
+    DDL(f'CREATE EXTENSION IF NOT EXISTS {TRGM_EXTENSION}').execute_if(dialect='postgresql')
+)
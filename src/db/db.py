@@ -1,27 +1,198 @@
 import asyncio
+import itertools
+import time
+from typing import Any
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from config import settings
 
-# Создание асинхронного движка
-async_engine = create_async_engine(settings.db_orm_url, echo=True)
 
-# Создание фабрики сессий
+class PoolStats:
+    """
+    Телеметрия пула: сколько раз брали соединение и сколько ждали
+    """
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe(self, wait: float, timed_out: bool = False) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        if timed_out:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_total": round(self.wait_total * 1000, 3),
+            "wait_ms_max": round(self.wait_max * 1000, 3),
+            "wait_ms_avg": round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+        }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул, который замеряет время ожидания соединения
+    (для новых соединений сюда входит и время подключения к БД)
+    """
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            pool_stats.observe(time.perf_counter() - t0, timed_out=True)
+            raise
+        pool_stats.observe(time.perf_counter() - t0)
+        return conn
+
+
+def create_engine(url: str | None = None) -> AsyncEngine:
+    """
+    Фабрика движка: все параметры пула берутся из настроек
+    Размер пула считается на один воркер uvicorn
+    :param url: адрес БД (по умолчанию primary)
+    :return: AsyncEngine
+    """
+    return create_async_engine(
+        url or settings.db_orm_url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+class Replica:
+    """
+    Движок реплики + отметка, до какого момента она считается недоступной
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self) -> None:
+        self.down_until = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+
+
+# Движок создаётся в lifespan приложения (или лениво - для скриптов)
+async_engine: AsyncEngine | None = None
+# реплики для чтения (пусто - читаем с primary)
+replicas: list[Replica] = []
+_replica_turn = itertools.count()
+
+# Создание фабрики сессий (bind - при инициализации движка)
 AsyncSessionLocal = async_sessionmaker(
-    bind=async_engine,
     expire_on_commit=False,
     class_=AsyncSession,
 )
 
-session = AsyncSessionLocal()
+
+def init_engine() -> AsyncEngine:
+    """
+    Создаёт движок, если его ещё нет, и привязывает к нему фабрику сессий
+    :return: AsyncEngine
+    """
+    global async_engine
+    if async_engine is None:
+        async_engine = create_engine()
+        AsyncSessionLocal.configure(bind=async_engine)
+        replicas[:] = [Replica(create_engine(url)) for url in settings.db_replica_urls]
+    return async_engine
+
+
+async def dispose_engine() -> None:
+    """
+    Закрывает все соединения пула (при остановке приложения)
+    :return: None
+    """
+    global async_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+    for replica in replicas:
+        await replica.engine.dispose()
+    replicas.clear()
+
+
+def new_session() -> AsyncSession:
+    init_engine()
+    return AsyncSessionLocal()
+
+
+async def new_read_session() -> AsyncSession:
+    """
+    Сессия только для чтения: следующая живая реплика по кругу
+    Соединение берётся сразу - если реплика не отвечает, она выключается
+    на DB_REPLICA_RETRY_SECONDS и пробуется следующая, в конце - primary
+    :return: AsyncSession
+    """
+    init_engine()
+    if replicas:
+        start = next(_replica_turn)
+        for i in range(len(replicas)):
+            replica = replicas[(start + i) % len(replicas)]
+            if not replica.healthy:
+                continue
+            session = AsyncSessionLocal(bind=replica.engine)
+            try:
+                await session.connection()
+            except (OSError, DBAPIError):
+                replica.mark_down()
+                await session.close()
+                continue
+            return session
+    return AsyncSessionLocal()
+
+
+def pool_status() -> dict[str, Any]:
+    """
+    Состояние пула соединений текущего воркера
+    :return: dict - размер, занятые соединения, overflow и время ожидания
+    """
+    if async_engine is None:
+        return {"initialized": False}
+    pool = async_engine.sync_engine.pool
+    return {
+        "initialized": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "replicas": len(replicas),
+        "replicas_healthy": sum(replica.healthy for replica in replicas),
+        **pool_stats.as_dict(),
+    }
 
 
 # Пример использования сессии
 async def test_connection():
-    async with async_engine.connect() as conn:
-        await conn.execute("SELECT 1")
+    engine = init_engine()
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
         print("Connected to database lol")
+    await dispose_engine()
 
 
 if __name__ == "__main__":
@@ -1,18 +1,329 @@
 from functools import cached_property
 from typing import TypeVar, Type, Any
 
-from sqlalchemy import ForeignKey, and_, or_, select, Boolean, exists
+from pydantic import BaseModel as PydanticModel
+from sqlalchemy import ForeignKey, and_, or_, select, Boolean, exists, update, delete, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import mapped_column, Mapped, Load
 
-from src.db import get_session
+from src.db import get_session, get_read_session
+from src.db.func import on_commit
 from src.db.base import Base
+from src.db.enums import SearchMode
+from src.db.general_catalog import general_catalog
 from src.db.utils import orm
+from src.db.utils.projection import projection
+from src.infrastructure.redis import list_cache
+from src.services.errors import ServiceError, Conflict, NotFound, ValidationFailed
 
 T = TypeVar('T', bound='BaseModel')
+S = TypeVar('S', bound=PydanticModel)
 
+# ошибки пакетных операций: индекс элемента во входном списке -> ошибка
+BatchErrors = dict[int, ServiceError]
 
-class EnterpriseGeneralBase(Base):
+
+class EnterpriseBatchMixin:
+    """
+    Пакетные операции для моделей компании
+    Всё в одной транзакции, многострочными запросами,
+    ошибки - по каждому элементу, а не на весь пакет
+    Модель задаёт _owned (что можно менять) и _visible_branches (среди чего проверять уникальность)
+    """
+
+    @classmethod
+    def _owned(cls, enterprise_id: int) -> list:
+        raise NotImplementedError
+
+    @classmethod
+    def _visible_branches(cls, enterprise_id: int) -> list[list]:
+        """
+        Видимые компании строки - как набор непересекающихся веток
+        (каждая обслуживается своим индексом, объединяются через UNION ALL)
+        :return: список наборов условий
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def _touch(cls, enterprise_id: int) -> None:
+        """
+        После коммита увеличивает версию закешированных списков таблицы у компании
+        (до коммита нельзя: параллельный запрос закешировал бы старые данные под новой версией)
+        Вызывать внутри get_session()
+        :param enterprise_id: id компании
+        :return: None
+        """
+        table = cls.__tablename__
+        on_commit(
+            f'list_cache:{table}:{enterprise_id}',
+            lambda: list_cache.bump_version(table, enterprise_id)
+        )
+
+    @classmethod
+    def _create_defaults(cls, enterprise_id: int) -> dict[str, Any]:
+        return {'enterprise_id': enterprise_id}
+
+    @classmethod
+    def _forbidden_fields(cls) -> set[str]:
+        return {'id', 'enterprise_id'}
+
+    @classmethod
+    def sortable_fields(cls) -> tuple[str, ...]:
+        # сортировка только по полям с индексом: id и уникальное поле модели
+        try:
+            return 'id', cls.field_name()
+        except NotImplementedError:
+            return 'id',
+
+    @classmethod
+    def check_sort_field(cls, sort_by: str | None) -> str:
+        if sort_by is None:
+            return 'id'
+        if sort_by not in cls.sortable_fields():
+            raise ValidationFailed(
+                f'sort_by must be one of {", ".join(cls.sortable_fields())}'
+            )
+        return sort_by
+
+    @classmethod
+    async def _taken_values(
+            cls,
+            session: AsyncSession,
+            enterprise_id: int,
+            values: set[Any],
+            exclude_ids: set[int] | None = None
+    ) -> set[Any]:
+        """
+        Одним запросом находит уже занятые значения уникального поля
+        """
+        if not values:
+            return set()
+        field = getattr(cls, cls.field_name())
+        branches = [
+            select(field).where(field.in_(values), *branch)
+            for branch in cls._visible_branches(enterprise_id)
+        ]
+        if exclude_ids:
+            branches = [stmt.where(cls.id.notin_(exclude_ids)) for stmt in branches]
+        stmt = branches[0] if len(branches) == 1 else union_all(*branches)
+        return set(await session.scalars(stmt))
+
+    @classmethod
+    def _check_unique_in_batch(
+            cls,
+            rows: list[tuple[int, dict[str, Any]]],
+            taken: set[Any],
+            errors: BatchErrors
+    ) -> list[tuple[int, dict[str, Any]]]:
+        # уникальное поле не должно повторяться ни в БД, ни внутри пакета
+        field_name = cls.field_name()
+        seen = set(taken)
+        result = []
+        for index, row in rows:
+            value = row.get(field_name)
+            if value is not None and value in seen:
+                errors[index] = Conflict(f'{field_name}={value!r} already exists')
+                continue
+            if value is not None:
+                seen.add(value)
+            result.append((index, row))
+        return result
+
+    @classmethod
+    def _check_versions(
+            cls,
+            rows: list[tuple[int, dict[str, Any]]],
+            versions: dict[int, int],
+            errors: BatchErrors
+    ) -> list[tuple[int, dict[str, Any]]]:
+        """
+        Оптимистичная блокировка в пакете: присланная версия должна совпадать с текущей
+        Ожидаемая версия заменяется новой - её и запишет UPDATE
+        (одна строка может встречаться в пакете несколько раз - версия растёт на каждое изменение)
+        :param rows: (индекс, строка) после остальных проверок
+        :param versions: id -> текущая версия
+        :param errors: ошибки по индексам
+        :return: прошедшие проверку строки
+        """
+        version_name = cls.version_field()
+        result = []
+        for index, row in rows:
+            row = dict(row)
+            expected = row.pop(version_name, None)
+            current = versions[row['id']]
+            if expected is not None and expected != current:
+                errors[index] = Conflict(f'{cls.__name__} {row["id"]} was modified concurrently')
+                continue
+            if row.keys() - {'id'}:
+                versions[row['id']] = row[version_name] = current + 1
+            result.append((index, row))
+        return result
+
+    @classmethod
+    async def create_many_by_enterprise(
+            cls: Type[T],
+            enterprise_id: int,
+            rows: list[dict[str, Any]],
+            load_options: list[Load] | None = None
+    ) -> tuple[list[T], BatchErrors]:
+        """
+        Пакетное создание: одна проверка уникальности + многострочный INSERT ... RETURNING
+        :param enterprise_id: id компании
+        :param rows: поля новых моделей
+        :param load_options: зависимости для ответа
+        :return: созданные модели (в порядке rows) и ошибки по индексам
+        """
+        field_name = cls.field_name()
+        errors: BatchErrors = {}
+        candidates = []
+        for index, row in enumerate(rows):
+            if cls._forbidden_fields() & row.keys():
+                errors[index] = ValidationFailed('Invalid fields')
+            elif row.get(field_name) is None:
+                errors[index] = ValidationFailed(f'{field_name} is required')
+            else:
+                candidates.append((index, row))
+
+        async with get_session() as session:
+            cls._touch(enterprise_id)
+            taken = await cls._taken_values(
+                session, enterprise_id, {row[field_name] for _, row in candidates}
+            )
+            candidates = cls._check_unique_in_batch(candidates, taken, errors)
+            objs = await cls.create_many_with_session(
+                session,
+                [{**row, **cls._create_defaults(enterprise_id)} for _, row in candidates]
+            )
+            if load_options and objs:
+                stmt = (
+                    select(cls)
+                    .where(cls.id.in_([obj.id for obj in objs]))
+                    .execution_options(populate_existing=True)
+                )
+                stmt = orm.apply_load_options(stmt, load_options)
+                loaded = {obj.id: obj for obj in await session.scalars(stmt)}
+                objs = [loaded[obj.id] for obj in objs]
+        return objs, errors
+
+    @classmethod
+    async def update_many_by_enterprise(
+            cls: Type[T],
+            enterprise_id: int,
+            rows: list[dict[str, Any]],
+            load_options: list[Load] | None = None
+    ) -> tuple[list[T], BatchErrors]:
+        """
+        Пакетное обновление по первичному ключу
+        SELECT своих id -> UPDATE (executemany) -> SELECT результата
+        :param enterprise_id: id компании
+        :param rows: словари с id и изменяемыми полями
+        :param load_options: зависимости для ответа
+        :return: обновлённые модели (в порядке rows) и ошибки по индексам
+        """
+        errors: BatchErrors = {}
+        candidates = []
+        for index, row in enumerate(rows):
+            if row.get('id') is None:
+                errors[index] = ValidationFailed('id is required')
+            elif (cls._forbidden_fields() - {'id'}) & row.keys():
+                errors[index] = ValidationFailed('Invalid fields')
+            else:
+                candidates.append((index, row))
+        ids = {row['id'] for _, row in candidates}
+
+        field_name = cls.field_name()
+        version_name = cls.version_field()
+        async with get_session() as session:
+            cls._touch(enterprise_id)
+            stmt = select(cls.id, getattr(cls, field_name)).where(cls.id.in_(ids), *cls._owned(enterprise_id))
+            versions: dict[int, int] = {}
+            if version_name is not None:
+                # строки заблокированы до коммита: версия не изменится между проверкой и UPDATE
+                stmt = stmt.add_columns(getattr(cls, version_name)).with_for_update()
+            # текущее значение уникального поля -> id строки
+            owned = {}
+            for id_, value, *version in await session.execute(stmt):
+                owned[id_] = value
+                if version:
+                    versions[id_] = version[0]
+            held = {value: id_ for id_, value in owned.items()}
+            found = []
+            for index, row in candidates:
+                value = row.get(field_name)
+                if row['id'] not in owned:
+                    errors[index] = NotFound(f'{cls.__name__} {row["id"]} not found')
+                elif value is not None and held.get(value, row['id']) != row['id']:
+                    # значение сейчас у другой строки пакета: UPDATE идут по очереди,
+                    # и обмен (A->B, B->A) упал бы на уникальном индексе посреди executemany
+                    errors[index] = Conflict(f'{field_name}={value!r} is held by another item of the batch')
+                else:
+                    found.append((index, row))
+
+            renamed = [row for _, row in found if row.get(field_name) is not None]
+            taken = await cls._taken_values(
+                session,
+                enterprise_id,
+                {row[field_name] for row in renamed},
+                exclude_ids={row['id'] for row in renamed}
+            )
+            found = cls._check_unique_in_batch(found, taken, errors)
+
+            if version_name is not None:
+                found = cls._check_versions(found, versions, errors)
+            changes = [row for _, row in found if row.keys() - {'id'}]
+            if changes:
+                await session.execute(
+                    update(cls)
+                    .where(*cls._owned(enterprise_id))
+                    .execution_options(synchronize_session=None),
+                    changes
+                )
+            objs = []
+            if found:
+                stmt = (
+                    select(cls)
+                    .where(cls.id.in_([row['id'] for _, row in found]))
+                    .execution_options(populate_existing=True)
+                )
+                stmt = orm.apply_load_options(stmt, load_options)
+                loaded = {obj.id: obj for obj in await session.scalars(stmt)}
+                objs = [loaded[row['id']] for _, row in found]
+        return objs, errors
+
+    @classmethod
+    async def delete_many_by_enterprise(
+            cls: Type[T],
+            enterprise_id: int,
+            ids: list[int]
+    ) -> tuple[list[int], BatchErrors]:
+        """
+        Пакетное удаление: DELETE ... WHERE id IN (...) RETURNING id
+        Для моделей с ORM-каскадами - загрузка и удаление через сессию
+        :param enterprise_id: id компании
+        :param ids: id удаляемых моделей
+        :return: удалённые id и ошибки по индексам ids
+        """
+        async with get_session() as session:
+            cls._touch(enterprise_id)
+            where = [cls.id.in_(ids), *cls._owned(enterprise_id)]
+            if cls._has_cascade_delete():
+                objs = list(await session.scalars(select(cls).where(*where)))
+                for obj in objs:
+                    await session.delete(obj)
+                await session.flush()
+                deleted = {obj.id for obj in objs}
+            else:
+                result = await session.scalars(delete(cls).where(*where).returning(cls.id))
+                deleted = set(result)
+        errors: BatchErrors = {
+            index: NotFound(f'{cls.__name__} {id_} not found')
+            for index, id_ in enumerate(ids)
+            if id_ not in deleted
+        }
+        return [id_ for id_ in ids if id_ in deleted], errors
+
+
+class EnterpriseGeneralBase(EnterpriseBatchMixin, Base):
     __abstract__ = True
 
     enterprise_id: Mapped[int] = mapped_column(
@@ -28,6 +339,27 @@ class EnterpriseGeneralBase(Base):
     def field_name(cls: Type[T]) -> str:
         raise NotImplementedError
 
+    @classmethod
+    def _owned(cls: Type[T], enterprise_id: int) -> list:
+        return [cls.enterprise_id == enterprise_id, cls.is_general.is_(False)]
+
+    @classmethod
+    def _visible_branches(cls: Type[T], enterprise_id: int) -> list[list]:
+        # вместо (NOT is_general AND enterprise_id = X) OR is_general:
+        # OR по разным колонкам Postgres не может взять из одного индекса
+        return [
+            [cls.enterprise_id == enterprise_id, cls.is_general.is_(False)],
+            [cls.is_general.is_(True)],
+        ]
+
+    @classmethod
+    def _create_defaults(cls: Type[T], enterprise_id: int) -> dict[str, Any]:
+        return {'enterprise_id': enterprise_id, 'is_general': False}
+
+    @classmethod
+    def _forbidden_fields(cls: Type[T]) -> set[str]:
+        return {'id', 'enterprise_id', 'is_general'}
+
     @classmethod
     async def exists_value_with_session(
             cls: Type[T],
@@ -36,13 +368,12 @@ class EnterpriseGeneralBase(Base):
             enterprise_id: int
     ) -> bool:
         field = getattr(cls, cls.field_name())  # например, cls.name
+        # EXISTS на каждую ветку - каждый по своему частичному индексу
         stmt = select(
-            exists().where(
-                or_(
-                    and_(cls.enterprise_id == enterprise_id, cls.is_general.is_(False), field == value),
-                    and_(cls.enterprise_id is None, cls.is_general.is_(True), field == value)
-                )
-            )
+            or_(*(
+                exists().where(*branch, field == value)
+                for branch in cls._visible_branches(enterprise_id)
+            ))
         )
         result = await session.execute(stmt)
         return result.scalar()
@@ -54,21 +385,16 @@ class EnterpriseGeneralBase(Base):
             enterprise_id: int,
             load_options: list[Load] | None = None,
     ) -> T | None:
-        async with get_session() as session:
+        async with get_read_session() as session:
             # запрос при котором либо общие данные, либо те которые есть у компании
+            # строка одна и берётся по первичному ключу - UNION тут не нужен
             stmt = (
                 select(cls)
                 .where(
+                    cls.id == id_,
                     or_(
-                        and_(
-                            cls.is_general.is_(False),
-                            cls.id == id_,
-                            cls.enterprise_id == enterprise_id,
-                        ),
-                        and_(
-                            cls.id == id_,
-                            cls.is_general.is_(True)
-                        )
+                        cls.is_general.is_(True),
+                        cls.enterprise_id == enterprise_id,
                     )
                 )
             )
@@ -95,6 +421,7 @@ class EnterpriseGeneralBase(Base):
             raise ValueError(f"{field_name} is required for uniqueness check")
 
         async with get_session() as session:
+            cls._touch(enterprise_id)
             if await cls.exists_value_with_session(session, field_value, enterprise_id):
                 raise ValueError(f'object is already exists')
             return await cls.create_with_session(
@@ -108,30 +435,30 @@ class EnterpriseGeneralBase(Base):
     async def delete_by_enterprise(
             cls: Type[T],
             id_: int,
-            enterprise_id: int
+            enterprise_id: int,
+            version: int | None = None
     ) -> bool:
         """
                 удаление модели, причём нельзя удалять чужие модели или общие
+                DELETE ... WHERE id AND enterprise_id AND NOT is_general RETURNING id
                 :param id_: id модели который хотим поменять
                 :param enterprise_id: id компании
+                :param version: ожидаемая версия (если у модели есть version_field)
                 :return: boolean - удалена модель или нет
         """
         async with get_session() as session:
-            stmt = (
-                select(cls)
-                .where(
-                    and_(
-                        cls.enterprise_id == enterprise_id,
-                        cls.id == id_,
-                        cls.is_general.is_(False)
-                    )
-                )
+            cls._touch(enterprise_id)
+            deleted = await cls.delete_where_with_session(
+                session,
+                [
+                    cls.id == id_,
+                    cls.enterprise_id == enterprise_id,
+                    cls.is_general.is_(False)
+                ],
+                version=version
             )
-            result = await session.execute(stmt)
-            obj = result.scalar_one_or_none()
-            if not obj:
-                raise ValueError(f'enterprise {enterprise_id} not found')
-            await obj.delete_with_session(session)
+        if not deleted:
+            raise ValueError(f'enterprise {enterprise_id} not found')
         return True
 
     @classmethod
@@ -139,34 +466,63 @@ class EnterpriseGeneralBase(Base):
             cls: Type[T],
             id_: int,
             enterprise_id: int,
+            version: int | None = None,
             **kwargs
     ) -> T:
         """
         update модели, причём нельзя менять чужие модели или общие
+        UPDATE ... WHERE id AND enterprise_id AND NOT is_general RETURNING *
         :param id_: id модели который хотим поменять
         :param enterprise_id: id компании
+        :param version: ожидаемая версия (если у модели есть version_field)
         :param kwargs: переменные модели
         :return: новая модель с полями
         """
+        if kwargs.get('is_general') or kwargs.get('enterprise_id'):
+            raise ValueError("Invalid fields")
         async with get_session() as session:
-            if kwargs.get('is_general') or kwargs.get('enterprise_id'):
-                raise ValueError("Invalid fields")
-            stmt = (
-                select(cls)
-                .where(
-                    and_(
-                        cls.id == id_,
-                        cls.enterprise_id == enterprise_id,
-                        cls.is_general.is_(False)
-                    )
-                )
+            cls._touch(enterprise_id)
+            obj = await cls.update_where_with_session(
+                session,
+                [
+                    cls.id == id_,
+                    cls.enterprise_id == enterprise_id,
+                    cls.is_general.is_(False)
+                ],
+                kwargs,
+                version=version
             )
-            result = await session.execute(stmt)
-            obj = result.scalar_one_or_none()
-            if not obj:
-                raise ValueError("Not found")
-            await obj.update_with_session(session, **kwargs)
-            return obj
+        if not obj:
+            raise ValueError("Not found")
+        return obj
+
+    @classmethod
+    def _list_stmt(
+            cls: Type[T],
+            enterprise_id: int,
+            load_options: list[Load] | None = None,
+            match: SearchMode = SearchMode.CONTAINS,
+            **kwargs: Any
+    ):
+        # UNION ALL своих и общих, ORM-сущности собираются из результата
+        union = orm.order_union(cls._list_branches(enterprise_id, match, **kwargs))
+        stmt = select(cls).from_statement(union)
+        # прикручиваем зависимости load options (только selectin/subquery)
+        return orm.apply_load_options(stmt, load_options)
+
+    @classmethod
+    def _list_branches(
+            cls: Type[T],
+            enterprise_id: int,
+            match: SearchMode = SearchMode.CONTAINS,
+            **kwargs: Any
+    ) -> list:
+        # Общие фильтры из kwargs - в каждую ветку
+        filters_from_kwargs = orm.build_filters(cls, kwargs, match)
+        return [
+            select(cls).where(*branch, *filters_from_kwargs)
+            for branch in cls._visible_branches(enterprise_id)
+        ]
 
     @classmethod
     async def list_by_enterprise(
@@ -175,30 +531,120 @@ class EnterpriseGeneralBase(Base):
             load_options: list[Load] | None = None,
             **kwargs: Any
     ) -> list[T]:
-        async with get_session() as session:
-            # Общие фильтры из kwargs
-            filters_from_kwargs = orm.build_filters(cls, kwargs)
-            stmt = select(cls).where(
-                or_(
-                    and_([
-                        cls.is_general.is_(False),
-                        cls.enterprise_id == enterprise_id,
-                        *filters_from_kwargs
-                    ]),
-                    and_([
-                        cls.is_general.is_(True),
-                        *filters_from_kwargs
-                    ])
+        async with get_read_session() as session:
+            stmt = cls._list_stmt(enterprise_id, load_options, **kwargs)
+            result = await session.execute(stmt)
+            return result.scalars().all()
+
+    @classmethod
+    async def page_by_enterprise(
+            cls: Type[T],
+            enterprise_id: int,
+            limit: int,
+            cursor: str | None = None,
+            sort_by: str | None = None,
+            descending: bool = False,
+            load_options: list[Load] | None = None,
+            **kwargs: Any
+    ) -> tuple[list[T], str | None]:
+        """
+        Страница общих + своих моделей компании (keyset по (sort_by, id))
+        :param enterprise_id: id компании
+        :param limit: размер страницы
+        :param cursor: курсор предыдущей страницы
+        :param sort_by: поле сортировки (см. sortable_fields)
+        :param descending: по убыванию
+        :param load_options: зависимости
+        :param kwargs: фильтры (+ match: режим поиска по строкам)
+        :return: модели страницы и курсор следующей (None - страница последняя)
+        """
+        sort_by = cls.check_sort_field(sort_by)
+        async with get_read_session() as session:
+            branches = cls._list_branches(enterprise_id, **kwargs)
+            union = orm.keyset_union(branches, cls, sort_by, descending, cursor, limit)
+            stmt = orm.apply_load_options(select(cls).from_statement(union), load_options)
+            result = await session.execute(stmt)
+            return orm.split_page(list(result.scalars().all()), limit, sort_by, descending)
+
+    @classmethod
+    async def page_rows_by_enterprise(
+            cls: Type[T],
+            enterprise_id: int,
+            schema: Type[S],
+            limit: int,
+            cursor: str | None = None,
+            sort_by: str | None = None,
+            descending: bool = False,
+            **kwargs: Any
+    ) -> tuple[list[S], str | None]:
+        """
+        То же, что page_by_enterprise, но read-only: выбирает только колонки схемы
+        (и many-to-one связей из неё) и собирает DTO без ORM-гидрации
+        :param enterprise_id: id компании
+        :param schema: схема *Out
+        :param limit: размер страницы
+        :param cursor: курсор предыдущей страницы
+        :param sort_by: поле сортировки (см. sortable_fields)
+        :param descending: по убыванию
+        :param kwargs: фильтры (+ match: режим поиска по строкам)
+        :return: DTO страницы и курсор следующей (None - страница последняя)
+        """
+        sort_by = cls.check_sort_field(sort_by)
+        plan = projection(cls, schema)
+        if sort_by == 'id' and not plan.joins and cls._columns_only(kwargs):
+            general = await general_catalog.get(cls, schema)
+            if general is not None:
+                return await cls._page_rows_with_catalog(
+                    enterprise_id, plan, general, limit, cursor, descending, **kwargs
                 )
-            )
-            # прикручиваем зависимости load options
-            stmt = orm.apply_load_options(stmt, load_options)
+        async with get_read_session() as session:
+            branches = [plan.apply(stmt) for stmt in cls._list_branches(enterprise_id, **kwargs)]
+            stmt = orm.keyset_union(branches, cls, sort_by, descending, cursor, limit)
+            result = await session.execute(stmt)
+            rows, next_cursor = orm.split_page(result.all(), limit, sort_by, descending)
+            return plan.build(rows), next_cursor
+
+    @classmethod
+    def _columns_only(cls: Type[T], kwargs: dict[str, Any]) -> bool:
+        # снимок хранит только колонки - фильтры по связям считает БД
+        columns = cls.__table__.columns.keys()
+        return all(
+            value is None or key == 'match' or key in columns or not hasattr(cls, key)
+            for key, value in kwargs.items()
+        )
 
+    @classmethod
+    async def _page_rows_with_catalog(
+            cls: Type[T],
+            enterprise_id: int,
+            plan,
+            general: list[tuple[dict[str, Any], S]],
+            limit: int,
+            cursor: str | None,
+            descending: bool,
+            match: SearchMode = SearchMode.CONTAINS,
+            **kwargs: Any
+    ) -> tuple[list[S], str | None]:
+        """
+        Страница по id: свои строки - из БД, общие - из снимка в памяти
+        (только по id: порядок строк в Python и в collation БД может расходиться)
+        """
+        own_branch = cls._list_branches(enterprise_id, match, **kwargs)[0]
+        async with get_read_session() as session:
+            stmt = orm.apply_keyset(plan.apply(own_branch), cls, 'id', descending, cursor, limit)
             result = await session.execute(stmt)
-            return result.scalars().all()
+            own = plan.build(result.all())
+        after = orm.decode_cursor(cursor, 'id', descending)[1] if cursor else None
+        shared = [
+            dto for row, dto in general
+            if orm.match_row(row, kwargs, match)
+            and (after is None or (row['id'] < after if descending else row['id'] > after))
+        ]
+        merged = sorted(own + shared, key=lambda dto: dto.id, reverse=descending)
+        return orm.split_page(merged[:limit + 1], limit, 'id', descending)
 
 
-class EnterpriseBase(Base):
+class EnterpriseBase(EnterpriseBatchMixin, Base):
     __abstract__ = True
 
     enterprise_id: Mapped[int] = mapped_column(
@@ -209,6 +655,18 @@ class EnterpriseBase(Base):
         nullable=False
     )
 
+    @classmethod
+    def field_name(cls: Type[T]) -> str:
+        raise NotImplementedError
+
+    @classmethod
+    def _owned(cls: Type[T], enterprise_id: int) -> list:
+        return [cls.enterprise_id == enterprise_id]
+
+    @classmethod
+    def _visible_branches(cls: Type[T], enterprise_id: int) -> list[list]:
+        return [[cls.enterprise_id == enterprise_id]]
+
     @classmethod
     async def get_by_enterprise_with_session(
             cls: Type[T],
@@ -245,7 +703,7 @@ class EnterpriseBase(Base):
             load_options: list[Load] | None = None,
             **kwargs: Any
     ) -> T | None:
-        async with get_session() as session:
+        async with get_read_session() as session:
             return await cls.get_by_enterprise_with_session(
                 id_, enterprise_id, session, load_options, **kwargs
             )
@@ -260,6 +718,7 @@ class EnterpriseBase(Base):
         if enterprise_id is None:
             raise ValueError('enterprise_id is required')
         async with get_session() as session:
+            cls._touch(enterprise_id)
             obj = await cls.create_with_session(
                 session,
                 enterprise_id=enterprise_id,
@@ -275,12 +734,26 @@ class EnterpriseBase(Base):
     async def delete_by_enterprise(
             cls: Type[T],
             id_: int,
-            enterprise_id: int
+            enterprise_id: int,
+            version: int | None = None
     ) -> bool:
-        obj = await cls.get_by_enterprise(id_, enterprise_id)
-        if not obj:
+        """
+        DELETE ... WHERE id AND enterprise_id RETURNING id - один запрос
+        :param id_: id модели
+        :param enterprise_id: id компании
+        :param version: ожидаемая версия (если у модели есть version_field)
+        :return: True
+        """
+        async with get_session() as session:
+            cls._touch(enterprise_id)
+            deleted = await cls.delete_where_with_session(
+                session,
+                [cls.id == id_, cls.enterprise_id == enterprise_id],
+                version=version
+            )
+        if not deleted:
             raise ValueError('object not found')
-        return await obj.delete()
+        return True
 
     @classmethod
     async def update_by_enterprise(
@@ -288,22 +761,48 @@ class EnterpriseBase(Base):
             id_: int,
             enterprise_id: int,
             load_options: list[Load] | None = None,
+            version: int | None = None,
             **kwargs
     ) -> T:
-        print(enterprise_id)
+        """
+        UPDATE ... WHERE id AND enterprise_id RETURNING * - один запрос,
+        зависимости из load_options подгружаются к результату
+        :param id_: id модели
+        :param enterprise_id: id компании
+        :param load_options: зависимости для ответа
+        :param version: ожидаемая версия (если у модели есть version_field)
+        :param kwargs: новые значения полей
+        :return: обновлённая модель
+        """
         async with get_session() as session:
-            obj = await cls.get_by_enterprise_with_session(
-                id_, enterprise_id, session, load_options
+            cls._touch(enterprise_id)
+            obj = await cls.update_where_with_session(
+                session,
+                [cls.id == id_, cls.enterprise_id == enterprise_id],
+                kwargs,
+                load_options=load_options,
+                version=version
             )
-            print(obj)
-            if not obj:
-                raise ValueError('enterprise not found')
-            updated = await obj.update_with_session(session, **kwargs)
-            if load_options:
-                return await cls.get_by_enterprise_with_session(
-                    updated.id, enterprise_id, session, load_options, **kwargs
-                )
-            return updated
+        if not obj:
+            raise ValueError('enterprise not found')
+        return obj
+
+    @classmethod
+    def _list_stmt(
+            cls: Type[T],
+            enterprise_id: int,
+            load_options: list[Load] | None = None,
+            match: SearchMode = SearchMode.CONTAINS,
+            **kwargs: Any
+    ):
+        # Начинаем с базового запроса
+        stmt = select(cls).where(cls.enterprise_id == enterprise_id)
+        # Добавляем фильтры по полям, которые есть в модели и переданы в kwargs
+        filters = orm.build_filters(cls, kwargs, match)
+        if filters:
+            stmt = stmt.where(*filters)
+        # прикручиваем зависимости load options
+        return orm.apply_load_options(stmt, load_options)
 
     @classmethod
     async def list_by_enterprise(
@@ -312,15 +811,68 @@ class EnterpriseBase(Base):
             load_options: list[Load] | None = None,
             **kwargs: Any,
     ) -> list[T]:
-        async with get_session() as session:
-            # Начинаем с базового запроса
-            stmt = select(cls).where(cls.enterprise_id == enterprise_id)
-            # Добавляем фильтры по полям, которые есть в модели и переданы в kwargs
-            filters = orm.build_filters(cls, kwargs)
-            if filters:
-                stmt = stmt.where(*filters)
-            # прикручиваем зависимости load options
-            stmt = orm.apply_load_options(stmt, load_options)
-
+        async with get_read_session() as session:
+            stmt = cls._list_stmt(enterprise_id, load_options, **kwargs)
             result = await session.execute(stmt)
             return result.scalars().all()
+
+    @classmethod
+    async def page_by_enterprise(
+            cls: Type[T],
+            enterprise_id: int,
+            limit: int,
+            cursor: str | None = None,
+            sort_by: str | None = None,
+            descending: bool = False,
+            load_options: list[Load] | None = None,
+            **kwargs: Any
+    ) -> tuple[list[T], str | None]:
+        """
+        Страница моделей компании (keyset по (sort_by, id))
+        :param enterprise_id: id компании
+        :param limit: размер страницы
+        :param cursor: курсор предыдущей страницы
+        :param sort_by: поле сортировки (см. sortable_fields)
+        :param descending: по убыванию
+        :param load_options: зависимости
+        :param kwargs: фильтры (+ match: режим поиска по строкам)
+        :return: модели страницы и курсор следующей (None - страница последняя)
+        """
+        sort_by = cls.check_sort_field(sort_by)
+        async with get_read_session() as session:
+            stmt = cls._list_stmt(enterprise_id, load_options, **kwargs)
+            stmt = orm.apply_keyset(stmt, cls, sort_by, descending, cursor, limit)
+            result = await session.execute(stmt)
+            return orm.split_page(list(result.scalars().all()), limit, sort_by, descending)
+
+    @classmethod
+    async def page_rows_by_enterprise(
+            cls: Type[T],
+            enterprise_id: int,
+            schema: Type[S],
+            limit: int,
+            cursor: str | None = None,
+            sort_by: str | None = None,
+            descending: bool = False,
+            **kwargs: Any
+    ) -> tuple[list[S], str | None]:
+        """
+        То же, что page_by_enterprise, но read-only: выбирает только колонки схемы
+        (и many-to-one связей из неё) и собирает DTO без ORM-гидрации
+        :param enterprise_id: id компании
+        :param schema: схема *Out
+        :param limit: размер страницы
+        :param cursor: курсор предыдущей страницы
+        :param sort_by: поле сортировки (см. sortable_fields)
+        :param descending: по убыванию
+        :param kwargs: фильтры (+ match: режим поиска по строкам)
+        :return: DTO страницы и курсор следующей (None - страница последняя)
+        """
+        sort_by = cls.check_sort_field(sort_by)
+        plan = projection(cls, schema)
+        async with get_read_session() as session:
+            stmt = plan.apply(cls._list_stmt(enterprise_id, **kwargs))
+            stmt = orm.apply_keyset(stmt, cls, sort_by, descending, cursor, limit)
+            result = await session.execute(stmt)
+            rows, next_cursor = orm.split_page(result.all(), limit, sort_by, descending)
+            return plan.build(rows), next_cursor
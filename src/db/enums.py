@@ -37,6 +37,12 @@ class MemberStatus(str, Enum):
     REMOVED = "removed"  # Был удалён админом/владельцем
 
 
+class SearchMode(str, Enum):
+    EXACT = "exact"  # точное совпадение (btree)
+    PREFIX = "prefix"  # начинается с (pg_trgm GIN)
+    CONTAINS = "contains"  # содержит (pg_trgm GIN)
+
+
 metal_type_enum = PG_ENUM(
     MetalType, name="metal_type_enum",
     create_type=False, reuse_existing=True
@@ -0,0 +1,104 @@
+"""
+EXPLAIN-бенчмарк предиката видимости EnterpriseGeneralBase
+(NOT is_general AND enterprise_id = X) OR is_general  против  UNION ALL двух веток
+
+Запуск: python -m src.db.explain_visibility [rows] [enterprises]
+Всё во временной таблице и в откатываемой транзакции - база не меняется
+"""
+import asyncio
+import sys
+
+from sqlalchemy import text
+
+from src.db import db
+
+TABLE = "bench_visibility"
+LIMIT = 101  # страница по умолчанию + 1
+
+SEED = f"""
+CREATE TEMP TABLE {TABLE} (
+    id bigserial PRIMARY KEY,
+    enterprise_id integer,
+    is_general boolean NOT NULL,
+    name varchar(200) NOT NULL
+);
+INSERT INTO {TABLE} (enterprise_id, is_general, name)
+SELECT g % :enterprises + 1, false, 'item-' || g
+FROM generate_series(1, :rows) AS g;
+INSERT INTO {TABLE} (enterprise_id, is_general, name)
+SELECT NULL, true, 'general-' || g
+FROM generate_series(1, :rows / 100) AS g;
+-- как в моделях до изменений: только уникальный (enterprise_id, name)
+CREATE UNIQUE INDEX ON {TABLE} (enterprise_id, name);
+"""
+
+PARTIAL_INDEXES = f"""
+CREATE INDEX ON {TABLE} (enterprise_id, name) WHERE NOT is_general;
+CREATE INDEX ON {TABLE} (name) WHERE is_general;
+"""
+
+QUERIES = {
+    "list (OR)": f"""
+        SELECT * FROM {TABLE}
+        WHERE (NOT is_general AND enterprise_id = :eid) OR is_general
+        ORDER BY name, id LIMIT {LIMIT}
+    """,
+    "list (UNION ALL)": f"""
+        SELECT * FROM (
+            SELECT * FROM {TABLE} WHERE enterprise_id = :eid AND NOT is_general
+            ORDER BY name, id LIMIT {LIMIT}
+        ) AS own
+        UNION ALL
+        SELECT * FROM (
+            SELECT * FROM {TABLE} WHERE is_general
+            ORDER BY name, id LIMIT {LIMIT}
+        ) AS general
+        ORDER BY name, id LIMIT {LIMIT}
+    """,
+    "exists (OR)": f"""
+        SELECT EXISTS (
+            SELECT 1 FROM {TABLE}
+            WHERE name = :name
+              AND ((NOT is_general AND enterprise_id = :eid) OR is_general)
+        )
+    """,
+    "exists (two EXISTS)": f"""
+        SELECT EXISTS (
+            SELECT 1 FROM {TABLE} WHERE enterprise_id = :eid AND NOT is_general AND name = :name
+        ) OR EXISTS (
+            SELECT 1 FROM {TABLE} WHERE is_general AND name = :name
+        )
+    """,
+}
+
+
+async def explain(conn, title: str, params: dict) -> None:
+    print(f"\n===== {title} =====")
+    for name, sql in QUERIES.items():
+        result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params)
+        plan = [row[0] for row in result]
+        print(f"\n--- {name}")
+        print("\n".join(plan))
+
+
+async def main(rows: int, enterprises: int) -> None:
+    engine = db.init_engine()
+    params = {"eid": enterprises // 2, "name": "general-7"}
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        for statement in filter(str.strip, SEED.split(";")):
+            await conn.execute(text(statement), {"rows": rows, "enterprises": enterprises})
+        await conn.execute(text(f"ANALYZE {TABLE}"))
+        await explain(conn, "before: unique (enterprise_id, name) only", params)
+
+        for statement in filter(str.strip, PARTIAL_INDEXES.split(";")):
+            await conn.execute(text(statement))
+        await conn.execute(text(f"ANALYZE {TABLE}"))
+        await explain(conn, "after: partial indexes", params)
+        await transaction.rollback()
+    await db.dispose_engine()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(args + [1_000_000, 1_000][len(args):])))
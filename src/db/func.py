@@ -1,4 +1,8 @@
-from typing import AsyncIterator
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,16 +10,200 @@ from config import settings
 from src.db import db
 from src.db.db_boundary import translate_db_errors, CONSTRAINT_MAP
 
+log = logging.getLogger("db")
 
+
+class UnitOfWork:
+    """
+    Единица работы: одна сессия и одна транзакция на весь запрос
+    Сессия открывается лениво - только при первом обращении к БД,
+    коммит делается один раз в конце
+    read_only - сессия берётся с реплики (если она настроена и жива)
+    """
+
+    def __init__(self, read_only: bool = False) -> None:
+        self.session: AsyncSession | None = None
+        self.read_only = read_only
+        # действия после успешного коммита (ключ - чтобы не повторять одно и то же)
+        self.after_commit: dict[str, Callable[[], Awaitable[None]]] = {}
+
+    async def get(self) -> AsyncSession:
+        if self.session is None:
+            self.session = await db.new_read_session() if self.read_only else db.new_session()
+        return self.session
+
+    async def commit(self) -> None:
+        if self.session is not None:
+            await self.session.commit()
+        callbacks = list(self.after_commit.items())
+        self.after_commit.clear()
+        if callbacks:
+            await self._run_after_commit(callbacks)
+
+    @staticmethod
+    async def _run_after_commit(callbacks: list[tuple[str, Callable[[], Awaitable[None]]]]) -> None:
+        # данные уже закоммичены - побочные действия (кеши, pub/sub) не ломают запрос:
+        # идут параллельно и не дольше AFTER_COMMIT_TIMEOUT_SECONDS, даже если Redis лежит
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(*(callback() for _, callback in callbacks), return_exceptions=True),
+                settings.AFTER_COMMIT_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            log.warning("after commit timed out: %s", ", ".join(key for key, _ in callbacks))
+            return
+        for (key, _), result in zip(callbacks, results):
+            if isinstance(result, Exception):
+                log.error("after commit %s failed", key, exc_info=result)
+
+    async def use_primary(self) -> None:
+        """
+        Дальнейшие чтения - с primary: реплика могла отстать,
+        а прочитанное сейчас пойдёт в кеш / под версию ETag
+        :return: None
+        """
+        if not self.read_only:
+            return
+        self.read_only = False
+        if self.session is not None:
+            # сессия реплики только читала - закрываем, следующий get() откроет primary
+            await self.session.close()
+            self.session = None
+
+    async def rollback(self) -> None:
+        if self.session is not None:
+            await self.session.rollback()
+        self.after_commit.clear()
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+# текущая единица работы (на запрос / на задачу)
+_current_uow: ContextVar[UnitOfWork | None] = ContextVar('current_uow', default=None)
+
+
+@asynccontextmanager
+async def unit_of_work(read_only: bool = False) -> AsyncIterator[UnitOfWork]:
+    """
+    Открывает единицу работы: все get_session() внутри
+    переиспользуют одну сессию, коммит - при выходе без ошибок
+    :param read_only: читать с реплики
+    :return: UnitOfWork
+    """
+    uow = UnitOfWork(read_only)
+    token = _current_uow.set(uow)
+    try:
+        yield uow
+        await uow.commit()
+    except BaseException:
+        await uow.rollback()
+        raise
+    finally:
+        await uow.close()
+        _current_uow.reset(token)
+
+
+@asynccontextmanager
 async def get_session() -> AsyncIterator[AsyncSession]:
     """
     Хендлер транзакции (не сессии)
+    Если уже открыта единица работы (запрос) - отдаёт её сессию,
+    иначе открывает свою (скрипты, celery)
     Без обработки ошибок
     :return: Транзакция -> sqlalchemy.orm. AsyncSession
     """
-    async with db.AsyncSessionLocal() as session:
-        async with session.begin():
-            yield session
+    uow = _current_uow.get()
+    if uow is not None:
+        yield await uow.get()
+        return
+    async with unit_of_work() as uow:
+        yield await uow.get()
+
+
+@asynccontextmanager
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    """
+    Сессия для методов, которые только читают
+    Внутри запроса - общая сессия запроса (чтобы видеть свои же записи),
+    вне запроса (скрипты, celery) - сессия с реплики
+    :return: AsyncSession
+    """
+    uow = _current_uow.get()
+    if uow is not None:
+        yield await uow.get()
+        return
+    async with unit_of_work(read_only=True) as uow:
+        yield await uow.get()
+
+
+@asynccontextmanager
+async def independent_session() -> AsyncIterator[AsyncSession]:
+    """
+    Своя транзакция вне единицы работы запроса:
+    коммитится сразу и не откатывается, даже если запрос потом упадёт
+    (например, отзыв сессии перед ответом 401)
+    :return: AsyncSession
+    """
+    token = _current_uow.set(None)
+    try:
+        async with unit_of_work() as uow:
+            yield await uow.get()
+    finally:
+        _current_uow.reset(token)
+
+
+def on_commit(key: str, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Выполнить callback после коммита текущей единицы работы
+    Вызывать внутри get_session() - там единица работы есть всегда
+    :param key: ключ действия - одинаковые ключи выполняются один раз
+    :param callback: корутина-функция без аргументов
+    :return: None
+    """
+    uow = _current_uow.get()
+    if uow is not None:
+        uow.after_commit[key] = callback
+
+
+async def request_session() -> AsyncIterator[None]:
+    """
+    Зависимость уровня приложения: одна единица работы на весь запрос
+    Коммит после хендлера, откат - если хендлер упал
+    Подключать с scope="function": коммит должен пройти до отправки ответа,
+    а его ошибки (IntegrityError на коммите / отложенном flush) - стать сервисными
+    :return: None
+    """
+    async with translate_db_errors(
+            constraint_map=CONSTRAINT_MAP,
+            debug_details=settings.BACKEND_DEBUG
+    ):
+        async with unit_of_work():
+            yield
+
+
+async def read_only_session() -> None:
+    """
+    Зависимость для GET-хендлеров, которые только читают:
+    сессия запроса будет открыта на реплике
+    Должна стоять до зависимостей, которые ходят в БД
+    :return: None
+    """
+    uow = _current_uow.get()
+    if uow is not None and uow.session is None:
+        uow.read_only = True
+
+
+async def read_from_primary() -> None:
+    """
+    Переключает чтения текущего запроса (read_only_session) на primary
+    :return: None
+    """
+    uow = _current_uow.get()
+    if uow is not None:
+        await uow.use_primary()
 
 
 async def get_session_tx() -> AsyncIterator[AsyncSession]:
@@ -25,20 +213,20 @@ async def get_session_tx() -> AsyncIterator[AsyncSession]:
     Маппинг SQL исключений в сервисные исключения
     :return: Транзакция -> sqlalchemy.orm. AsyncSession
     """
-    async with db.AsyncSessionLocal() as session:
-        # ВНЕШНЯЯ рамка: перевод SQL-исключений в сервисные
-        async with translate_db_errors(
-                constraint_map=CONSTRAINT_MAP,
-                debug_details=settings.BACKEND_DEBUG
-        ):
-            # ВНУТРЕННЯЯ рамка: одна транзакция на весь хендлер
-            async with session.begin():
-                yield session
+    # ВНЕШНЯЯ рамка: перевод SQL-исключений в сервисные
+    async with translate_db_errors(
+            constraint_map=CONSTRAINT_MAP,
+            debug_details=settings.BACKEND_DEBUG
+    ):
+        # ВНУТРЕННЯЯ рамка: одна транзакция на весь хендлер (общая с запросом)
+        async with get_session() as session:
+            yield session
+
 
 async def get_session_raw() -> AsyncIterator[AsyncSession]:
     """
     Хендлер для создания сессии
     :return:
     """
-    async with db.AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+    async with db.new_session() as session:
+        yield session
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from typing import Any, Type
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select
+
+from config import settings
+from src.db import db
+from src.infrastructure.redis import redis
+from src.infrastructure.redis.tiered_cache import invalidation_listener, publish
+
+log = logging.getLogger("db")
+
+# версия общего справочника: увеличивается после каждого изменения is_general строк
+VERSION_KEY = "catalog:general:version"
+
+
+async def read_version() -> int:
+    return int(await redis.get(VERSION_KEY) or 0)
+
+
+async def bump_version() -> int:
+    """
+    Сообщает всем воркерам, что общий справочник изменился
+    (transfer.py после засева, ручные правки is_general строк)
+    :return: новая версия
+    """
+    version = await redis.incr(VERSION_KEY)
+    # воркеры перечитают снимок сразу, не дожидаясь GENERAL_CATALOG_CHECK_SECONDS
+    await publish(VERSION_KEY, version)
+    return version
+
+
+class GeneralCatalog:
+    """
+    Снимок общих (is_general) строк справочников в памяти воркера
+    Строки одинаковы для всех компаний - в БД за ними ходить не нужно,
+    списки добирают из БД только строки самой компании
+    Снимок перечитывается, когда меняется версия (не чаще GENERAL_CATALOG_CHECK_SECONDS)
+    """
+
+    def __init__(self) -> None:
+        self.version: int | None = None
+        self.checked_at = float("-inf")
+        self.rows: dict[type, list[dict[str, Any]]] = {}
+        self._dtos: dict[tuple[type, type], list[BaseModel]] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def models() -> list[type]:
+        from src.db.enterprise_base import EnterpriseGeneralBase
+        return [
+            mapper.class_
+            for mapper in EnterpriseGeneralBase.registry.mappers
+            if issubclass(mapper.class_, EnterpriseGeneralBase)
+        ]
+
+    async def load(self) -> None:
+        """
+        Читает общие строки всех моделей EnterpriseGeneralBase
+        :return: None
+        """
+        rows = {}
+        # своя сессия: снимок не должен зависеть от транзакции запроса
+        async with await db.new_read_session() as session:
+            for cls in self.models():
+                stmt = select(cls.__table__).where(cls.is_general.is_(True)).order_by(cls.id)
+                result = await session.execute(stmt)
+                rows[cls] = [dict(row) for row in result.mappings()]
+        self.rows = rows
+        self._dtos = {}
+
+    async def refresh(self) -> None:
+        """
+        Перечитывает снимок, если версия изменилась
+        Если Redis или БД недоступны - остаётся текущий снимок
+        :return: None
+        """
+        if time.monotonic() - self.checked_at < settings.GENERAL_CATALOG_CHECK_SECONDS:
+            return
+        async with self._lock:
+            if time.monotonic() - self.checked_at < settings.GENERAL_CATALOG_CHECK_SECONDS:
+                return
+            try:
+                version = await read_version()
+                if version != self.version:
+                    await self.load()
+                    self.version = version
+            except Exception:
+                log.exception("general catalog refresh failed")
+            self.checked_at = time.monotonic()
+
+    def evict_local(self, key: str) -> None:
+        # сброс через pub/sub: следующий refresh сверит версию сразу
+        self.checked_at = float("-inf")
+
+    def clear_local(self) -> None:
+        self.checked_at = float("-inf")
+
+    async def get(self, cls: type, schema: Type[BaseModel]) -> list[tuple[dict[str, Any], BaseModel]] | None:
+        """
+        Общие строки модели: (колонки, DTO схемы), по возрастанию id
+        :param cls: модель EnterpriseGeneralBase
+        :param schema: схема *Out
+        :return: None, если снимка для модели нет
+        """
+        await self.refresh()
+        rows = self.rows.get(cls)
+        if rows is None:
+            return None
+        dtos = self._dtos.get((cls, schema))
+        if dtos is None:
+            dtos = TypeAdapter(list[schema]).validate_python(rows)
+            self._dtos[(cls, schema)] = dtos
+        return list(zip(rows, dtos))
+
+
+general_catalog = GeneralCatalog()
+invalidation_listener.register(VERSION_KEY, general_catalog)
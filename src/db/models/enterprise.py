@@ -1,22 +1,60 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
 from sqlalchemy import ForeignKey, String, func, DateTime, UniqueConstraint, exists
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import mapped_column, Mapped, relationship, selectinload, joinedload
+from sqlalchemy.orm import mapped_column, Mapped, relationship, selectinload, joinedload, Load
 
-from src.db import get_session
+from src.db import get_session, get_read_session
 from src.db.base import Base
+from src.db.func import on_commit
 from src.db.enums import (
     MemberStatus, member_status_enum,
     MemberRole, member_role_enum,
     EnterpriseType, enterprise_type_enum,
 )
+from src.infrastructure.redis import claims_revocation, enterprise_cache, membership_cache
 
 
-class Enterprise(Base):
+class EnterpriseAggregatePart:
+    """
+    Часть агрегата компании (EnterpriseOut): создание, изменение и удаление
+    сбрасывают закешированный ответ /enterprise/personal после коммита
+    """
+
+    @classmethod
+    async def _aggregate_id_with_session(cls, session: AsyncSession, obj) -> int | None:
+        return obj.enterprise_id
+
+    @classmethod
+    async def create_with_session(cls, session: AsyncSession, **kwargs: Any):
+        obj = await super().create_with_session(session, **kwargs)
+        Enterprise.invalidate_cache(await cls._aggregate_id_with_session(session, obj))
+        return obj
+
+    @classmethod
+    async def update_where_with_session(
+            cls,
+            session: AsyncSession,
+            criteria: list,
+            values: dict[str, Any],
+            load_options: list[Load] | None = None,
+            version: int | None = None
+    ):
+        obj = await super().update_where_with_session(session, criteria, values, load_options, version)
+        if obj is not None:
+            Enterprise.invalidate_cache(await cls._aggregate_id_with_session(session, obj))
+        return obj
+
+    async def delete_with_session(self, session: AsyncSession) -> bool:
+        Enterprise.invalidate_cache(await type(self)._aggregate_id_with_session(session, self))
+        return await super().delete_with_session(session)
+
+
+class Enterprise(EnterpriseAggregatePart, Base):
     __tablename__ = 'enterprise'
 
     owner_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
@@ -70,6 +108,9 @@ class Enterprise(Base):
         back_populates='enterprise',
         cascade='all, delete-orphan'
     )
+    # моделей GostAssortment и Assortment пока нет (их роуты тоже отключены) -
+    # связи с ними не дают сконфигурировать мапперы
+    """
     gost_assortments: Mapped[list['GostAssortment']] = relationship(
         'GostAssortment',
         back_populates='enterprise',
@@ -80,6 +121,7 @@ class Enterprise(Base):
         back_populates='enterprise',
         cascade='all, delete-orphan'
     )
+    """
 
     operation_types: Mapped[list['OperationType']] = relationship(
         'OperationType',
@@ -110,6 +152,21 @@ class Enterprise(Base):
         back_populates='enterprise'
     )
 
+    @classmethod
+    async def _aggregate_id_with_session(cls, session: AsyncSession, obj) -> int | None:
+        return obj.id
+
+    @staticmethod
+    def invalidate_cache(enterprise_id: int | None) -> None:
+        """
+        Сброс закешированного EnterpriseOut после коммита
+        Вызывать внутри get_session()
+        :param enterprise_id: id компании
+        :return: None
+        """
+        if enterprise_id is not None:
+            on_commit(f'enterprise:{enterprise_id}', lambda: enterprise_cache.invalidate(enterprise_id))
+
     async def delete_member(self, member_id: int) -> bool:
         from src.db.models import User
         async with get_session() as session:
@@ -130,6 +187,8 @@ class Enterprise(Base):
             user.is_member = False
             session.add(user)
             await session.delete(member)
+            await EnterpriseMember.membership_changed_with_session(session, member.user_id)
+            Enterprise.invalidate_cache(self.id)
         return True
 
     @classmethod
@@ -139,44 +198,45 @@ class Enterprise(Base):
             result = await session.execute(stmt)
             return result.scalar_one_or_none()
 
-    @classmethod
-    async def get_by_inn(cls, inn: str) -> Enterprise | None:
-        async with get_session() as session:
-            stmt = (
-                select(cls)
-                .options(joinedload(cls.legal_entity))
-                .where(cls.legal_entity.has(inn=inn)))
-            result = await session.execute(stmt)
-            return result.scalar_one_or_none()
-
     @staticmethod
-    async def get_enterprise_inn_by_owner(owner_id: int) -> str:
+    async def get_invite_target_by_owner(owner_id: int):
+        """
+        Для выдачи invite токенов: id, ИНН и тип компании владельца
+        :param owner_id: id владельца
+        :return: строка (id, inn, enterprise_type) или None, если ИНН нет
+        """
         async with get_session() as session:
             stmt = (
-                select(LegalEntity.inn)
-                .join(Enterprise)
+                select(Enterprise.id, LegalEntity.inn, Enterprise.enterprise_type)
+                .join(LegalEntity)
                 .where(Enterprise.owner_id == owner_id)
             )
             result = await session.execute(stmt)
-            return result.scalar_one_or_none()
+            return result.one_or_none()
 
     @classmethod
     async def get_all_data(cls, _id: int) -> Enterprise | None:
-        async with get_session() as session:
+        """
+        Компания целиком для EnterpriseOut - два запроса:
+        компания с владельцем, контактами и профилями (один к одному - JOIN)
+        и участники с пользователями (selectin)
+        :param _id: id компании
+        :return: компания или None
+        """
+        async with get_read_session() as session:
             stmt = (
                 select(cls)
                 .where(cls.id == _id)
                 .options(
                     selectinload(cls.members).joinedload(EnterpriseMember.user),
-                    selectinload(cls.owner),
-                    selectinload(cls.contact),
-                    selectinload(cls.individual_profile),
-                    selectinload(cls.legal_entity),
-                    selectinload(cls.legal_entity).selectinload(LegalEntity.legal_entity_profile)
+                    joinedload(cls.owner),
+                    joinedload(cls.contact),
+                    joinedload(cls.individual_profile),
+                    joinedload(cls.legal_entity).joinedload(LegalEntity.legal_entity_profile)
                 )
             )
             result = await session.execute(stmt)
-            return result.scalar_one_or_none()
+            return result.unique().scalar_one_or_none()
 
     def __repr__(self):
         return f"<Enterprise id={self.id} name={self.name}>"
@@ -211,6 +271,31 @@ class EnterpriseMember(Base):
         lazy="joined"
     )
 
+    @staticmethod
+    async def membership_changed_with_session(session: AsyncSession, user_id: int) -> None:
+        """
+        Членство пользователя изменилось: метка в БД (в той же транзакции),
+        после коммита - отзыв claims eid/role его access токенов и сброс закешированной компании
+        (до коммита параллельный запрос успел бы закешировать старое значение)
+        Если Redis не ответил - отзыв и сброс досылает celery по метке (membership.resync)
+        :param session: сессия
+        :param user_id: id пользователя
+        :return: None
+        """
+        from src.db.models.users import User
+        await User.mark_membership_changed_with_session(session, user_id)
+        # два независимых действия: ошибка одного не отменяет другое
+        on_commit(f'claims:{user_id}', lambda: claims_revocation.revoke(user_id))
+        on_commit(f'membership:{user_id}', lambda: membership_cache.invalidate(user_id))
+
+    @classmethod
+    async def create_with_session(cls, session: AsyncSession, **kwargs) -> EnterpriseMember:
+        # create, FillDataWorkflow и JoinEmployeeWorkflow создают членство здесь
+        obj = await super().create_with_session(session, **kwargs)
+        await cls.membership_changed_with_session(session, obj.user_id)
+        Enterprise.invalidate_cache(obj.enterprise_id)
+        return obj
+
     @staticmethod
     async def has_email_with_session(session: AsyncSession, email: str) -> bool:
         from src.db.models.users import User
@@ -235,6 +320,23 @@ class EnterpriseMember(Base):
             result = await session.execute(stmt)
         return result.scalar_one_or_none()
 
+    @classmethod
+    async def get_membership_by_user_id(cls, user_id: int) -> tuple[int, MemberRole] | None:
+        """
+        Компания и роль пользователя - для claims access токена
+        Читаем с primary: реплика может не знать о свежем вступлении/исключении
+        :param user_id: id пользователя
+        :return: (enterprise_id, role) или None
+        """
+        async with get_session() as session:
+            stmt = (
+                select(EnterpriseMember.enterprise_id, EnterpriseMember.role)
+                .where(EnterpriseMember.user_id == user_id)
+            )
+            result = await session.execute(stmt)
+            row = result.one_or_none()
+        return tuple(row) if row is not None else None
+
     @property
     def email(self) -> str:
         return self.user.email
@@ -244,7 +346,7 @@ class EnterpriseMember(Base):
 
 
 # контактная информация
-class Contact(Base):
+class Contact(EnterpriseAggregatePart, Base):
     __tablename__ = 'contact_info'
 
     enterprise_id: Mapped[int] = mapped_column(ForeignKey('enterprise.id'), nullable=False)
@@ -260,7 +362,7 @@ class Contact(Base):
 
 
 # физическое лицо
-class IndividualProfile(Base):
+class IndividualProfile(EnterpriseAggregatePart, Base):
     __tablename__ = 'profile_individual'
 
     enterprise_id: Mapped[int] = mapped_column(ForeignKey('enterprise.id'), nullable=False)
@@ -275,7 +377,7 @@ class IndividualProfile(Base):
     )
 
 
-class LegalEntity(Base):
+class LegalEntity(EnterpriseAggregatePart, Base):
     __tablename__ = 'legal_entity'
 
     enterprise_id: Mapped[int] = mapped_column(ForeignKey('enterprise.id'), nullable=False)
@@ -297,7 +399,7 @@ class LegalEntity(Base):
 
 
 # юридическое лицо - расширение (не ИП)
-class LegalEntityProfile(Base):
+class LegalEntityProfile(EnterpriseAggregatePart, Base):
     __tablename__ = 'profile_legal_entity'
 
     legal_id: Mapped[int] = mapped_column(ForeignKey('legal_entity.id'), nullable=False)
@@ -311,3 +413,9 @@ class LegalEntityProfile(Base):
         back_populates='legal_entity_profile',
         uselist=False
     )
+
+    @classmethod
+    async def _aggregate_id_with_session(cls, session: AsyncSession, obj) -> int | None:
+        # профиль привязан к юр. лицу, а не к компании
+        stmt = select(LegalEntity.enterprise_id).where(LegalEntity.id == obj.legal_id)
+        return (await session.execute(stmt)).scalar_one_or_none()
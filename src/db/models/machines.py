@@ -2,18 +2,21 @@ from sqlalchemy import String, ForeignKey, Float, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.enterprise_base import EnterpriseBase, EnterpriseGeneralBase
+from src.db.utils.search import trgm_index, visibility_indexes
 
 
 # тип операции
 class OperationType(EnterpriseGeneralBase):
     __tablename__ = 'operation_type'
 
-    __table_args__ = tuple(
+    __table_args__ = (
         UniqueConstraint(
             "enterprise_id",
             "name",
             name="uq_operationtype_enterprise_name"
         ),
+        trgm_index('operation_type', 'name'),
+        *visibility_indexes('operation_type', 'name'),
     )
 
     @classmethod
@@ -38,12 +41,14 @@ class OperationType(EnterpriseGeneralBase):
 class Method(EnterpriseGeneralBase):
     __tablename__ = 'method'
 
-    __table_args__ = tuple(
+    __table_args__ = (
         UniqueConstraint(
             'enterprise_id',
             'name',
             name="uq_method_enterprise_name"
         ),
+        trgm_index('method', 'name'),
+        *visibility_indexes('method', 'name'),
     )
 
     name: Mapped[str] = mapped_column(String(100))
@@ -80,12 +85,14 @@ class Method(EnterpriseGeneralBase):
 class MachineType(EnterpriseGeneralBase):
     __tablename__ = 'machine_type'
 
-    __table_args__ = tuple(
+    __table_args__ = (
         UniqueConstraint(
             'enterprise_id',
             'name',
             name='uq_machinetype_enterprise_name'
         ),
+        trgm_index('machine_type', 'name'),
+        *visibility_indexes('machine_type', 'name'),
     )
 
     name: Mapped[str] = mapped_column(String(100))
@@ -122,12 +129,13 @@ class MachineType(EnterpriseGeneralBase):
 class Machine(EnterpriseBase):
     __tablename__ = 'machine'
 
-    __table_args__ = tuple(
+    __table_args__ = (
         UniqueConstraint(
             'enterprise_id',
             'name',
             name='uq_machine_enterprise_name'
         ),
+        trgm_index('machine', 'name'),
     )
 
     X: Mapped[float] = mapped_column(Float)
@@ -172,12 +180,13 @@ class Machine(EnterpriseBase):
 class Tooling(EnterpriseBase):
     __tablename__ = 'tooling'
 
-    __table_args__ = tuple(
+    __table_args__ = (
         UniqueConstraint(
             'enterprise_id',
             'name',
             name='uq_tooling_enterprise_name'
         ),
+        trgm_index('tooling', 'name'),
     )
 
     h_d_foot: Mapped[float] = mapped_column(Float)
@@ -216,12 +225,13 @@ class Tooling(EnterpriseBase):
 class Tool(EnterpriseBase):
     __tablename__ = 'tool'
 
-    __table_args__ = tuple(
+    __table_args__ = (
         UniqueConstraint(
             'enterprise_id',
             'name',
             name='uq_tool_enterprise_name'
         ),
+        trgm_index('tool', 'name'),
     )
 
     K_H_D: Mapped[float] = mapped_column(Float)
@@ -1,7 +1,8 @@
-from sqlalchemy import String, ForeignKey, Float, UniqueConstraint
+from sqlalchemy import String, ForeignKey, Float, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.enterprise_base import EnterpriseBase, EnterpriseGeneralBase
+from src.db.utils.search import trgm_index, visibility_indexes
 from src.db.enums import MetalType, metal_type_enum
 
 
@@ -13,6 +14,8 @@ class MaterialCategory(EnterpriseGeneralBase):
             'enterprise_id',
             'name',
             name='uq_materialcategory_enterprise_name'),
+        trgm_index('material_category', 'name'),
+        *visibility_indexes('material_category', 'name'),
     )
 
     material_type: Mapped[MetalType] = mapped_column(metal_type_enum)
@@ -42,6 +45,8 @@ class Gost(EnterpriseGeneralBase):
             'enterprise_id',
             'number',
             name='uq_enterprise_gost_number'),
+        trgm_index('gost', 'number'),
+        *visibility_indexes('gost', 'number'),
     )
 
     @classmethod
@@ -69,6 +74,8 @@ class AssortmentType(EnterpriseGeneralBase):
             'name',
             name='uq_enterprise_assortment_type_name'
         ),
+        trgm_index('assortment_type', 'name'),
+        *visibility_indexes('assortment_type', 'name'),
     )
 
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -102,6 +109,7 @@ class Material(EnterpriseBase):
             'brand',
             name='uq_materialcategory_brand_name'
         ),
+        trgm_index('material', 'brand'),
     )
 
     brand: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -118,6 +126,17 @@ class Material(EnterpriseBase):
     comment: Mapped[str] = mapped_column(String())
     comment_en: Mapped[str] = mapped_column(String())
 
+    # оптимистичная блокировка: растёт при каждом изменении, клиент присылает прочитанную
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default='1')
+
+    @classmethod
+    def field_name(cls) -> str:
+        return 'brand'
+
+    @classmethod
+    def version_field(cls) -> str | None:
+        return 'version'
+
     category_id: Mapped[int] = mapped_column(
         ForeignKey(
             'material_category.id'
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import hashlib
 import secrets
 from datetime import datetime, timedelta
 
-from sqlalchemy import DateTime, Boolean, ForeignKey, String, func, exists
-from sqlalchemy import update, select, delete
+from sqlalchemy import DateTime, Boolean, ForeignKey, String, UniqueConstraint, func, exists, literal_column
+from sqlalchemy import update, select, delete, or_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from config import settings
 from src.auth.hash import validate, hash_password
-from src.db import get_session
+from src.db import get_session, get_read_session, independent_session
 from src.db.base import Base
+from src.services.errors import RefreshTokenExpired, RefreshTokenInvalid, RefreshTokenRevoked
 
 
 class User(Base):
@@ -22,11 +25,13 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     is_verified: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     is_member: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # последнее вступление/исключение: по нему celery досылает в Redis отзыв claims,
+    # если сброс после коммита не дошёл (timestamptz - сравнивается с iat токенов)
+    membership_changed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), index=True)
 
-    token: Mapped['RefreshToken'] = relationship(
+    tokens: Mapped[list['RefreshToken']] = relationship(
         'RefreshToken',
         back_populates='user',
-        uselist=False,
         cascade='all, delete-orphan'
     )
 
@@ -44,12 +49,14 @@ class User(Base):
         :param password: пароль
         :return: новый пользователь в системе User
         """
+        # хеш - до открытия сессии: соединение не держится, пока считается bcrypt
+        hashed = await hash_password(password)
         async with get_session() as session:
-            user = User(email=email, password=hash_password(password))
-            session.add(user)
-            await session.flush()
-            await session.refresh(user)
-        return user
+            return await cls.create_with_session(
+                session,
+                email=email,
+                password=hashed
+            )
 
     @classmethod
     async def verify_email(cls, user_id: int) -> bool:
@@ -87,7 +94,7 @@ class User(Base):
         :param email: значение
         :return: ORM User
         """
-        async with get_session() as session:
+        async with get_read_session() as session:
             stmt = select(cls).where(cls.email == email)
             result = await session.execute(stmt)
             return result.scalar_one_or_none()
@@ -113,36 +120,81 @@ class User(Base):
         :param id_: id сотрудника
         :return: вся информация об пользователе
         """
-        async with get_session() as session:
+        async with get_read_session() as session:
             stmt = select(cls).where(cls.id == id_)
             result = await session.execute(stmt)
         return result.scalars().one_or_none()
 
-    def check_password(self, password: str) -> bool:
+    async def check_password(self, password: str) -> bool:
         """
-        Проверка пароля для входа в аккаунт
+        Проверка пароля для входа в аккаунт (bcrypt в пуле потоков)
         :param password: значение пароля
         :return: bool
         """
-        return validate(password, self.password)
+        return await validate(password, self.password)
+
+    @classmethod
+    async def mark_membership_changed_with_session(cls, session: AsyncSession, user_id: int) -> None:
+        """
+        Фиксирует изменение членства в той же транзакции, что и само изменение
+        :param session: сессия
+        :param user_id: id пользователя
+        :return: None
+        """
+        stmt = (
+            update(cls)
+            .where(cls.id == user_id)
+            .values(membership_changed_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def get_membership_changed_since(cls, seconds: int) -> list[tuple[int, datetime]]:
+        """
+        Пользователи, у которых членство менялось за последние seconds секунд
+        Читаем с primary: реплика может ещё не знать о последних изменениях
+        :param seconds: окно
+        :return: [(user_id, membership_changed_at)]
+        """
+        async with get_session() as session:
+            stmt = (
+                select(cls.id, cls.membership_changed_at)
+                .where(cls.membership_changed_at > func.now() - timedelta(seconds=seconds))
+            )
+            result = await session.execute(stmt)
+        return [(user_id, changed_at) for user_id, changed_at in result.all()]
 
     def __repr__(self):
         return f"<User id={self.id} email={self.email}>"
 
 
 class RefreshToken(Base):
+    """
+    Сессия устройства: refresh токен хранится только как sha256 (уникальный индекс),
+    на каждое устройство пользователя - своя строка
+    previous_hash - токен до последней ротации: по нему видно повторное использование
+    """
     __tablename__ = 'token'
+    __table_args__ = (
+        UniqueConstraint('user_id', 'device_id'),
+    )
 
     user_id: Mapped[int] = mapped_column(ForeignKey('user.id'), nullable=False)
-    token: Mapped[str] = mapped_column(String, nullable=False)
+    device_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    previous_hash: Mapped[str | None] = mapped_column(String(64), unique=True)
+    rotated_at: Mapped[datetime | None] = mapped_column(DateTime)
 
     user: Mapped['User'] = relationship(
         'User',
-        back_populates='token',
-        uselist=False
+        back_populates='tokens'
     )
 
+    # значение токена (str) - отдаётся клиенту один раз, в БД его нет
+    token = None
+
     @property
     def expired(self) -> bool:
         """
@@ -151,52 +203,115 @@ class RefreshToken(Base):
         """
         return self.expires_at < datetime.now()
 
+    @staticmethod
+    def hash_token(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def _new_token() -> tuple[str, str, datetime]:
+        token = secrets.token_urlsafe(64)
+        expires = datetime.now() + timedelta(days=settings.EXPIRES_REFRESH_TOKEN_DAYS)
+        return token, RefreshToken.hash_token(token), expires
+
     @classmethod
-    async def get_by_token(cls, token: str) -> RefreshToken | None:
+    async def create(cls, user_id: int, device_id: str) -> RefreshToken:
         """
-        Находим модель токена по значению
-        :param token: значение токена
-        :return: токен или None
+        Новый токен устройства: старый токен этого устройства заменяется
+        одним INSERT ... ON CONFLICT (user_id, device_id) DO UPDATE ... RETURNING,
+        сессии других устройств не трогаем
+        :param user_id: id Пользователя, владельца токена
+        :param device_id: id устройства
+        :return: model RefreshToken (с заполненным token)
         """
+        token, token_hash, expires = cls._new_token()
+        stmt = insert(cls).values(
+            user_id=user_id,
+            device_id=device_id,
+            token_hash=token_hash,
+            expires_at=expires
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.user_id, cls.device_id],
+            set_={'token_hash': token_hash, 'expires_at': expires, 'previous_hash': None, 'rotated_at': None}
+        ).returning(cls)
         async with get_session() as session:
-            stmt = select(cls).where(cls.token == token)
-            result = await session.execute(stmt)
-            return result.scalar_one_or_none()
+            obj = (await session.scalars(stmt)).one()
+        obj.token = token
+        return obj
 
     @classmethod
-    async def delete_by_token(cls, token: str) -> None:
+    async def rotate(cls, token: str) -> RefreshToken:
         """
-        Удаляет старый токен при помощи значения
-        :param token: значение токена
-        :return: None
+        Обмен refresh токена на новый - один UPDATE ... WHERE token_hash RETURNING
+        по уникальному индексу; старый хеш остаётся в previous_hash
+        Если токен не текущий:
+        - только что заменён (параллельный refresh другой вкладки с той же cookie,
+          REFRESH_TOKEN_REUSE_GRACE_SECONDS) - сессия без нового token: новый уже выдан той вкладке
+        - заменён давно - повторное использование (утечка): сессия устройства удаляется
+        :param token: текущее значение токена
+        :return: сессия с новым token (или без него - в окне параллельного refresh)
+        :raises RefreshTokenInvalid: неизвестный токен
+        :raises RefreshTokenExpired: токен истёк
+        :raises RefreshTokenRevoked: повторное использование старого токена
         """
+        token_hash = cls.hash_token(token)
+        new_token, new_hash, expires = cls._new_token()
+        now = datetime.now()
+        stmt = (
+            update(cls)
+            .where(cls.token_hash == token_hash, cls.expires_at > now)
+            .values(
+                token_hash=new_hash,
+                previous_hash=cls.token_hash,
+                rotated_at=now,
+                expires_at=expires
+            )
+            .returning(cls)
+            .execution_options(synchronize_session=False)
+        )
         async with get_session() as session:
-            stmt = delete(cls).where(cls.token == token)
-            await session.execute(stmt)
+            obj = (await session.scalars(stmt)).one_or_none()
+            if obj is not None:
+                obj.token = new_token
+                return obj
+            stmt = select(cls).where(or_(cls.token_hash == token_hash, cls.previous_hash == token_hash))
+            obj = (await session.scalars(stmt)).one_or_none()
+
+        if obj is None:
+            raise RefreshTokenInvalid()
+        if obj.token_hash == token_hash:
+            raise RefreshTokenExpired()
+        grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        if obj.rotated_at is not None and obj.rotated_at > now - grace:
+            return obj
+        # отдельная транзакция: ответ 401 откатил бы удаление вместе с запросом
+        async with independent_session() as session:
+            await session.execute(delete(cls).where(cls.id == obj.id))
+        raise RefreshTokenRevoked()
 
     @classmethod
-    async def create(cls, user_id: int) -> RefreshToken:
-        """
-        Удаляет старый токен и создаёт новый
-        :param user_id: id Пользователя, владельца токена
-        :return: model RefreshToken
-        """
-        await cls.delete_by_user_id(user_id)
-        token = secrets.token_urlsafe(64)
-        expires = datetime.now() + timedelta(days=settings.EXPIRES_REFRESH_TOKEN_DAYS)
+    async def delete_by_device(cls, user_id: int, device_id: str) -> None:
         async with get_session() as session:
-            refresh_token = RefreshToken(
-                user_id=user_id,
-                token=token,
-                expires_at=expires
-            )
-            session.add(refresh_token)
-            await session.flush()
-            await session.refresh(refresh_token)
-        return refresh_token
+            stmt = delete(cls).where(cls.user_id == user_id, cls.device_id == device_id)
+            await session.execute(stmt)
 
     @classmethod
     async def delete_by_user_id(cls, user_id: int) -> None:
         async with get_session() as session:
             stmt = delete(cls).where(cls.user_id == user_id)
             await session.execute(stmt)
+
+    @classmethod
+    async def delete_expired(cls, limit: int) -> int:
+        """
+        Удаляет пачку истёкших токенов: DELETE ... WHERE ctid IN (SELECT ... LIMIT n)
+        Каждая пачка - своя короткая транзакция, без долгих блокировок таблицы
+        :param limit: размер пачки
+        :return: сколько строк удалено
+        """
+        ctid = literal_column('ctid')
+        expired = select(ctid).select_from(cls.__table__).where(cls.expires_at < datetime.now()).limit(limit)
+        stmt = delete(cls).where(ctid.in_(expired)).execution_options(synchronize_session=False)
+        async with get_session() as session:
+            result = await session.execute(stmt)
+        return result.rowcount
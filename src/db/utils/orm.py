@@ -1,9 +1,28 @@
+import base64
+import binascii
+import json
 from typing import Any
 
+from sqlalchemy import tuple_, select, union_all, literal_column
 from sqlalchemy.orm import Load
 
+from src.db.enums import SearchMode
+from src.db.utils.search import string_filter, string_match
+from src.services.errors import ValidationFailed
 
-def build_filters(cls, kwargs: dict[str, Any]) -> list:
+
+def build_filters(
+        cls,
+        kwargs: dict[str, Any],
+        match: SearchMode = SearchMode.CONTAINS
+) -> list:
+    """
+    Фильтры WHERE из kwargs (ключи, которых нет в модели, пропускаются)
+    :param cls: модель
+    :param kwargs: поле -> значение
+    :param match: режим поиска для строковых полей
+    :return: список условий
+    """
     filters = list()
     for key, value in kwargs.items():
         if value is None or not hasattr(cls, key):
@@ -12,7 +31,7 @@ def build_filters(cls, kwargs: dict[str, Any]) -> list:
         column = getattr(cls, key)
 
         if isinstance(value, str):
-            filters.append(column.ilike(f"%{value}%"))
+            filters.append(string_filter(column, value, match))
 
         elif isinstance(value, (list, tuple, set)):
             if all(hasattr(v, 'id') for v in value):
@@ -29,6 +48,35 @@ def build_filters(cls, kwargs: dict[str, Any]) -> list:
     return filters
 
 
+def match_row(
+        row: dict[str, Any],
+        kwargs: dict[str, Any],
+        match: SearchMode = SearchMode.CONTAINS
+) -> bool:
+    """
+    build_filters для строки в памяти (колонки -> значения)
+    :param row: строка
+    :param kwargs: поле -> значение
+    :param match: режим поиска для строковых полей
+    :return: подходит ли строка
+    """
+    for key, value in kwargs.items():
+        if value is None or key not in row:
+            continue
+        field = row[key]
+        if isinstance(value, str):
+            matched = string_match(field, value, match)
+        elif isinstance(value, (list, tuple, set)):
+            matched = field in [v.id if hasattr(v, 'id') else v for v in value]
+        elif hasattr(value, 'id'):
+            matched = field == value.id
+        else:
+            matched = field == value
+        if not matched:
+            return False
+    return True
+
+
 def apply_load_options(stmt, load_options: list[Load]):
     """
     Прикручивает зависимости при помощи load_options
@@ -40,3 +88,104 @@ def apply_load_options(stmt, load_options: list[Load]):
         for opt in load_options:
             stmt = stmt.options(opt)
     return stmt
+
+
+def encode_cursor(sort_by: str, descending: bool, value: Any, id_: int) -> str:
+    """
+    Непрозрачный курсор: последняя пара (sort_key, id) страницы
+    + сортировка, для которой он выдан
+    """
+    payload = json.dumps([sort_by, descending, value, id_], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        c_sort_by, c_descending, value, id_ = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValidationFailed("Invalid cursor")
+    if c_sort_by != sort_by or c_descending != descending or not isinstance(id_, int):
+        raise ValidationFailed("Cursor does not match sorting")
+    return value, id_
+
+
+def apply_keyset(
+        stmt,
+        cls,
+        sort_by: str,
+        descending: bool,
+        cursor: str | None,
+        limit: int
+):
+    """
+    Keyset-пагинация: ORDER BY (sort_key, id) + WHERE (sort_key, id) > курсор
+    Берём на одну строку больше, чтобы понять, есть ли следующая страница
+    :param stmt: изначальный select
+    :param cls: модель
+    :param sort_by: поле сортировки
+    :param descending: по убыванию
+    :param cursor: курсор предыдущей страницы
+    :param limit: размер страницы
+    :return: новый select
+    """
+    column = getattr(cls, sort_by)
+    keys = (cls.id,) if sort_by == "id" else (column, cls.id)
+    stmt = stmt.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    if cursor:
+        value, id_ = decode_cursor(cursor, sort_by, descending)
+        last = (id_,) if sort_by == "id" else (value, id_)
+        if descending:
+            stmt = stmt.where(tuple_(*keys) < tuple_(*last))
+        else:
+            stmt = stmt.where(tuple_(*keys) > tuple_(*last))
+    return stmt.limit(limit + 1)
+
+
+def keyset_union(
+        branches: list,
+        cls,
+        sort_by: str,
+        descending: bool,
+        cursor: str | None,
+        limit: int
+):
+    """
+    Keyset-пагинация по UNION ALL веток видимости
+    Каждая ветка сама сортируется, режется курсором и LIMIT (и обслуживается
+    своим индексом), сверху - только слияние уже отсортированных кусков
+    :param branches: select-ы веток (одинаковый набор колонок)
+    :param cls: модель
+    :param sort_by: поле сортировки
+    :param descending: по убыванию
+    :param cursor: курсор предыдущей страницы
+    :param limit: размер страницы
+    :return: UNION ALL ... ORDER BY ... LIMIT
+    """
+    branches = [apply_keyset(b, cls, sort_by, descending, cursor, limit) for b in branches]
+    if len(branches) == 1:
+        return branches[0]
+    return order_union(branches, sort_by, descending).limit(limit + 1)
+
+
+def order_union(branches: list, sort_by: str = "id", descending: bool = False):
+    """
+    UNION ALL веток + ORDER BY (sort_by, id) по колонкам результата
+    (ветки оборачиваются в подзапросы - у них свои ORDER BY / LIMIT)
+    """
+    compound = union_all(*(select(*branch.subquery().c) for branch in branches))
+    names = ("id",) if sort_by == "id" else (sort_by, "id")
+    keys = [literal_column(name) for name in names]
+    return compound.order_by(*(key.desc() if descending else key.asc() for key in keys))
+
+
+def split_page(objs: list, limit: int, sort_by: str, descending: bool) -> tuple[list, str | None]:
+    """
+    Отрезает лишнюю строку и строит курсор следующей страницы
+    :return: (страница, курсор или None если страница последняя)
+    """
+    if len(objs) <= limit:
+        return objs, None
+    page = objs[:limit]
+    last = page[-1]
+    return page, encode_cursor(sort_by, descending, getattr(last, sort_by), last.id)
@@ -0,0 +1,94 @@
+from functools import lru_cache
+from typing import Any, Type, get_args
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import inspect
+from sqlalchemy.orm import aliased
+
+# разделитель в метках колонок связанных моделей: category__name
+SEP = "__"
+
+
+def nested_schema(annotation: Any) -> Type[BaseModel] | None:
+    """
+    Достаёт схему вложенного объекта из аннотации (X, X | None)
+    """
+    for arg in (annotation, *get_args(annotation)):
+        if isinstance(arg, type) and issubclass(arg, BaseModel):
+            return arg
+    return None
+
+
+def _schema_columns(mapper, schema: Type[BaseModel], entity, prefix: str = "") -> list:
+    # только поля схемы, которые есть колонками в модели
+    columns = mapper.column_attrs.keys()
+    return [
+        getattr(entity, name).label(prefix + name)
+        for name in schema.model_fields
+        if name in columns
+    ]
+
+
+class Projection:
+    """
+    План read-only выборки: ровно те колонки, которые нужны схеме *Out,
+    связанные модели (many-to-one) - через LEFT JOIN в тот же запрос
+    Строки собираются в DTO пачкой, без ORM-гидрации
+    """
+
+    def __init__(self, cls, schema: Type[BaseModel]) -> None:
+        mapper = inspect(cls)
+        self.cls = cls
+        self.columns = _schema_columns(mapper, schema, cls)
+        self.joins = []
+        self.nested: dict[str, list[str]] = {}
+        for name, field in schema.model_fields.items():
+            nested = nested_schema(field.annotation)
+            relationship = mapper.relationships.get(name)
+            if nested is None or relationship is None or relationship.uselist:
+                continue
+            target = aliased(relationship.mapper.class_)
+            prefix = name + SEP
+            columns = _schema_columns(relationship.mapper, nested, target, prefix)
+            if not any(c.name == prefix + "id" for c in columns):
+                # по id понимаем, что связанной строки нет (LEFT JOIN)
+                columns.append(target.id.label(prefix + "id"))
+            self.columns.extend(columns)
+            self.joins.append((target, getattr(cls, name).of_type(target)))
+            self.nested[name] = [c.name for c in columns]
+        self.adapter = TypeAdapter(list[schema])
+
+    def apply(self, stmt):
+        """
+        Заменяет select(cls) на выборку колонок схемы (WHERE/ORDER BY сохраняются)
+        :param stmt: select(cls) с фильтрами
+        :return: select колонок
+        """
+        stmt = stmt.with_only_columns(*self.columns)
+        for target, onclause in self.joins:
+            stmt = stmt.join_from(self.cls, target, onclause, isouter=True)
+        return stmt
+
+    def to_dicts(self, rows) -> list[dict[str, Any]]:
+        result = []
+        for row in rows:
+            data = dict(row._mapping)
+            for name, keys in self.nested.items():
+                values = {key[len(name) + len(SEP):]: data.pop(key) for key in keys}
+                data[name] = values if values["id"] is not None else None
+            result.append(data)
+        return result
+
+    def build(self, rows) -> list[BaseModel]:
+        """
+        Собирает DTO из строк одной валидацией списка
+        :param rows: строки Core
+        :return: список схем
+        """
+        return self.adapter.validate_python(self.to_dicts(rows))
+
+
+@lru_cache(maxsize=None)
+def projection(cls, schema: Type[BaseModel]) -> Projection:
+    # план строится один раз на пару (модель, схема)
+    return Projection(cls, schema)
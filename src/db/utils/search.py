@@ -0,0 +1,80 @@
+from sqlalchemy import Index, text
+
+from src.db.enums import SearchMode
+
+# расширение и класс операторов для индексов по подстроке
+TRGM_EXTENSION = "pg_trgm"
+TRGM_OPS = "gin_trgm_ops"
+
+
+def trgm_index_name(table: str, column: str) -> str:
+    return f"ix_{table}_{column}_trgm"
+
+
+def trgm_index(table: str, column: str) -> Index:
+    """
+    GIN-индекс pg_trgm: обслуживает ILIKE 'x%' и ILIKE '%x%'
+    (для строк от 3 символов), в отличие от btree
+    :param table: имя таблицы
+    :param column: колонка поиска
+    :return: Index для __table_args__
+    """
+    return Index(
+        trgm_index_name(table, column),
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: TRGM_OPS},
+    )
+
+
+def visibility_index_names(table: str, column: str) -> tuple[str, str]:
+    return f"ix_{table}_own_{column}", f"ix_{table}_general_{column}"
+
+
+def visibility_indexes(table: str, column: str) -> tuple[Index, Index]:
+    """
+    Частичные индексы под две ветки видимости EnterpriseGeneralBase:
+    свои строки компании и общий справочник
+    :param table: имя таблицы
+    :param column: уникальное поле модели
+    :return: индексы для __table_args__
+    """
+    own, general = visibility_index_names(table, column)
+    return (
+        Index(own, "enterprise_id", column, postgresql_where=text("NOT is_general")),
+        Index(general, column, postgresql_where=text("is_general")),
+    )
+
+
+def escape_like(value: str) -> str:
+    # пользовательские % и _ ищем как обычные символы
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def string_filter(column, value: str, mode: SearchMode):
+    """
+    Фильтр по строковой колонке в заданном режиме
+    :param column: колонка модели
+    :param value: строка поиска
+    :param mode: exact / prefix / contains
+    :return: условие WHERE
+    """
+    if mode == SearchMode.EXACT:
+        return column == value
+    if mode == SearchMode.PREFIX:
+        return column.ilike(f"{escape_like(value)}%", escape="\\")
+    return column.ilike(f"%{escape_like(value)}%", escape="\\")
+
+
+def string_match(field: str | None, value: str, mode: SearchMode) -> bool:
+    """
+    То же, что string_filter, но для строк в памяти
+    """
+    if field is None:
+        return False
+    if mode == SearchMode.EXACT:
+        return field == value
+    field, value = field.lower(), value.lower()
+    if mode == SearchMode.PREFIX:
+        return field.startswith(value)
+    return value in field
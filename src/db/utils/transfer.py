@@ -4,6 +4,7 @@ from sqlalchemy import select
 
 from src.db import get_session
 from src.db import models
+from src.db.general_catalog import bump_version
 from src.db.models import OperationType
 from src.db.utils import consts
 
@@ -106,6 +107,8 @@ async def insert_data():
         await session.commit()
 
     await bind_materials_and_gost()
+    # воркеры перечитают снимок общего справочника
+    await bump_version()
 
 
 if __name__ == '__main__':
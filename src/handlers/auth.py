@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 
 from src.auth import dep
+from src.db import read_only_session
+from src.handlers.session_cookies import REFRESH_COOKIE, set_session_cookies
 from src.serializers.token import AccessTokenOut
 from src.serializers.user import UserOut
 from src.services.auth_service import AuthService
@@ -9,14 +11,18 @@ from src.services.errors import Unauthorized
 auth_router = APIRouter()
 
 
-@auth_router.get("/me")
+@auth_router.get("/me", dependencies=[Depends(read_only_session)])
 async def me(user_id: int = Depends(dep.get_current_user_id)) -> UserOut:
     return await AuthService.me(user_id)
 
 
 @auth_router.get("/refresh")
-async def refresh(request: Request) -> AccessTokenOut:
-    refresh_token = request.cookies.get("refresh_token", None)
+async def refresh(request: Request, response: Response) -> AccessTokenOut:
+    refresh_token = request.cookies.get(REFRESH_COOKIE, None)
     if not refresh_token:
         raise Unauthorized()
-    return await AuthService.refresh(refresh_token)
+    result = await AuthService.refresh(refresh_token)
+    # refresh токен одноразовый - новый сразу в cookie, в тело не попадает
+    if result.refresh_token is not None:
+        set_session_cookies(response, result.refresh_token)
+    return result
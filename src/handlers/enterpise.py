@@ -1,6 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from src.auth.dep import get_enterprise_by_owner, get_current_user_id, get_enterprise_inn_by_owner
+from config import settings
+from src.auth.dep import (
+    get_enterprise_by_owner,
+    get_enterprise_id_by_owner,
+    get_current_user_id,
+    get_invite_target_by_owner
+)
+from src.db import read_only_session
 from src.db.models import Enterprise
 from src.serializers.enterprise import EnterpriseFillForm, EnterpriseOut
 from src.serializers.token import InviteTokenOut, JoinTokenIn
@@ -20,9 +27,12 @@ async def create_enterprise(
 @enterprise_router.get("/generate-tokens/{count}", response_model=InviteTokenOut)
 async def generate_tokens(
         count: int,
-        inn: str = Depends(get_enterprise_inn_by_owner)
+        ttl_seconds: int | None = Query(None, ge=60, le=settings.INVITE_TOKEN_MAX_TTL_SECONDS),
+        target=Depends(get_invite_target_by_owner)
 ) -> InviteTokenOut:
-    tokens = await EnterpriseService.create_invite_token(inn, count)
+    tokens = await EnterpriseService.create_invite_token(
+        target.id, target.inn, target.enterprise_type, count, ttl_seconds
+    )
     return InviteTokenOut(tokens=tokens)
 
 
@@ -53,8 +63,8 @@ def invite_by_email(
     return HTTP
 
 
-@enterprise_router.get('/personal')
+@enterprise_router.get('/personal', dependencies=[Depends(read_only_session)])
 async def get_enterprise(
-        enterprise: Enterprise = Depends(get_enterprise_by_owner)
+        enterprise_id: int = Depends(get_enterprise_id_by_owner)
 ) -> EnterpriseOut:
-    return await EnterpriseService.get(enterprise.id)
+    return await EnterpriseService.get(enterprise_id)
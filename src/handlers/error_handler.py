@@ -3,7 +3,7 @@ import uuid
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.exc import IntegrityError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -14,12 +14,15 @@ from src.logging.errors import (
     log_integrity_error,
     log_unhandled,
 )
-from src.services.errors import ServiceError, ValidationFailed, Conflict
+from src.services.errors import ServiceError, ValidationFailed, Conflict, NotModified
 
 
 def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(ServiceError)
     async def handle_service_error(request: Request, exc: ServiceError):
+        if isinstance(exc, NotModified):
+            # не ошибка: 304 без тела и без лога
+            return Response(status_code=exc.status_code, headers=dict(exc.headers or {}))
         log_service_error(request, exc)  # ⬅️ лог
         rid = getattr(request.state, "request_id", None) or str(uuid.uuid4())
         body = exc.to_body()
@@ -1 +1 @@
-from src.handlers.resources.resources import router as resource_router
\ No newline at end of file
+from src.handlers.resources.main import router as resource_router
\ No newline at end of file
@@ -1,24 +1,33 @@
-from fastapi import APIRouter, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response
 
 from src.auth.dep import get_enterprise_by_user_id
+from src.db import read_only_session
 from src.serializers.resources import (
     AssortmentCreate,
     AssortmentUpdate,
-    AssortmentOut
+    AssortmentOut,
+    PageParams
 )
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.assortment_service import AssortmentService
 
 router = APIRouter(prefix="/assortments", tags=["Assortments"])
 
 
-@router.get("/", response_model=list[AssortmentOut])
+@router.get("/", response_model=list[AssortmentOut], dependencies=[Depends(read_only_session), Depends(conditional_get(AssortmentService.etag))])
 async def list_assortments(
-        enterprise_id: int = Depends(get_enterprise_by_user_id)
+        response: Response,
+        page: Annotated[PageParams, Depends(page_params)],
+        enterprise_id: int = Depends(get_enterprise_by_user_id),
 ):
-    return await AssortmentService.list(enterprise_id)
+    page_out = await AssortmentService.list(enterprise_id, page)
+    return with_next_cursor(response, page_out)
 
 
-@router.get("/{assortment_id}", response_model=AssortmentOut)
+@router.get("/{assortment_id}", response_model=AssortmentOut, dependencies=[Depends(read_only_session), Depends(conditional_get(AssortmentService.etag))])
 async def get_assortment(
         assortment_id: int,
         enterprise_id: int = Depends(get_enterprise_by_user_id),
@@ -1,13 +1,17 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from src.auth.dep import get_enterprise_by_user_id
+from src.db import read_only_session
 from src.serializers.resources import (
     GostAssortmentCreate,
     GostAssortmentUpdate,
-    GostAssortmentOut
+    GostAssortmentOut,
+    PageParams
 )
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.gost_assortment_service import GostAssortmentService
 
 # надо ещё списки или batch проработать на CRUD
@@ -18,14 +22,17 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=list[GostAssortmentOut])
+@router.get("/", response_model=list[GostAssortmentOut], dependencies=[Depends(read_only_session), Depends(conditional_get(GostAssortmentService.etag))])
 async def list_gost_assortments(
+        response: Response,
+        page: Annotated[PageParams, Depends(page_params)],
         enterprise_id: Annotated[int, Depends(get_enterprise_by_user_id)],
 ):
-    return await GostAssortmentService.list(enterprise_id)
+    page_out = await GostAssortmentService.list(enterprise_id, page)
+    return with_next_cursor(response, page_out)
 
 
-@router.get("/{id}", response_model=GostAssortmentOut)
+@router.get("/{id}", response_model=GostAssortmentOut, dependencies=[Depends(read_only_session), Depends(conditional_get(GostAssortmentService.etag))])
 async def get_gost_assortment(
         id: int,
         enterprise_id: Annotated[int, Depends(get_enterprise_by_user_id)],
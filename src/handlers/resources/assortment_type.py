@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, Path, Query
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path, Query, Response
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import AssortmentTypeCreate, AssortmentTypeUpdate, AssortmentTypeOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import AssortmentTypeCreate, AssortmentTypeUpdate, AssortmentTypeOut, PageParams
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.assortment_type_service import AssortmentTypeService
 
 router = APIRouter(
@@ -10,12 +16,16 @@ router = APIRouter(
 )
 
 
-@router.get('')
+@router.get('', dependencies=[Depends(read_only_session), Depends(conditional_get(AssortmentTypeService.etag))])
 async def get_assortment_types(
+        response: Response,
+        page: Annotated[PageParams, Depends(page_params)],
         enterprise_id: int = Depends(get_enterprise_by_user_id),
         name: str | None = Query(default=None),
+        match: SearchMode = Query(SearchMode.CONTAINS),
 ) -> list[AssortmentTypeOut]:
-    return await AssortmentTypeService.list(enterprise_id, name=name)
+    page_out = await AssortmentTypeService.list(enterprise_id, page, name=name, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('')
@@ -26,7 +36,7 @@ async def create_assortment_type(
     return await AssortmentTypeService.create(payload, enterprise_id)
 
 
-@router.get('/{type_id}')
+@router.get('/{type_id}', dependencies=[Depends(read_only_session), Depends(conditional_get(AssortmentTypeService.etag))])
 async def get_assortment_type_by_id(
         type_id: int = Path(...),
         enterprise_id: int = Depends(get_enterprise_by_user_id)
@@ -0,0 +1,60 @@
+import hashlib
+from typing import Awaitable, Callable
+
+from fastapi import Depends, Request, Response
+
+from src.auth.dep import get_enterprise_by_user_id
+from src.db import read_from_primary
+from src.services.errors import NotModified
+
+# клиент может хранить ответ, но обязан перепроверять его условным запросом
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(tag: str, request: Request) -> str:
+    """
+    ETag ответа: версия данных + путь и параметры запроса
+    :param tag: версия данных из сервиса
+    :param request: запрос
+    :return: ETag в кавычках
+    """
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    raw = f"{tag}|{request.url.path}?{query}"
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match: "a", W/"b" или * - сравнение слабое (RFC 9110)
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in [value.removeprefix("W/") for value in candidates]
+
+
+def conditional_get(tag: Callable[[int], Awaitable[str | None]]) -> Callable:
+    """
+    Зависимость условного GET для /resources
+    Версия берётся из счётчиков Redis, которые увеличивают пишущие методы моделей -
+    при совпадении If-None-Match отвечаем 304 до запроса в БД и сериализации
+    Ответ с ETag читается с primary: тело с отстающей реплики под новой версией
+    клиент получал бы 304-ми до следующей записи
+    :param tag: метод сервиса etag(enterprise_id)
+    :return: зависимость FastAPI
+    """
+    async def dependency(
+            request: Request,
+            response: Response,
+            enterprise_id: int = Depends(get_enterprise_by_user_id),
+    ) -> None:
+        version = await tag(enterprise_id)
+        if version is None:
+            # Redis недоступен - обычный ответ без ETag
+            return
+        etag = make_etag(version, request)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise NotModified(headers=headers)
+        await read_from_primary()
+        response.headers.update(headers)
+
+    return dependency
@@ -1,10 +1,24 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Response
 from fastapi.params import Depends, Query
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import GostCreate, GostUpdate, GostOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import (
+    GostCreate,
+    GostUpdate,
+    GostOut,
+    GostBatchUpdate,
+    BatchIn,
+    BatchOut,
+    BatchDelete,
+    BatchDeleteOut,
+    PageParams
+)
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.gosts_service import GostService
 
 router = APIRouter(
@@ -13,12 +27,16 @@ router = APIRouter(
 )
 
 
-@router.get('', response_model=List[GostOut])
+@router.get('', response_model=List[GostOut], dependencies=[Depends(read_only_session), Depends(conditional_get(GostService.etag))])
 async def get_gosts(
+        response: Response,
+        page: Annotated[PageParams, Depends(page_params)],
         enterprise_id: int = Depends(get_enterprise_by_user_id),
         number: str | None = Query(default=None),
+        match: SearchMode = Query(SearchMode.CONTAINS),
 ):
-    return await GostService.list(enterprise_id, number=number)
+    page_out = await GostService.list(enterprise_id, page, number=number, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('', response_model=GostOut)
@@ -29,7 +47,32 @@ async def create_gost(
     return await GostService.create(payload, enterprise_id)
 
 
-@router.get('/{gost_id}', response_model=GostOut)
+# пакетные операции - объявлены до /{gost_id}, иначе 'batch' попадёт в id
+@router.post('/batch', response_model=BatchOut[GostOut])
+async def create_gosts_batch(
+        payload: BatchIn[GostCreate],
+        enterprise_id: int = Depends(get_enterprise_by_user_id),
+):
+    return await GostService.create_many(enterprise_id, payload.items)
+
+
+@router.patch('/batch', response_model=BatchOut[GostOut])
+async def update_gosts_batch(
+        payload: BatchIn[GostBatchUpdate],
+        enterprise_id: int = Depends(get_enterprise_by_user_id),
+):
+    return await GostService.update_many(enterprise_id, payload.items)
+
+
+@router.delete('/batch', response_model=BatchDeleteOut)
+async def delete_gosts_batch(
+        payload: BatchDelete,
+        enterprise_id: int = Depends(get_enterprise_by_user_id),
+):
+    return await GostService.delete_many(enterprise_id, payload.ids)
+
+
+@router.get('/{gost_id}', response_model=GostOut, dependencies=[Depends(read_only_session), Depends(conditional_get(GostService.etag))])
 async def get_gost_by_id(
         gost_id: int,
         enterprise_id: int = Depends(get_enterprise_by_user_id)
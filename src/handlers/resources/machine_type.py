@@ -1,9 +1,13 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Response
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import MachineTypeCreate, MachineTypeUpdate, MachineTypeOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import MachineTypeCreate, MachineTypeUpdate, MachineTypeOut, PageParams
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.machine_type_service import MachineTypeService
 
 router = APIRouter(
@@ -12,12 +16,16 @@ router = APIRouter(
 )
 
 
-@router.get('', response_model=List[MachineTypeOut])
+@router.get('', response_model=List[MachineTypeOut], dependencies=[Depends(read_only_session), Depends(conditional_get(MachineTypeService.etag))])
 async def get_machine_types(
+        response: Response,
+        page: Annotated[PageParams, Depends(page_params)],
         enterprise_id: int = Depends(get_enterprise_by_user_id),
         name: str | None = Query(default=None),
+        match: SearchMode = Query(SearchMode.CONTAINS),
 ):
-    return await MachineTypeService.list(enterprise_id, name=name)
+    page_out = await MachineTypeService.list(enterprise_id, page, name=name, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('', response_model=MachineTypeOut)
@@ -28,7 +36,7 @@ async def create_machine_type(
     return await MachineTypeService.create(payload, enterprise_id)
 
 
-@router.get('/{type_id}', response_model=MachineTypeOut)
+@router.get('/{type_id}', response_model=MachineTypeOut, dependencies=[Depends(read_only_session), Depends(conditional_get(MachineTypeService.etag))])
 async def get_machine_type_by_id(
         type_id: int = Path(...),
         enterprise_id: int = Depends(get_enterprise_by_user_id)
@@ -1,9 +1,18 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import MachineCreate, MachineUpdate, MachineOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import (
+    MachineCreate,
+    MachineUpdate,
+    MachineOut,
+    PageParams
+)
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.machine_service import MachineService
 
 router = APIRouter(
@@ -12,12 +21,16 @@ router = APIRouter(
 )
 
 
-@router.get('', response_model=List[MachineOut])
+@router.get('', response_model=List[MachineOut], dependencies=[Depends(read_only_session), Depends(conditional_get(MachineService.etag))])
 async def list_machines(
+    response: Response,
+    page: Annotated[PageParams, Depends(page_params)],
     enterprise_id: int = Depends(get_enterprise_by_user_id),
     name: str | None = Query(None),
+    match: SearchMode = Query(SearchMode.CONTAINS),
 ):
-    return await MachineService.list(enterprise_id=enterprise_id, name=name)
+    page_out = await MachineService.list(enterprise_id=enterprise_id, page=page, name=name, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('', response_model=MachineOut)
@@ -28,7 +41,7 @@ async def create_machine(
     return await MachineService.create(enterprise_id=enterprise_id, **payload.model_dump())
 
 
-@router.get('/{machine_id}', response_model=MachineOut)
+@router.get('/{machine_id}', response_model=MachineOut, dependencies=[Depends(read_only_session), Depends(conditional_get(MachineService.etag))])
 async def get_machine_by_id(
     machine_id: int,
     enterprise_id: int = Depends(get_enterprise_by_user_id),
@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, Path, Query
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Path, Query, Response
 
 from src.auth.dep import get_enterprise_by_user_id
+from src.db import read_only_session
+from src.db.enums import SearchMode
 from src.serializers.resources import (
     MaterialCategoryCreate,
     MaterialCategoryUpdate,
-    MaterialCategoryOut
+    MaterialCategoryOut,
+    MaterialCategoryBatchUpdate,
+    BatchIn,
+    BatchOut,
+    BatchDelete,
+    BatchDeleteOut,
+    PageParams
 )
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.material_category_service import MaterialCategoryService
 
 router = APIRouter(
@@ -14,12 +26,16 @@ router = APIRouter(
 )
 
 
-@router.get('')
+@router.get('', dependencies=[Depends(read_only_session), Depends(conditional_get(MaterialCategoryService.etag))])
 async def get_material_categories(
+        response: Response,
+        page: Annotated[PageParams, Depends(page_params)],
         enterprise_id: int = Depends(get_enterprise_by_user_id),
         name: str | None = Query(default=None),
+        match: SearchMode = Query(SearchMode.CONTAINS),
 ) -> list[MaterialCategoryOut]:
-    return await MaterialCategoryService.list(enterprise_id, name=name)
+    page_out = await MaterialCategoryService.list(enterprise_id, page, name=name, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('')
@@ -30,7 +46,32 @@ async def create_material_category(
     return await MaterialCategoryService.create(payload, enterprise_id)
 
 
-@router.get('/{category_id}')
+# пакетные операции - объявлены до /{category_id}, иначе 'batch' попадёт в id
+@router.post('/batch')
+async def create_material_categories_batch(
+        payload: BatchIn[MaterialCategoryCreate],
+        enterprise_id: int = Depends(get_enterprise_by_user_id)
+) -> BatchOut[MaterialCategoryOut]:
+    return await MaterialCategoryService.create_many(enterprise_id, payload.items)
+
+
+@router.patch('/batch')
+async def update_material_categories_batch(
+        payload: BatchIn[MaterialCategoryBatchUpdate],
+        enterprise_id: int = Depends(get_enterprise_by_user_id)
+) -> BatchOut[MaterialCategoryOut]:
+    return await MaterialCategoryService.update_many(enterprise_id, payload.items)
+
+
+@router.delete('/batch')
+async def delete_material_categories_batch(
+        payload: BatchDelete,
+        enterprise_id: int = Depends(get_enterprise_by_user_id)
+) -> BatchDeleteOut:
+    return await MaterialCategoryService.delete_many(enterprise_id, payload.ids)
+
+
+@router.get('/{category_id}', dependencies=[Depends(read_only_session), Depends(conditional_get(MaterialCategoryService.etag))])
 async def get_material_category_by_id(
         category_id: int = Path(..., gt=0),
         enterprise_id: int = Depends(get_enterprise_by_user_id)
@@ -1,9 +1,23 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import MaterialCreate, MaterialUpdate, MaterialOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import (
+    MaterialCreate,
+    MaterialUpdate,
+    MaterialOut,
+    MaterialBatchUpdate,
+    BatchIn,
+    BatchOut,
+    BatchDelete,
+    BatchDeleteOut,
+    PageParams
+)
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.material_service import MaterialService
 
 router = APIRouter(
@@ -12,12 +26,16 @@ router = APIRouter(
 )
 
 
-@router.get('')
+@router.get('', dependencies=[Depends(read_only_session), Depends(conditional_get(MaterialService.etag))])
 async def list_materials(
+        response: Response,
+        page: Annotated[PageParams, Depends(page_params)],
         enterprise_id: int = Depends(get_enterprise_by_user_id),
         brand: str | None = Query(None),
+        match: SearchMode = Query(SearchMode.CONTAINS),
 ) -> list[MaterialOut]:
-    return await MaterialService.list(enterprise_id=enterprise_id, brand=brand)
+    page_out = await MaterialService.list(enterprise_id=enterprise_id, page=page, brand=brand, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('')
@@ -28,7 +46,32 @@ async def create_material(
     return await MaterialService.create(enterprise_id=enterprise_id, **payload.model_dump())
 
 
-@router.get('/{material_id}')
+# пакетные операции - объявлены до /{material_id}, иначе 'batch' попадёт в id
+@router.post('/batch')
+async def create_materials_batch(
+        payload: BatchIn[MaterialCreate],
+        enterprise_id: int = Depends(get_enterprise_by_user_id),
+) -> BatchOut[MaterialOut]:
+    return await MaterialService.create_many(enterprise_id, payload.items)
+
+
+@router.patch('/batch')
+async def update_materials_batch(
+        payload: BatchIn[MaterialBatchUpdate],
+        enterprise_id: int = Depends(get_enterprise_by_user_id),
+) -> BatchOut[MaterialOut]:
+    return await MaterialService.update_many(enterprise_id, payload.items)
+
+
+@router.delete('/batch')
+async def delete_materials_batch(
+        payload: BatchDelete,
+        enterprise_id: int = Depends(get_enterprise_by_user_id),
+) -> BatchDeleteOut:
+    return await MaterialService.delete_many(enterprise_id, payload.ids)
+
+
+@router.get('/{material_id}', dependencies=[Depends(read_only_session), Depends(conditional_get(MaterialService.etag))])
 async def get_material_by_id(
         material_id: int,
         enterprise_id: int = Depends(get_enterprise_by_user_id),
@@ -42,12 +85,14 @@ async def update_material(
         payload: MaterialUpdate,
         enterprise_id: int = Depends(get_enterprise_by_user_id),
 ) -> MaterialOut:
-    return await MaterialService.update(material_id, enterprise_id, **payload.model_dump())
+    # только присланные поля: остальные (None) затёрли бы колонки
+    return await MaterialService.update(material_id, enterprise_id, **payload.model_dump(exclude_unset=True))
 
 
 @router.delete('/{material_id}')
 async def delete_material(
         material_id: int,
         enterprise_id: int = Depends(get_enterprise_by_user_id),
+        version: int | None = Query(None),
 ):
-    return await MaterialService.delete(material_id, enterprise_id)
+    return await MaterialService.delete(material_id, enterprise_id, version=version)
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, Path, Query
-from typing import List
+from fastapi import APIRouter, Depends, Path, Query, Response
+from typing import Annotated, List
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import MethodCreate, MethodUpdate, MethodOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import MethodCreate, MethodUpdate, MethodOut, PageParams
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.method_service import MethodService
 
 router = APIRouter(
@@ -11,12 +15,16 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[MethodOut])
+@router.get("/", response_model=List[MethodOut], dependencies=[Depends(read_only_session), Depends(conditional_get(MethodService.etag))])
 async def get_methods(
+    response: Response,
+    page: Annotated[PageParams, Depends(page_params)],
     enterprise_id: int = Depends(get_enterprise_by_user_id),
     name: str | None = Query(default=None),
+    match: SearchMode = Query(SearchMode.CONTAINS),
 ):
-    return await MethodService.list(enterprise_id, name=name)
+    page_out = await MethodService.list(enterprise_id, page, name=name, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post("/", response_model=MethodOut)
@@ -27,7 +35,7 @@ async def create_method(
     return await MethodService.create(payload, enterprise_id)
 
 
-@router.get("/{method_id}", response_model=MethodOut)
+@router.get("/{method_id}", response_model=MethodOut, dependencies=[Depends(read_only_session), Depends(conditional_get(MethodService.etag))])
 async def get_method_by_id(
     method_id: int = Path(...),
     enterprise_id: int = Depends(get_enterprise_by_user_id)
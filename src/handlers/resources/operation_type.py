@@ -1,9 +1,13 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Response
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import OperationTypeCreate, OperationTypeUpdate, OperationTypeOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import OperationTypeCreate, OperationTypeUpdate, OperationTypeOut, PageParams
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.operation_type_service import OperationTypeService
 
 router = APIRouter(
@@ -12,12 +16,16 @@ router = APIRouter(
 )
 
 
-@router.get('', response_model=List[OperationTypeOut])
+@router.get('', response_model=List[OperationTypeOut], dependencies=[Depends(read_only_session), Depends(conditional_get(OperationTypeService.etag))])
 async def get_operation_types(
+        response: Response,
+        page: Annotated[PageParams, Depends(page_params)],
         name: str | None = Query(default=None),
-        enterprise_id: int = Depends(get_enterprise_by_user_id)
+        match: SearchMode = Query(SearchMode.CONTAINS),
+        enterprise_id: int = Depends(get_enterprise_by_user_id),
 ):
-    return await OperationTypeService.list(enterprise_id, name=name)
+    page_out = await OperationTypeService.list(enterprise_id, page, name=name, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('', response_model=OperationTypeOut)
@@ -28,7 +36,7 @@ async def create_operation_type(
     return await OperationTypeService.create(payload, enterprise_id)
 
 
-@router.get('/{type_id}', response_model=OperationTypeOut)
+@router.get('/{type_id}', response_model=OperationTypeOut, dependencies=[Depends(read_only_session), Depends(conditional_get(OperationTypeService.etag))])
 async def get_operation_type_by_id(
         type_id: int = Path(...),
         enterprise_id: int = Depends(get_enterprise_by_user_id)
@@ -0,0 +1,34 @@
+from fastapi import Query, Response
+
+from src.serializers.resources import Page, PageParams, PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT
+
+# курсор следующей страницы отдаём заголовком,
+# чтобы тело списка осталось прежним (массив)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_params(
+        limit: int = Query(PAGE_DEFAULT_LIMIT, ge=1, le=PAGE_MAX_LIMIT),
+        cursor: str | None = Query(None),
+        sort_by: str | None = Query(None),
+        descending: bool = Query(False),
+) -> PageParams:
+    """
+    Параметры страницы из query
+    (Annotated[PageParams, Query()] FastAPI раскрывает, только если других query параметров нет,
+    а у списков есть фильтры - тогда он ждёт один параметр page)
+    :return: PageParams
+    """
+    return PageParams(limit=limit, cursor=cursor, sort_by=sort_by, descending=descending)
+
+
+def with_next_cursor(response: Response, page: Page) -> list:
+    """
+    Кладёт курсор следующей страницы в заголовок ответа
+    :param response: ответ FastAPI
+    :param page: страница из сервиса
+    :return: элементы страницы
+    """
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
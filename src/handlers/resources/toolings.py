@@ -1,11 +1,15 @@
 # src/handlers/resources/tooling_router.py
 
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import ToolingCreate, ToolingUpdate, ToolingOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import ToolingCreate, ToolingUpdate, ToolingOut, PageParams
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.tooling_service import ToolingService
 
 router = APIRouter(
@@ -14,12 +18,16 @@ router = APIRouter(
 )
 
 
-@router.get('', response_model=List[ToolingOut])
+@router.get('', response_model=List[ToolingOut], dependencies=[Depends(read_only_session), Depends(conditional_get(ToolingService.etag))])
 async def list_toolings(
+    response: Response,
+    page: Annotated[PageParams, Depends(page_params)],
     enterprise_id: int = Depends(get_enterprise_by_user_id),
     name: str | None = Query(None),
+    match: SearchMode = Query(SearchMode.CONTAINS),
 ):
-    return await ToolingService.list(enterprise_id=enterprise_id, name=name)
+    page_out = await ToolingService.list(enterprise_id=enterprise_id, page=page, name=name, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('', response_model=ToolingOut)
@@ -30,7 +38,7 @@ async def create_tooling(
     return await ToolingService.create(enterprise_id=enterprise_id, **payload.model_dump())
 
 
-@router.get('/{tooling_id}', response_model=ToolingOut)
+@router.get('/{tooling_id}', response_model=ToolingOut, dependencies=[Depends(read_only_session), Depends(conditional_get(ToolingService.etag))])
 async def get_tooling_by_id(
     tooling_id: int,
     enterprise_id: int = Depends(get_enterprise_by_user_id),
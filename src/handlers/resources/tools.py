@@ -1,7 +1,18 @@
-from fastapi import APIRouter, Depends, Query
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Response
 
 from src.auth.dep import get_enterprise_by_user_id
-from src.serializers.resources import ToolCreate, ToolUpdate, ToolOut
+from src.db import read_only_session
+from src.db.enums import SearchMode
+from src.serializers.resources import (
+    ToolCreate,
+    ToolUpdate,
+    ToolOut,
+    PageParams
+)
+from src.handlers.resources.etag import conditional_get
+from src.handlers.resources.pagination import page_params, with_next_cursor
 from src.services.resources.tool_service import ToolService
 
 router = APIRouter(
@@ -10,12 +21,16 @@ router = APIRouter(
 )
 
 
-@router.get('', response_model=list[ToolOut])
+@router.get('', response_model=list[ToolOut], dependencies=[Depends(read_only_session), Depends(conditional_get(ToolService.etag))])
 async def list_tools(
+    response: Response,
+    page: Annotated[PageParams, Depends(page_params)],
     enterprise_id: int = Depends(get_enterprise_by_user_id),
     name: str | None = Query(None),
+    match: SearchMode = Query(SearchMode.CONTAINS),
 ):
-    return await ToolService.list(enterprise_id=enterprise_id, name=name)
+    page_out = await ToolService.list(enterprise_id=enterprise_id, page=page, name=name, match=match)
+    return with_next_cursor(response, page_out)
 
 
 @router.post('', response_model=ToolOut)
@@ -26,7 +41,7 @@ async def create_tool(
     return await ToolService.create(enterprise_id=enterprise_id, **payload.model_dump())
 
 
-@router.get('/{tool_id}', response_model=ToolOut)
+@router.get('/{tool_id}', response_model=ToolOut, dependencies=[Depends(read_only_session), Depends(conditional_get(ToolService.etag))])
 async def get_tool_by_id(
     tool_id: int,
     enterprise_id: int = Depends(get_enterprise_by_user_id),
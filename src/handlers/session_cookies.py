@@ -0,0 +1,45 @@
+import secrets
+
+from fastapi import Request, Response
+
+from config import settings
+
+REFRESH_COOKIE = "refresh_token"
+# id устройства: у каждого устройства своя сессия (refresh токен)
+DEVICE_COOKIE = "device_id"
+DEVICE_ID_MAX_LENGTH = 64
+
+
+def device_id(request: Request) -> str:
+    """
+    id устройства из cookie, для нового устройства - новый
+    :param request: запрос
+    :return: id устройства
+    """
+    value = request.cookies.get(DEVICE_COOKIE)
+    if value and len(value) <= DEVICE_ID_MAX_LENGTH:
+        return value
+    return secrets.token_hex(16)
+
+
+def set_session_cookies(response: Response, refresh_token: str, device: str | None = None) -> None:
+    max_age = 60 * 60 * 24 * settings.EXPIRES_REFRESH_TOKEN_DAYS
+    response.set_cookie(
+        key=REFRESH_COOKIE,
+        value=refresh_token,
+        httponly=True,
+        secure=False,  # только локально! Без HTTPS
+        samesite="lax",  # локально можно lax
+        path="/",
+        max_age=max_age
+    )
+    if device is not None:
+        response.set_cookie(
+            key=DEVICE_COOKIE,
+            value=device,
+            httponly=True,
+            secure=False,
+            samesite="lax",
+            path="/",
+            max_age=max_age
+        )
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Response, Security
+from fastapi import APIRouter, Request, Response, Security
 from fastapi.params import Depends
 from starlette import status
 from starlette.responses import JSONResponse
 
-from config import settings
 from src.auth.dep import bearer_scheme, get_current_user_id
+from src.handlers.session_cookies import DEVICE_COOKIE, REFRESH_COOKIE, device_id, set_session_cookies
 from src.serializers.user import (
     UserLogin,
     UserRegister,
@@ -15,30 +15,28 @@ from src.services.user_service import UserService
 user_router = APIRouter()
 
 
+def client_ip(request: Request) -> str | None:
+    # за прокси uvicorn подставляет адрес из X-Forwarded-For (--proxy-headers)
+    return request.client.host if request.client else None
+
+
 @user_router.post("/register", status_code=status.HTTP_201_CREATED)
-async def register(dto: UserRegister) -> UserOut:
-    return await UserService.register(dto)
+async def register(dto: UserRegister, request: Request) -> UserOut:
+    return await UserService.register(dto, ip=client_ip(request))
 
 
 @user_router.post("/login")
-async def login(dto: UserLogin) -> JSONResponse:
-    result = await UserService.login(dto)
-    response = JSONResponse(status_code=200, content=result)
-    response.set_cookie(
-        key="refresh_token",
-        value=result["refresh_token"],
-        httponly=True,
-        secure=False,  # только локально! Без HTTPS
-        samesite="lax",  # локально можно lax
-        path="/",
-        max_age=60 * 60 * 24 * settings.EXPIRES_REFRESH_TOKEN_DAYS
-    )
+async def login(dto: UserLogin, request: Request) -> JSONResponse:
+    device = device_id(request)
+    result = await UserService.login(dto, device_id=device, ip=client_ip(request))
+    response = JSONResponse(status_code=200, content=result.model_dump())
+    set_session_cookies(response, result.refresh_token, device)
     return response
 
 
 @user_router.get("/logout", dependencies=[Security(bearer_scheme)], )
-async def logout(user_id: int = Depends(get_current_user_id)) -> JSONResponse:
-    result = await UserService.logout(user_id)
+async def logout(request: Request, user_id: int = Depends(get_current_user_id)) -> JSONResponse:
+    result = await UserService.logout(user_id, request.cookies.get(DEVICE_COOKIE))
     response = JSONResponse(status_code=200, content=result)
-    response.delete_cookie(key="refresh_token", path="/")
+    response.delete_cookie(key=REFRESH_COOKIE, path="/")
     return response
@@ -12,5 +12,28 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,   # честная очередь
     task_soft_time_limit=25,
     task_time_limit=30,
-    task_routes={"mail.send": {"queue": "mail"}},
+    task_routes={
+        "mail.send": {"queue": "mail"},
+        "tokens.sweep": {"queue": "maintenance"},
+        "membership.resync": {"queue": "maintenance"},
+    },
+    # модули с задачами (воркер запускается с -A ...:celery_app и сам их не найдёт)
+    imports=(
+        "src.infrastructure.celery.mail",
+        "src.infrastructure.celery.sweeper",
+        "src.infrastructure.celery.membership",
+    ),
+    beat_schedule={
+        "sweep-expired-tokens": {
+            "task": "tokens.sweep",
+            "schedule": settings.TOKEN_SWEEP_INTERVAL_SECONDS,
+            # пропущенные запуски не копим: следующий всё равно удалит всё истёкшее
+            "options": {"expires": settings.TOKEN_SWEEP_INTERVAL_SECONDS},
+        },
+        "resync-membership": {
+            "task": "membership.resync",
+            "schedule": settings.MEMBERSHIP_RESYNC_INTERVAL_SECONDS,
+            "options": {"expires": settings.MEMBERSHIP_RESYNC_INTERVAL_SECONDS},
+        },
+    },
 )
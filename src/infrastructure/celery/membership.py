@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import time
+
+from celery import shared_task
+
+from config import settings
+from src.db import db
+from src.infrastructure.redis import claims_revocation, membership_cache, redis
+
+log = logging.getLogger("auth")
+
+
+async def resync_membership(interval: int) -> int:
+    """
+    Досылает в Redis отзыв claims и сброс компании для недавно изменённых членств
+    (после коммита это делается сразу, но без повторов - Redis мог не ответить)
+    Окно - пока живут выданные access токены / закешированная компания, плюс один интервал
+    :param interval: интервал запуска, секунд
+    :return: скольким пользователям пришлось отозвать claims
+    """
+    from src.db.models.users import User
+
+    claims_window = settings.EXPIRES_ACCESS_TOKEN_MINUTES * 60 + interval
+    cache_window = settings.MEMBERSHIP_CACHE_TTL_SECONDS + interval
+    changes = await User.get_membership_changed_since(max(claims_window, cache_window))
+
+    now = time.time()
+    revoked = 0
+    for user_id, changed_at in changes:
+        changed_ts = changed_at.timestamp()
+        if changed_ts > now - claims_window and await claims_revocation.revoke_if_missing(user_id, changed_ts):
+            revoked += 1
+        if changed_ts > now - cache_window:
+            # сброс идемпотентен: лишний раз - только лишний запрос в БД
+            await membership_cache.invalidate(user_id)
+    return revoked
+
+
+async def _run() -> int:
+    # свой движок на запуск: у каждого asyncio.run - новый event loop
+    db.init_engine()
+    try:
+        return await resync_membership(settings.MEMBERSHIP_RESYNC_INTERVAL_SECONDS)
+    finally:
+        await db.dispose_engine()
+        # соединения Redis привязаны к этому event loop
+        await redis.connection_pool.disconnect()
+
+
+@shared_task(name="membership.resync", ignore_result=True)
+def resync() -> int:
+    revoked = asyncio.run(_run())
+    if revoked:
+        log.warning("membership claims revoked by resync: %s", revoked)
+    return revoked
@@ -0,0 +1,45 @@
+import asyncio
+import logging
+
+from celery import shared_task
+
+from config import settings
+from src.db import db
+
+log = logging.getLogger("db")
+
+
+async def sweep_expired_tokens(batch_size: int, max_batches: int) -> int:
+    """
+    Удаляет истёкшие refresh токены пачками, пока они не кончатся
+    (или пока не наберётся max_batches пачек - остальное уберёт следующий запуск)
+    :param batch_size: строк в пачке
+    :param max_batches: пачек за запуск
+    :return: сколько строк удалено
+    """
+    from src.db.models.users import RefreshToken
+
+    total = 0
+    for _ in range(max_batches):
+        deleted = await RefreshToken.delete_expired(batch_size)
+        total += deleted
+        if deleted < batch_size:
+            break
+    return total
+
+
+async def _run() -> int:
+    # свой движок на запуск: у каждого asyncio.run - новый event loop
+    db.init_engine()
+    try:
+        return await sweep_expired_tokens(settings.TOKEN_SWEEP_BATCH_SIZE, settings.TOKEN_SWEEP_MAX_BATCHES)
+    finally:
+        await db.dispose_engine()
+
+
+# общий task_time_limit (30с) рассчитан на письма, чистке нужно больше
+@shared_task(name="tokens.sweep", ignore_result=True, soft_time_limit=300, time_limit=330)
+def sweep_tokens() -> int:
+    total = asyncio.run(_run())
+    log.info("expired refresh tokens removed: %s", total)
+    return total
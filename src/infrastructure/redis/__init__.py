@@ -1 +1 @@
-from src.infrastructure.redis.main import redis
\ No newline at end of file
+from src.infrastructure.redis.main import redis, pubsub_redis
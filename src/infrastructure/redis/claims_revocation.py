@@ -0,0 +1,68 @@
+import time
+
+from config import settings
+from src.infrastructure.redis import redis
+
+# момент последнего изменения членства пользователя:
+# claims eid/role из токенов, выпущенных раньше, больше не доверяем
+key_revoked = "auth:claims:revoked:{user_id}"
+
+# досылка отзыва: KEYS[1] - ключ отзыва; ARGV: changed_at, now, ttl
+# если отзыв уже записан после изменения членства - ничего не делаем (0),
+# иначе отзываем токены, выпущенные до now (1)
+REVOKE_IF_MISSING = """
+local current = redis.call('GET', KEYS[1])
+if current and tonumber(current) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+return 1
+"""
+
+_revoke_if_missing = redis.register_script(REVOKE_IF_MISSING)
+
+
+def _ttl() -> int:
+    # пока не истекут уже выданные access токены
+    return settings.EXPIRES_ACCESS_TOKEN_MINUTES * 60 + 60
+
+
+async def revoke(user_id: int) -> None:
+    """
+    Отзывает claims всех уже выданных access токенов пользователя
+    Хранится, пока не истекут эти токены
+    :param user_id: id пользователя
+    :return: None
+    """
+    await redis.set(
+        key_revoked.format(user_id=user_id),
+        time.time(),
+        ex=_ttl()
+    )
+
+
+async def revoke_if_missing(user_id: int, changed_at: float) -> bool:
+    """
+    Отзыв claims, если после изменения членства его так и не записали
+    (сброс после коммита упал или не дождался Redis)
+    Уже записанный отзыв не трогаем - токены, выпущенные после него, остаются в силе
+    :param user_id: id пользователя
+    :param changed_at: момент изменения членства (секунды)
+    :return: пришлось ли отзывать
+    """
+    revoked = await _revoke_if_missing(
+        keys=[key_revoked.format(user_id=user_id)],
+        args=[changed_at, time.time(), _ttl()]
+    )
+    return bool(revoked)
+
+
+async def is_revoked(user_id: int, issued_at: int) -> bool:
+    """
+    :param user_id: id пользователя
+    :param issued_at: iat токена (секунды)
+    :return: выпущен ли токен до последнего изменения членства
+    """
+    revoked_at = await redis.get(key_revoked.format(user_id=user_id))
+    # iat округлён вниз: токен той же секунды считаем отозванным
+    return revoked_at is not None and issued_at <= float(revoked_at)
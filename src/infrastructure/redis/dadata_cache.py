@@ -0,0 +1,37 @@
+import json
+import time
+from typing import Any
+
+from config import settings
+from src.infrastructure.redis import redis
+
+# ответ DaData по ИНН: {"fetched_at": ..., "data": {...} | null}
+key_inn = "dadata:inn:{inn}"
+
+
+async def get(inn: str) -> tuple[dict[str, Any] | None, float] | None:
+    """
+    Закешированный ответ DaData
+    :param inn: ИНН
+    :return: (данные организации или None - не найдена, время запроса) или None - нет в кеше
+    """
+    raw = await redis.get(key_inn.format(inn=inn))
+    if raw is None:
+        return None
+    item = json.loads(raw)
+    return item["data"], item["fetched_at"]
+
+
+async def put(inn: str, data: dict[str, Any] | None) -> None:
+    """
+    Кладёт ответ DaData: свежий DADATA_CACHE_TTL_SECONDS,
+    после этого ещё DADATA_STALE_TTL_SECONDS отдаётся, пока обновляется в фоне
+    :param inn: ИНН
+    :param data: данные организации или None
+    :return: None
+    """
+    await redis.set(
+        key_inn.format(inn=inn),
+        json.dumps({"fetched_at": time.time(), "data": data}, ensure_ascii=False),
+        ex=settings.DADATA_CACHE_TTL_SECONDS + settings.DADATA_STALE_TTL_SECONDS
+    )
@@ -0,0 +1,29 @@
+from config import settings
+from src.infrastructure.redis.tiered_cache import MISS, TieredCache
+
+# сериализованный EnterpriseOut компании: L1 в памяти воркера, L2 - "enterprise:out:{enterprise_id}"
+cache = TieredCache(
+    "enterprise:out",
+    ttl=settings.ENTERPRISE_CACHE_TTL_SECONDS,
+    local_ttl=settings.ENTERPRISE_LOCAL_TTL_SECONDS,
+    local_max_size=settings.ENTERPRISE_LOCAL_MAX_SIZE,
+)
+
+
+async def get(enterprise_id: int) -> str | None:
+    value = await cache.get(enterprise_id)
+    return None if value is MISS else value
+
+
+async def put(enterprise_id: int, value: str) -> None:
+    await cache.put(enterprise_id, value)
+
+
+async def invalidate(enterprise_id: int) -> None:
+    """
+    Сбрасывает закешированный EnterpriseOut (участники, профиль, контакты)
+    во всех воркерах
+    :param enterprise_id: id компании
+    :return: None
+    """
+    await cache.invalidate(enterprise_id)
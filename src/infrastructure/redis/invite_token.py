@@ -1,46 +1,97 @@
 import secrets
+import time
 
+from config import settings
 from src.infrastructure.redis import redis
 
-key_token = "referral:tokens:{inn}"
+# ZSET токенов компании: member - токен, score - когда истекает (мс)
+# у каждой пачки свой срок, новые пачки дописываются к старым
+key_tokens = "invite:tokens:{inn}"
+# индекс ИНН -> id компании: присоединение по токену не ходит в БД
+key_enterprise = "invite:enterprise:{inn}"
 
+# KEYS: токены, индекс; ARGV: now_ms, expires_ms, enterprise_id, токены...
+# истёкшие токены выкидываем, ключи живут до конца самой поздней пачки
+APPEND = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for i = 4, #ARGV do
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[i])
+end
+local last = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+redis.call('PEXPIREAT', KEYS[1], last[2])
+redis.call('SET', KEYS[2], ARGV[3])
+redis.call('PEXPIREAT', KEYS[2], last[2])
+return #ARGV - 3
+"""
 
-async def create_tokens(inn: str, count: int, nbytes=10) -> set[str]:
+# KEYS: токены, индекс; ARGV: токен, now_ms
+# -> id компании (токен погашен) или nil (неизвестный или истёкший)
+CONSUME = """
+local expires = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not expires then
+    return false
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+if tonumber(expires) <= tonumber(ARGV[2]) then
+    return false
+end
+return redis.call('GET', KEYS[2])
+"""
+
+_append = redis.register_script(APPEND)
+_consume = redis.register_script(CONSUME)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+async def create_tokens(
+        inn: str,
+        enterprise_id: int,
+        count: int,
+        ttl_seconds: int | None = None,
+        nbytes=10
+) -> set[str]:
     """
-    Создаёт токены и кладёт их в Redis
-    :param nbytes: количество символов
-    :param inn: ИНН компании (к ней токены и относятся)
+    Дописывает пачку токенов компании (ранее выданные остаются в силе)
+    :param inn: ИНН компании (по нему присоединяются сотрудники)
+    :param enterprise_id: id компании - попадает в индекс ИНН -> компания
     :param count: количество токенов
-    :return: None
+    :param ttl_seconds: срок жизни пачки (по умолчанию INVITE_TOKEN_TTL_SECONDS)
+    :param nbytes: количество случайных байт в токене
+    :return: новые токены
     """
     tokens = {secrets.token_urlsafe(nbytes) for _ in range(count)}
     if not tokens:
         return set()
-    key = key_token.format(inn=inn)
-    pipe = redis.pipeline(transaction=True)
-    redis.set()
-    pipe.delete(key)
-    pipe.sadd(key, *tokens)
-    pipe.expire(key, 24 * 60 * 60)  # 24h
-    await pipe.execute()
+    now = _now_ms()
+    expires = now + (ttl_seconds or settings.INVITE_TOKEN_TTL_SECONDS) * 1000
+    await _append(
+        keys=[key_tokens.format(inn=inn), key_enterprise.format(inn=inn)],
+        args=[now, expires, enterprise_id, *tokens]
+    )
     return tokens
 
 
-async def validate_token(inn: str, token: str) -> bool:
+async def consume_token(inn: str, token: str) -> int | None:
     """
-    Автоматически проверяет токен и удаляет, если он верный
-    удаляется, так как токен должен быть одноразовым
-    :param inn: - токены относятся к ИНН компании
+    Одним скриптом проверяет и гасит токен (одноразовый)
+    :param inn: ИНН компании, к которой относится токен
     :param token: сам токен (его значение)
-    :return: bool - является ли токен валидным или нет
+    :return: id компании или None, если токен неверный или истёк
     """
-    return await redis.srem(key_token.format(inn=inn), token) == 1
+    enterprise_id = await _consume(
+        keys=[key_tokens.format(inn=inn), key_enterprise.format(inn=inn)],
+        args=[token, _now_ms()]
+    )
+    return int(enterprise_id) if enterprise_id is not None else None
 
 
 async def get_tokens(inn: str) -> set[str]:
     """
-    Возвращает токены, созданные компанией
+    Возвращает действующие токены, созданные компанией
     :param inn: ИНН компании, к которой привязаны токены
-    :return: список доступных токенов компании
+    :return: множество токенов
     """
-    return await redis.smembers(key_token.format(inn=inn))
+    return set(await redis.zrangebyscore(key_tokens.format(inn=inn), _now_ms(), "+inf"))
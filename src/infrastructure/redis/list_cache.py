@@ -0,0 +1,81 @@
+import hashlib
+import json
+import time
+from typing import Any
+
+from config import settings
+from src.infrastructure.redis import redis
+from src.infrastructure.redis.tiered_cache import MISS, TieredCache
+
+# версия списков таблицы у компании: растёт после каждого изменения
+key_version = "cache:version:{table}:{enterprise_id}"
+# страница списка: версия входит в ключ - записи неизменны, старые просто истекают по TTL
+key_list = "{table}:{enterprise_id}:{version}:{digest}"
+
+pages = TieredCache(
+    "cache:list",
+    ttl=settings.LIST_CACHE_TTL_SECONDS,
+    local_ttl=settings.LIST_CACHE_TTL_SECONDS,
+    local_max_size=settings.LIST_LOCAL_MAX_SIZE,
+)
+
+
+def version_keys(tables: list[str], enterprise_id: int, *extra: str) -> list[str]:
+    return [key_version.format(table=table, enterprise_id=enterprise_id) for table in tables] + list(extra)
+
+
+def list_key(table: str, enterprise_id: int, versions: list[Any], params: dict[str, Any]) -> str:
+    """
+    Ключ страницы списка
+    :param table: таблица
+    :param enterprise_id: id компании
+    :param versions: версии, от которых зависит список
+    :param params: схема, пагинация и фильтры
+    :return: ключ страницы
+    """
+    raw = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    return key_list.format(
+        table=table,
+        enterprise_id=enterprise_id,
+        version=".".join(str(int(v or 0)) for v in versions),
+        digest=hashlib.sha1(raw.encode()).hexdigest(),
+    )
+
+
+async def get_versions(keys: list[str]) -> list[Any]:
+    """
+    Текущие версии одним MGET
+    Отсутствующие версии заводятся от текущего времени: после сброса Redis
+    отсчёт не начнётся с нуля и не повторит уже выданные клиентам ETag
+    :param keys: ключи версий
+    :return: версии в порядке keys
+    """
+    versions = await redis.mget(keys)
+    missing = [key for key, version in zip(keys, versions) if version is None]
+    if missing:
+        seed = time.time_ns() // 1000
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in missing:
+                pipe.set(key, seed, nx=True)
+            await pipe.execute()
+        versions = await redis.mget(keys)
+    return versions
+
+
+async def bump_version(table: str, enterprise_id: int) -> None:
+    """
+    Инвалидирует все закешированные списки таблицы у компании
+    :param table: таблица
+    :param enterprise_id: id компании
+    :return: None
+    """
+    await redis.incr(key_version.format(table=table, enterprise_id=enterprise_id))
+
+
+async def get(key: str) -> str | None:
+    value = await pages.get(key)
+    return None if value is MISS else value
+
+
+async def put(key: str, value: str) -> None:
+    await pages.put(key, value)
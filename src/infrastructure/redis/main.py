@@ -1,5 +1,30 @@
 # Базовая инициализация Redis
 
 from redis.asyncio import Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from redis.exceptions import ConnectionError
 
-redis = Redis(host="localhost", port=6379, decode_responses=True)
+from config import settings
+
+# клиент для запросов: короткие таймауты подключения и ответа -
+# при недоступном или зависшем Redis запросы быстро уходят в обход кеша (RedisError)
+# повтор - один и сразу, только на оборванном соединении (рестарт Redis):
+# повторы по таймауту с паузами (по умолчанию) растягивают отказ до ~10с
+redis = Redis(
+    host="localhost",
+    port=6379,
+    decode_responses=True,
+    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    retry=Retry(NoBackoff(), 1, supported_errors=(ConnectionError,))
+)
+
+# отдельный клиент для pub/sub подписки: она ждёт сообщений без ограничения,
+# таймаут чтения рвал бы её на каждой паузе
+pubsub_redis = Redis(
+    host="localhost",
+    port=6379,
+    decode_responses=True,
+    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS
+)
@@ -0,0 +1,44 @@
+from config import settings
+from src.infrastructure.redis.tiered_cache import MISS, TieredCache
+
+# user_id -> enterprise_id: L1 в памяти воркера, L2 - "membership:user:{user_id}"
+cache = TieredCache(
+    "membership:user",
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS,
+    local_ttl=settings.MEMBERSHIP_LOCAL_TTL_SECONDS,
+    local_max_size=settings.MEMBERSHIP_LOCAL_MAX_SIZE,
+)
+
+
+async def get(user_id: int):
+    """
+    Компания пользователя из кеша
+    :param user_id: id пользователя
+    :return: enterprise_id, None (не состоит) или MISS
+    """
+    value = await cache.get(user_id)
+    if value is MISS or value is None:
+        return value
+    return int(value)
+
+
+async def put(user_id: int, enterprise_id: int | None) -> None:
+    """
+    Кладёт результат запроса в БД
+    "Не состоит" - только в память воркера: пользователь вот-вот может вступить,
+    а в Redis такое значение пережило бы гонку с вступлением
+    :param user_id: id пользователя
+    :param enterprise_id: id компании или None
+    :return: None
+    """
+    await cache.put(user_id, str(enterprise_id) if enterprise_id is not None else None)
+
+
+async def invalidate(user_id: int) -> None:
+    """
+    Сбрасывает компанию пользователя (вступил, вышел, создал компанию)
+    во всех воркерах
+    :param user_id: id пользователя
+    :return: None
+    """
+    await cache.invalidate(user_id)
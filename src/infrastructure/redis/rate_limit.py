@@ -0,0 +1,62 @@
+import math
+import secrets
+import time
+from dataclasses import dataclass
+
+from src.infrastructure.redis import redis
+
+key_rate = "ratelimit:{scope}:{subject}"
+
+# скользящее окно на ZSET (score - время попытки в мс), все ключи - атомарно:
+# сначала проверяем все окна, попытку записываем, только если прошла во всех
+# KEYS - окна; ARGV: now_ms, member, затем пары (limit, window_ms) на каждый ключ
+# -> {1, 0} - можно; {0, retry_after_ms} - нельзя
+SLIDING_WINDOW = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[1 + i * 2])
+    local window = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local wait = tonumber(oldest[2]) + window - now
+        if wait > retry_after then
+            retry_after = wait
+        end
+    end
+end
+if retry_after > 0 then
+    return {0, retry_after}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, member)
+    redis.call('PEXPIRE', key, tonumber(ARGV[2 + i * 2]))
+end
+return {1, 0}
+"""
+
+_script = redis.register_script(SLIDING_WINDOW)
+
+
+@dataclass(frozen=True)
+class Limit:
+    scope: str
+    subject: str
+    limit: int
+    window_seconds: int
+
+
+async def hit(*limits: Limit) -> float:
+    """
+    Засчитывает попытку во всех окнах сразу
+    :param limits: окна (например, по IP и по email)
+    :return: 0 - попытка разрешена, иначе - через сколько секунд можно повторить
+    """
+    keys = [key_rate.format(scope=item.scope, subject=item.subject) for item in limits]
+    args = [int(time.time() * 1000), secrets.token_hex(8)]
+    for item in limits:
+        args += [item.limit, item.window_seconds * 1000]
+    allowed, retry_after_ms = await _script(keys=keys, args=args)
+    return 0 if allowed else math.ceil(int(retry_after_ms) / 1000)
@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Protocol
+
+from src.infrastructure.redis import pubsub_redis, redis
+
+log = logging.getLogger("cache")
+
+# канал, по которому воркеры сообщают друг другу об изменениях: "{namespace}|{key}"
+CHANNEL = "cache:invalidate"
+# после изменения в L2 лежит метка "не кешировать", пока не закончатся запросы,
+# прочитавшие из БД старые данные (иначе они положат их обратно)
+TOMBSTONE = "-"
+TOMBSTONE_SECONDS = 10
+# пауза перед переподключением к pub/sub
+RECONNECT_SECONDS = 1
+
+# результат get, если в кеше ничего нет
+MISS = object()
+
+
+class LocalLRU:
+    """
+    LRU в памяти воркера с TTL на запись
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return MISS
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return MISS
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class LocalTier(Protocol):
+    # то, что слушатель умеет сбрасывать в памяти воркера
+    def evict_local(self, key: str) -> None: ...
+
+    def clear_local(self) -> None: ...
+
+
+class InvalidationListener:
+    """
+    Подписка воркера на CHANNEL: сбрасывает L1 зарегистрированных кешей
+    Пока подписки нет (старт, обрыв связи) - L1 не используется,
+    после переподключения очищается целиком: сообщения за это время потеряны
+    """
+
+    def __init__(self) -> None:
+        self.tiers: dict[str, LocalTier] = {}
+        self.connected = False
+        self._task: asyncio.Task | None = None
+
+    def register(self, namespace: str, tier: LocalTier) -> None:
+        self.tiers[namespace] = tier
+
+    def clear_all(self) -> None:
+        for tier in self.tiers.values():
+            tier.clear_local()
+
+    def dispatch(self, message: str) -> None:
+        namespace, _, key = message.partition("|")
+        tier = self.tiers.get(namespace)
+        if tier is not None:
+            tier.evict_local(key)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = pubsub_redis.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                self.clear_all()
+                self.connected = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.warning("cache invalidation channel lost", exc_info=True)
+            finally:
+                self.connected = False
+                self.clear_all()
+                await pubsub.aclose()
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+invalidation_listener = InvalidationListener()
+
+
+async def publish(namespace: str, key: Any) -> None:
+    """
+    Сообщает всем воркерам: сбросить key в L1 кеша namespace
+    :param namespace: пространство кеша
+    :param key: ключ внутри него
+    :return: None
+    """
+    await redis.publish(CHANNEL, f"{namespace}|{key}")
+
+
+class TieredCache:
+    """
+    Двухуровневый кеш строк: L1 - LRU в памяти воркера, L2 - Redis
+    Ключ Redis: "{namespace}:{key}"
+    invalidate кладёт в L2 метку и рассылает сброс L1 всем воркерам через pub/sub
+    """
+
+    def __init__(self, namespace: str, ttl: float, local_ttl: float, local_max_size: int) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = LocalLRU(local_max_size, local_ttl)
+        invalidation_listener.register(namespace, self)
+
+    def redis_key(self, key: Any) -> str:
+        return f"{self.namespace}:{key}"
+
+    @staticmethod
+    def _use_local() -> bool:
+        # без подписки сбросы от других воркеров не дойдут - L1 небезопасен
+        return invalidation_listener.connected
+
+    async def get(self, key: Any) -> Any:
+        """
+        :param key: ключ
+        :return: значение, None (закешированное "нет") или MISS
+        """
+        if self._use_local():
+            value = self.local.get(str(key))
+            if value is not MISS:
+                return value
+        raw = await redis.get(self.redis_key(key))
+        if raw is None or raw == TOMBSTONE:
+            return MISS
+        if self._use_local():
+            self.local.put(str(key), raw)
+        return raw
+
+    async def put(self, key: Any, value: str | None, local_only: bool = False) -> None:
+        """
+        Кладёт прочитанное из БД
+        :param key: ключ
+        :param value: строка или None
+        :param local_only: только в L1 (например, короткоживущее "нет")
+        :return: None
+        """
+        if self._use_local():
+            self.local.put(str(key), value)
+        if local_only or value is None:
+            return
+        # NX: не затираем метку недавнего изменения
+        await redis.set(self.redis_key(key), value, ex=self.ttl, nx=True)
+
+    async def invalidate(self, key: Any) -> None:
+        """
+        Сбрасывает ключ в L2 и в L1 всех воркеров
+        :param key: ключ
+        :return: None
+        """
+        self.local.pop(str(key))
+        await redis.set(self.redis_key(key), TOMBSTONE, ex=TOMBSTONE_SECONDS)
+        await publish(self.namespace, key)
+
+    def evict_local(self, key: str) -> None:
+        self.local.pop(key)
+
+    def clear_local(self) -> None:
+        self.local.clear()
@@ -1,23 +1,48 @@
 import time, uuid, logging
-from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 alog = logging.getLogger("access")
 
-async def access_middleware(request: Request, call_next):
-    rid = request.headers.get("X-Request-Id") or str(uuid.uuid4())
-    request.state.request_id = rid
-
-    t0 = time.perf_counter()
-    resp = await call_next(request)
-    dur_ms = int((time.perf_counter() - t0) * 1000)
-
-    alog.info("access", extra=dict(
-        request_id=rid,
-        user_id=getattr(request.state, "user_id", None),
-        method=request.method,
-        path=str(request.url.path),
-        status=resp.status_code,
-        details={"duration_ms": dur_ms},
-    ))
-    resp.headers["X-Request-Id"] = rid
-    return resp
+
+class AccessMiddleware:
+    """
+    Чистый ASGI: request id, время ответа и access-лог
+    В отличие от app.middleware("http") (BaseHTTPMiddleware) тело ответа
+    не перекладывается через отдельную задачу и поток - только подменяется send
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = Headers(scope=scope).get("x-request-id") or str(uuid.uuid4())
+        # то же, что request.state.request_id
+        state = scope.setdefault("state", {})
+        state["request_id"] = rid
+        status = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Request-Id"] = rid
+            await send(message)
+
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            dur_ms = int((time.perf_counter() - t0) * 1000)
+            alog.info("access", extra=dict(
+                request_id=rid,
+                user_id=state.get("user_id"),
+                method=scope["method"],
+                path=scope["path"],
+                status=status,
+                details={"duration_ms": dur_ms},
+            ))
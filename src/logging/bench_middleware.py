@@ -0,0 +1,125 @@
+"""
+Микробенчмарк middleware: запросов в секунду на пустом маршруте
+до  - access_middleware через app.middleware("http") + AuthMiddleware на BaseHTTPMiddleware
+после - те же AccessMiddleware и AuthMiddleware на чистом ASGI
+
+Запуск: python -m src.logging.bench_middleware [requests] [concurrency]
+Запросы идут прямо в ASGI-приложение (без сети и сервера), access-лог выключен -
+в замере только накладные расходы самих middleware
+"""
+import asyncio
+import logging
+import sys
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.auth.middleware import AuthMiddleware
+from src.logging.access import AccessMiddleware, alog
+
+ROUNDS = 3
+
+
+async def legacy_access_middleware(request: Request, call_next):
+    # прежняя версия src.logging.access
+    rid = request.headers.get("X-Request-Id") or str(uuid.uuid4())
+    request.state.request_id = rid
+
+    t0 = time.perf_counter()
+    resp = await call_next(request)
+    dur_ms = int((time.perf_counter() - t0) * 1000)
+
+    alog.info("access", extra=dict(
+        request_id=rid,
+        user_id=getattr(request.state, "user_id", None),
+        method=request.method,
+        path=str(request.url.path),
+        status=resp.status_code,
+        details={"duration_ms": dur_ms},
+    ))
+    resp.headers["X-Request-Id"] = rid
+    return resp
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    # прежняя версия src.auth.middleware без заголовка Authorization
+    async def dispatch(self, request: Request, call_next):
+        request.state.user = None
+        return await call_next(request)
+
+
+def build(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping() -> dict:
+        return {"ok": True}
+
+    if legacy:
+        app.add_middleware(LegacyAuthMiddleware)
+        app.middleware("http")(legacy_access_middleware)
+    else:
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(AccessMiddleware)
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> float:
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            await call(app)
+
+    await worker(100)  # прогрев
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    return (requests // concurrency * concurrency) / (time.perf_counter() - t0)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    alog.setLevel(logging.WARNING)
+    apps = {"before (BaseHTTPMiddleware)": build(legacy=True), "after (pure ASGI)": build(legacy=False)}
+    for app in apps.values():
+        # lifespan не нужен, но стек middleware строится при первом вызове
+        await call(app)
+    best = {}
+    for _ in range(ROUNDS):
+        for title, app in apps.items():
+            best[title] = max(best.get(title, 0.0), await measure(app, requests, concurrency))
+    print(f"requests={requests} concurrency={concurrency}, best of {ROUNDS}")
+    for title, rps in best.items():
+        print(f"{title:<30} {rps:>10.0f} req/s")
+    before, after = best.values()
+    print(f"{'speedup':<30} {after / before:>10.2f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(args + [20_000, 10][len(args):])))
@@ -1,13 +1,62 @@
 # Обновлённые сериализаторы для всех моделей без связи 1:1
-from pydantic import BaseModel
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
 
 from src.db.enums import MetalType
 
+# максимальный размер пакета в одном запросе
+BATCH_MAX_SIZE = 5000
+
+# размер страницы списков
+PAGE_DEFAULT_LIMIT = 100
+PAGE_MAX_LIMIT = 1000
+
+ItemT = TypeVar('ItemT')
+
 
 class ORMBaseModel(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# --- Pagination ---
+class PageParams(BaseModel):
+    limit: int = Field(PAGE_DEFAULT_LIMIT, ge=1, le=PAGE_MAX_LIMIT)
+    cursor: str | None = None  # курсор из X-Next-Cursor предыдущей страницы
+    sort_by: str | None = None
+    descending: bool = False
+
+
+class Page(BaseModel, Generic[ItemT]):
+    items: list[ItemT]
+    next_cursor: str | None = None
+
+
+# --- Batch ---
+class BatchIn(BaseModel, Generic[ItemT]):
+    items: list[ItemT] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+
+
+class BatchDelete(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+
+
+class BatchItemError(BaseModel):
+    index: int  # индекс элемента во входном списке
+    code: str
+    message: str
+
+
+class BatchOut(BaseModel, Generic[ItemT]):
+    items: list[ItemT]
+    errors: list[BatchItemError]
+
+
+class BatchDeleteOut(BaseModel):
+    deleted: list[int]
+    errors: list[BatchItemError]
+
+
 # --- MaterialCategory ---
 class MaterialCategoryBase(BaseModel):
     material_type: MetalType
@@ -28,6 +77,10 @@ class MaterialCategoryOut(MaterialCategoryBase, ORMBaseModel):
     is_general: bool
 
 
+class MaterialCategoryBatchUpdate(MaterialCategoryUpdate):
+    id: int
+
+
 
 
 
@@ -211,6 +264,10 @@ class GostOut(GostBase, ORMBaseModel):
     is_general: bool
 
 
+class GostBatchUpdate(GostUpdate):
+    id: int
+
+
 # --- AssortmentType ---
 class AssortmentTypeBase(BaseModel):
     name: str
@@ -268,8 +325,12 @@ class GostAssortmentBatchOut(BaseModel):
 
 # --- Material ---
 class MaterialBase(BaseModel):
+    # в API поля B_D и material_category_id, в модели - DB и category_id:
+    # снаружи алиасы, внутри (model_dump, ORM, проекция) - имена колонок
+    model_config = {"populate_by_name": True}
+
     brand: str
-    B_D: float
+    DB: float = Field(alias='B_D')
     height: float
     strength: float
     length: float
@@ -279,10 +340,11 @@ class MaterialBase(BaseModel):
     tear_resistance: float
     elongation: float
 
-    comment: str | None = None
-    comment_en: str | None = None
+    # колонки NOT NULL: без комментария - пустая строка
+    comment: str = ''
+    comment_en: str = ''
 
-    material_category_id: int
+    category_id: int = Field(alias='material_category_id')
     assortment_type_id: int
 
 
@@ -291,8 +353,10 @@ class MaterialCreate(MaterialBase):
 
 
 class MaterialUpdate(BaseModel):
+    model_config = {"populate_by_name": True}
+
     brand: str | None = None
-    B_D: float | None = None
+    DB: float | None = Field(None, alias='B_D')
     height: float | None = None
     strength: float | None = None
     length: float | None = None
@@ -305,16 +369,24 @@ class MaterialUpdate(BaseModel):
     comment: str | None = None
     comment_en: str | None = None
 
-    material_category_id: int | None = None
+    category_id: int | None = Field(None, alias='material_category_id')
     assortment_type_id: int | None = None
 
+    # прочитанная версия: если материал с тех пор изменили - 409
+    version: int | None = None
+
 
 class MaterialOut(MaterialBase, ORMBaseModel):
     id: int
+    version: int
     category: MaterialCategoryOut | None = None
     assortment_type: AssortmentTypeOut | None = None
 
 
+class MaterialBatchUpdate(MaterialUpdate):
+    id: int
+
+
 # --- Assortment ---
 class AssortmentBase(BaseModel):
     gost_material_id: int
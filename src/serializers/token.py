@@ -16,3 +16,9 @@ class AccessTokenOut(BaseModel):
     access_token: str
     token_type: str = "Bearer"
     expires_in: int = 60 * settings.EXPIRES_ACCESS_TOKEN_MINUTES
+
+
+# ответ сервиса на /auth/refresh: refresh токен уходит в cookie, а не в тело
+# None - cookie не меняем (параллельный refresh уже выдал новый токен)
+class RefreshOut(AccessTokenOut):
+    refresh_token: str | None = None
@@ -1,16 +1,35 @@
+from datetime import datetime, timezone
+
 from config import settings
 from src.auth import token
 from src.db import models
-from src.serializers.token import AccessTokenOut
+from src.serializers.token import RefreshOut
 from src.serializers.user import UserOut
-from src.services.errors import (
-    NotFound,
-    RefreshTokenExpired,
-    RefreshTokenInvalid
-)
+from src.services.errors import NotFound
 
 
 class AuthService:
+    @staticmethod
+    async def issue_access_token(user_id: int) -> str:
+        """
+        Access токен с claims eid/role, если пользователь в компании
+        iat - момент до чтения членства: изменение, закоммиченное во время чтения,
+        отзовёт и этот токен
+        :param user_id: id пользователя
+        :return: JWT
+        """
+        issued_at = datetime.now(timezone.utc)
+        membership = await models.EnterpriseMember.get_membership_by_user_id(user_id)
+        if membership is None:
+            return token.generate_access_token(user_id, issued_at=issued_at)
+        enterprise_id, role = membership
+        return token.generate_access_token(
+            user_id,
+            enterprise_id=enterprise_id,
+            role=role.value,
+            issued_at=issued_at
+        )
+
     @staticmethod
     async def me(user_id: int) -> UserOut:
         model = await models.User.get_all_data(user_id)
@@ -19,15 +38,19 @@ class AuthService:
         return UserOut.model_validate(model)
 
     @staticmethod
-    async def refresh(refresh_token: str) -> AccessTokenOut:
-        token_model = await models.RefreshToken.get_by_token(refresh_token)
-        if not token_model:
-            raise RefreshTokenInvalid()
-        if token_model.expired:
-            raise RefreshTokenExpired()
-        access_token = token.generate_access_token(token_model.user_id)
-        return AccessTokenOut(
+    async def refresh(refresh_token: str) -> RefreshOut:
+        """
+        Новый access токен и ротация refresh токена устройства
+        :param refresh_token: текущий refresh токен (из cookie)
+        :return: access токен + новый refresh токен
+            (None - токен только что заменён параллельным refresh, новый уже у той вкладки)
+        """
+        # неизвестный / истёкший / повторно использованный - RefreshToken* ошибки
+        session = await models.RefreshToken.rotate(refresh_token)
+        access_token = await AuthService.issue_access_token(session.user_id)
+        return RefreshOut(
             access_token=access_token,
             token_type="Bearer",
             expires_in=60 * settings.EXPIRES_ACCESS_TOKEN_MINUTES,
+            refresh_token=session.token,
         )
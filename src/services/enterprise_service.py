@@ -1,8 +1,12 @@
+import logging
+
+from redis.exceptions import RedisError
+
 from src.auth.token import validate_join_email_token
 from src.clients.mail import send_invite_email
 from src.db.enums import EnterpriseType
 from src.db.models.enterprise import Enterprise, EnterpriseMember
-from src.infrastructure.redis import invite_token
+from src.infrastructure.redis import enterprise_cache, invite_token
 from src.serializers.enterprise import EnterpriseFillForm, EnterpriseOut
 from src.serializers.token import JoinTokenIn
 from src.services.errors import (
@@ -13,6 +17,8 @@ from src.services.errors import (
 from src.services.translators import translate_token_errors
 from src.use_cases import FillDataWorkflow, JoinEmployeeWorkflow
 
+log = logging.getLogger("enterprise")
+
 
 class EnterpriseService:
     @staticmethod
@@ -29,37 +35,62 @@ class EnterpriseService:
 
     @staticmethod
     async def get(enterprise_id: int) -> EnterpriseOut:
+        """
+        Компания целиком - из Redis, иначе из БД с записью в кеш
+        Кеш сбрасывают модели компании после коммита (участники, профиль, контакты)
+        :param enterprise_id: id компании
+        :return: EnterpriseOut
+        """
+        try:
+            cached = await enterprise_cache.get(enterprise_id)
+            if cached is not None:
+                return EnterpriseOut.model_validate_json(cached)
+        except (RedisError, OSError):
+            log.warning("enterprise cache unavailable", exc_info=True)
         enterprise = await Enterprise.get_all_data(enterprise_id)
         if not enterprise:
             raise EnterpriseNotFound()
-        return EnterpriseOut.model_validate(enterprise)
+        out = EnterpriseOut.model_validate(enterprise)
+        try:
+            await enterprise_cache.put(enterprise_id, out.model_dump_json())
+        except (RedisError, OSError):
+            log.warning("enterprise cache unavailable", exc_info=True)
+        return out
 
     @staticmethod
     async def join_by_token(dto: JoinTokenIn, user_id: int) -> EnterpriseMember:
         """
         Присоединение пользователя по токену
+        Токен гасится в Redis и сразу даёт id компании (индекс ИНН -> компания) - без запроса в БД
         :param dto: dto с токеном и ИНН
         :param user_id: id пользователя
         :return: сообщение dict
         """
-        enterprise: Enterprise = await Enterprise.get_by_inn(dto.inn)
-        if not enterprise:
-            raise EnterpriseNotFound()
-        if enterprise.enterprise_type == EnterpriseType.Individual:
-            raise InviteByInnNotAllowedForIndividuals()
-        if not await invite_token.validate_token(enterprise.legal_entity.inn, dto.token):
+        enterprise_id = await invite_token.consume_token(dto.inn, dto.token)
+        if enterprise_id is None:
             raise JoinTokenError()
-        return await EnterpriseMember.create(enterprise_id=enterprise.id, user_id=user_id)
+        return await EnterpriseMember.create(enterprise_id=enterprise_id, user_id=user_id)
 
     @staticmethod
-    async def create_invite_token(inn: str, count: int) -> set[str]:
+    async def create_invite_token(
+            enterprise_id: int,
+            inn: str,
+            enterprise_type: EnterpriseType,
+            count: int,
+            ttl_seconds: int | None = None
+    ) -> set[str]:
         """
-        Создаём токены связанные с ИНН компании
+        Создаём пачку токенов, связанных с ИНН компании (к уже выданным)
+        :param enterprise_id: id компании
         :param inn: ИНН компании
+        :param enterprise_type: тип компании - физ. лицо приглашать по ИНН не может
         :param count: количество нужных токенов, которые задаёт владелец
-        :return:
+        :param ttl_seconds: срок жизни пачки
+        :return: новые токены
         """
-        return await invite_token.create_tokens(inn, count)
+        if enterprise_type == EnterpriseType.Individual:
+            raise InviteByInnNotAllowedForIndividuals()
+        return await invite_token.create_tokens(inn, enterprise_id, count, ttl_seconds)
 
     @staticmethod
     async def revoke_member(enterprise: Enterprise, member_id: int) -> bool:
@@ -67,6 +67,13 @@ class NotUniqueEmail(ServiceError):
     message = "not unique email"
 
 
+class NotModified(ServiceError):
+    """Условный GET: у клиента актуальная версия (304 без тела)"""
+    status_code = 304
+    code = "NOT_MODIFIED"
+    message = "Not modified"
+
+
 class PreconditionFailed(ServiceError):
     status_code = 412
     code = "PRECONDITION_FAILED"
@@ -87,6 +94,12 @@ class RateLimited(ServiceError):
     code = "RATE_LIMITED"
 
 
+class ServiceUnavailable(ServiceError):
+    status_code = 503
+    code = "SERVICE_UNAVAILABLE"
+    message = "Service temporarily unavailable"
+
+
 class ExternalServiceError(ServiceError):
     status_code = 502
     code = "UPSTREAM_ERROR"
@@ -5,8 +5,11 @@ from src.db.models import Assortment, GostAssortment
 from src.serializers.resources import (
     AssortmentCreate,
     AssortmentUpdate,
-    AssortmentOut
+    AssortmentOut,
+    PageParams,
+    Page
 )
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class AssortmentService:
@@ -30,13 +33,12 @@ class AssortmentService:
         return AssortmentOut.model_validate(obj)
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs: Any) -> list[AssortmentOut]:
-        objs = await Assortment.list_by_enterprise(
-            enterprise_id=enterprise_id,
-            load_options=cls.get_options(),
-            **kwargs
-        )
-        return [AssortmentOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(Assortment, AssortmentOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[AssortmentOut]:
+        return await cached_page(Assortment, enterprise_id, AssortmentOut, page, **kwargs)
 
     @classmethod
     async def create(cls, enterprise_id: int, data: AssortmentCreate) -> AssortmentOut:
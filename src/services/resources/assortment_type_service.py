@@ -1,10 +1,17 @@
-from typing import List
+from typing import Any, List
 
 from sqlalchemy.orm import selectinload, Load
 
 
 from src.db.models import AssortmentType, Gost
-from src.serializers.resources import AssortmentTypeCreate, AssortmentTypeUpdate, AssortmentTypeOut
+from src.serializers.resources import (
+    AssortmentTypeCreate,
+    AssortmentTypeUpdate,
+    AssortmentTypeOut,
+    PageParams,
+    Page
+)
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class AssortmentTypeService:
@@ -14,12 +21,12 @@ class AssortmentTypeService:
         return [selectinload(Gost)]
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs) -> list[AssortmentTypeOut]:
-        objs = await AssortmentType.list_by_enterprise(
-            enterprise_id,
-            options=cls.get_options(),
-            **kwargs)
-        return [AssortmentTypeOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(AssortmentType, AssortmentTypeOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[AssortmentTypeOut]:
+        return await cached_page(AssortmentType, enterprise_id, AssortmentTypeOut, page, **kwargs)
 
     @classmethod
     async def create(cls, data: AssortmentTypeCreate, enterprise_id: int) -> AssortmentTypeOut:
@@ -0,0 +1,14 @@
+from src.serializers.resources import BatchItemError
+from src.services.errors import ServiceError
+
+
+def batch_errors(errors: dict[int, ServiceError]) -> list[BatchItemError]:
+    """
+    Ошибки пакетной операции из модели -> сериализатор ответа
+    :param errors: индекс элемента -> сервисная ошибка
+    :return: список ошибок по элементам (по возрастанию индекса)
+    """
+    return [
+        BatchItemError(index=index, code=error.code, message=error.message)
+        for index, error in sorted(errors.items())
+    ]
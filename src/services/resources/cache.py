@@ -0,0 +1,119 @@
+import logging
+from functools import lru_cache
+from typing import Any, Type, TypeVar
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+from sqlalchemy import inspect
+
+from src.db import read_from_primary
+from src.db.enterprise_base import EnterpriseBatchMixin, EnterpriseGeneralBase
+from src.db.general_catalog import VERSION_KEY as GENERAL_VERSION_KEY
+from src.db.utils.projection import nested_schema
+from src.infrastructure.redis import list_cache
+from src.serializers.resources import Page, PageParams
+
+log = logging.getLogger("cache")
+
+ItemT = TypeVar('ItemT', bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def dependent_models(model, schema: Type[BaseModel]) -> tuple[type, ...]:
+    """
+    Модели, чьи строки попадают в схему: сама модель
+    и связанные через вложенные схемы (category, assortment_type.gost, ...)
+    :param model: модель
+    :param schema: схема *Out
+    :return: модели без повторов
+    """
+    result = [model]
+    mapper = inspect(model)
+    for name, field in schema.model_fields.items():
+        nested = nested_schema(field.annotation)
+        relationship = mapper.relationships.get(name)
+        if nested is None or relationship is None:
+            continue
+        for related in dependent_models(relationship.mapper.class_, nested):
+            if related not in result:
+                result.append(related)
+    return tuple(result)
+
+
+def version_keys(model, schema: Type[BaseModel], enterprise_id: int) -> list[str]:
+    """
+    Ключи версий, от которых зависит ответ схемы у компании:
+    таблицы самой модели и связанных, плюс общий справочник
+    """
+    models = [m for m in dependent_models(model, schema) if issubclass(m, EnterpriseBatchMixin)]
+    extra = [GENERAL_VERSION_KEY] if any(issubclass(m, EnterpriseGeneralBase) for m in models) else []
+    return list_cache.version_keys([m.__tablename__ for m in models], enterprise_id, *extra)
+
+
+async def resource_tag(model, schema: Type[BaseModel], enterprise_id: int) -> str | None:
+    """
+    Версия данных схемы у компании - основа ETag, без запроса в БД
+    :param model: модель
+    :param schema: схема *Out
+    :param enterprise_id: id компании
+    :return: строка версий или None, если Redis недоступен
+    """
+    try:
+        versions = await list_cache.get_versions(version_keys(model, schema, enterprise_id))
+    except (RedisError, OSError):
+        log.warning("version counters unavailable", exc_info=True)
+        return None
+    return f"{model.__tablename__}:{enterprise_id}:" + ".".join(str(v) for v in versions)
+
+
+async def cached_page(
+        model,
+        enterprise_id: int,
+        schema: Type[ItemT],
+        page: PageParams,
+        **kwargs: Any
+) -> Page[ItemT]:
+    """
+    Страница списка через Redis (read-through)
+    Ключ содержит версии таблиц схемы у компании (+ версию общего справочника),
+    любое изменение через модели компании увеличивает версию - устаревшее не отдаётся
+    Промах читается с primary, если Redis недоступен - идём прямо в БД (можно реплику)
+    :param model: модель EnterpriseBase / EnterpriseGeneralBase
+    :param enterprise_id: id компании
+    :param schema: схема *Out
+    :param page: параметры страницы
+    :param kwargs: фильтры
+    :return: страница
+    """
+    key = None
+    try:
+        versions = await list_cache.get_versions(version_keys(model, schema, enterprise_id))
+        key = list_cache.list_key(
+            model.__tablename__,
+            enterprise_id,
+            versions,
+            {'schema': schema.__name__, **page.model_dump(), **kwargs}
+        )
+        raw = await list_cache.get(key)
+        if raw is not None:
+            return Page[schema].model_validate_json(raw)
+    except (RedisError, OSError):
+        log.warning("list cache unavailable", exc_info=True)
+
+    if key is not None:
+        # версии прочитаны до выборки: страница с отстающей реплики легла бы
+        # под новую версию на весь TTL - кешируем только прочитанное с primary
+        await read_from_primary()
+    items, next_cursor = await model.page_rows_by_enterprise(
+        enterprise_id=enterprise_id,
+        schema=schema,
+        **page.model_dump(),
+        **kwargs
+    )
+    result = Page[schema](items=items, next_cursor=next_cursor)
+    if key is not None:
+        try:
+            await list_cache.put(key, result.model_dump_json())
+        except (RedisError, OSError):
+            log.warning("list cache unavailable", exc_info=True)
+    return result
@@ -7,7 +7,10 @@ from src.serializers.resources import (
     GostAssortmentCreate,
     GostAssortmentUpdate,
     GostAssortmentOut,
+    PageParams,
+    Page
 )
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class GostAssortmentService:
@@ -29,13 +32,12 @@ class GostAssortmentService:
         return GostAssortmentOut.model_validate(obj)
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs: Any) -> list[GostAssortmentOut]:
-        objs = await GostAssortment.list_by_enterprise(
-            enterprise_id=enterprise_id,
-            load_options=cls.options,
-            **kwargs
-        )
-        return [GostAssortmentOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(GostAssortment, GostAssortmentOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[GostAssortmentOut]:
+        return await cached_page(GostAssortment, enterprise_id, GostAssortmentOut, page, **kwargs)
 
     @classmethod
     async def create(cls, enterprise_id: int, data: GostAssortmentCreate) -> GostAssortmentOut:
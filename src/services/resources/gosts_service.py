@@ -1,14 +1,30 @@
+from typing import Any, List
+
 from src.db.models import Gost
-from src.serializers.resources import GostCreate, GostUpdate, GostOut
+from src.serializers.resources import (
+    GostCreate,
+    GostUpdate,
+    GostOut,
+    GostBatchUpdate,
+    BatchOut,
+    BatchDeleteOut,
+    PageParams,
+    Page
+)
+from src.services.resources.cache import cached_page, resource_tag
+from src.services.resources.batch import batch_errors
 
 
 # категория материала
 class GostService:
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs) -> list[GostOut]:
-        objs = await Gost.list_by_enterprise(enterprise_id, **kwargs)
-        return [GostOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(Gost, GostOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[GostOut]:
+        return await cached_page(Gost, enterprise_id, GostOut, page, **kwargs)
 
     @classmethod
     async def create(cls, data: GostCreate, enterprise_id: int) -> GostOut:
@@ -32,3 +48,33 @@ class GostService:
     @classmethod
     async def delete(cls, gost_id: int, enterprise_id: int) -> bool:
         return await Gost.delete_by_enterprise(gost_id, enterprise_id)
+
+    @classmethod
+    async def create_many(cls, enterprise_id: int, items: List[GostCreate]) -> BatchOut[GostOut]:
+        objs, errors = await Gost.create_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            rows=[item.model_dump() for item in items],
+        )
+        return BatchOut[GostOut](
+            items=[GostOut.model_validate(obj) for obj in objs],
+            errors=batch_errors(errors)
+        )
+
+    @classmethod
+    async def update_many(cls, enterprise_id: int, items: List[GostBatchUpdate]) -> BatchOut[GostOut]:
+        objs, errors = await Gost.update_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            rows=[item.model_dump(exclude_unset=True) for item in items],
+        )
+        return BatchOut[GostOut](
+            items=[GostOut.model_validate(obj) for obj in objs],
+            errors=batch_errors(errors)
+        )
+
+    @classmethod
+    async def delete_many(cls, enterprise_id: int, ids: List[int]) -> BatchDeleteOut:
+        deleted, errors = await Gost.delete_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            ids=ids
+        )
+        return BatchDeleteOut(deleted=deleted, errors=batch_errors(errors))
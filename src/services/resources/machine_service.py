@@ -2,7 +2,14 @@ from typing import Any
 from sqlalchemy.orm import selectinload, Load
 
 from src.db.models import Machine
-from src.serializers.resources import MachineOut, MachineCreate, MachineUpdate
+from src.serializers.resources import (
+    MachineOut,
+    MachineCreate,
+    MachineUpdate,
+    PageParams,
+    Page
+)
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class MachineService:
@@ -22,13 +29,12 @@ class MachineService:
         return MachineOut.model_validate(obj)
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs: Any) -> list[MachineOut]:
-        objs = await Machine.list_by_enterprise(
-            enterprise_id=enterprise_id,
-            load_options=cls.get_options(),
-            **kwargs
-        )
-        return [MachineOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(Machine, MachineOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[MachineOut]:
+        return await cached_page(Machine, enterprise_id, MachineOut, page, **kwargs)
 
     @classmethod
     async def create(cls, enterprise_id: int, **kwargs: Any) -> MachineOut:
@@ -1,13 +1,25 @@
+from typing import Any
+
 from src.db.models import MachineType
-from src.serializers.resources import MachineTypeCreate, MachineTypeUpdate, MachineTypeOut
+from src.serializers.resources import (
+    MachineTypeCreate,
+    MachineTypeUpdate,
+    MachineTypeOut,
+    PageParams,
+    Page
+)
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class MachineTypeService:
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs) -> list[MachineTypeOut]:
-        objs = await MachineType.list_by_enterprise(enterprise_id, **kwargs)
-        return [MachineTypeOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(MachineType, MachineTypeOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[MachineTypeOut]:
+        return await cached_page(MachineType, enterprise_id, MachineTypeOut, page, **kwargs)
 
     @classmethod
     async def create(cls, data: MachineTypeCreate, enterprise_id: int) -> MachineTypeOut:
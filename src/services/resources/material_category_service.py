@@ -1,15 +1,31 @@
+from typing import Any, List
+
 from src.db.models import MaterialCategory
-from src.serializers.resources import MaterialCategoryCreate, MaterialCategoryUpdate, MaterialCategoryOut
+from src.serializers.resources import (
+    MaterialCategoryCreate,
+    MaterialCategoryUpdate,
+    MaterialCategoryOut,
+    MaterialCategoryBatchUpdate,
+    BatchOut,
+    BatchDeleteOut,
+    PageParams,
+    Page
+)
+from src.services.resources.cache import cached_page, resource_tag
 from src.services.errors import NotFound
+from src.services.resources.batch import batch_errors
 
 
 # категория материала
 class MaterialCategoryService:
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs) -> list[MaterialCategoryOut]:
-        objs = await MaterialCategory.list_by_enterprise(enterprise_id, **kwargs)
-        return [MaterialCategoryOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(MaterialCategory, MaterialCategoryOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[MaterialCategoryOut]:
+        return await cached_page(MaterialCategory, enterprise_id, MaterialCategoryOut, page, **kwargs)
 
     @classmethod
     async def create(cls, data: MaterialCategoryCreate, enterprise_id: int) -> MaterialCategoryOut:
@@ -35,3 +51,33 @@ class MaterialCategoryService:
     @classmethod
     async def delete(cls, category_id: int, enterprise_id: int) -> bool:
         return await MaterialCategory.delete_by_enterprise(category_id, enterprise_id)
+
+    @classmethod
+    async def create_many(cls, enterprise_id: int, items: List[MaterialCategoryCreate]) -> BatchOut[MaterialCategoryOut]:
+        objs, errors = await MaterialCategory.create_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            rows=[item.model_dump() for item in items],
+        )
+        return BatchOut[MaterialCategoryOut](
+            items=[MaterialCategoryOut.model_validate(obj) for obj in objs],
+            errors=batch_errors(errors)
+        )
+
+    @classmethod
+    async def update_many(cls, enterprise_id: int, items: List[MaterialCategoryBatchUpdate]) -> BatchOut[MaterialCategoryOut]:
+        objs, errors = await MaterialCategory.update_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            rows=[item.model_dump(exclude_unset=True) for item in items],
+        )
+        return BatchOut[MaterialCategoryOut](
+            items=[MaterialCategoryOut.model_validate(obj) for obj in objs],
+            errors=batch_errors(errors)
+        )
+
+    @classmethod
+    async def delete_many(cls, enterprise_id: int, ids: List[int]) -> BatchDeleteOut:
+        deleted, errors = await MaterialCategory.delete_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            ids=ids
+        )
+        return BatchDeleteOut(deleted=deleted, errors=batch_errors(errors))
@@ -1,11 +1,19 @@
-from typing import Any
+from typing import Any, List
 
 from sqlalchemy.orm import selectinload
 
 from src.db.models import Material, AssortmentType
 from src.serializers.resources import (
-    MaterialOut
+    MaterialOut,
+    MaterialCreate,
+    MaterialBatchUpdate,
+    BatchOut,
+    BatchDeleteOut,
+    PageParams,
+    Page
 )
+from src.services.resources.cache import cached_page, resource_tag
+from src.services.resources.batch import batch_errors
 
 
 class MaterialService:
@@ -29,13 +37,12 @@ class MaterialService:
         return MaterialOut.model_validate(obj)
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs: Any) -> list[MaterialOut]:
-        objs = await Material.list_by_enterprise(
-            enterprise_id=enterprise_id,
-            load_options=cls.get_options(),
-            **kwargs
-        )
-        return [MaterialOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(Material, MaterialOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[MaterialOut]:
+        return await cached_page(Material, enterprise_id, MaterialOut, page, **kwargs)
 
     @classmethod
     async def create(cls, enterprise_id: int, **kwargs: Any) -> MaterialOut:
@@ -58,8 +65,41 @@ class MaterialService:
         return MaterialOut.model_validate(obj)
 
     @classmethod
-    async def delete(cls, id_: int, enterprise_id: int) -> bool:
+    async def delete(cls, id_: int, enterprise_id: int, version: int | None = None) -> bool:
         return await Material.delete_by_enterprise(
             id_=id_,
-            enterprise_id=enterprise_id
+            enterprise_id=enterprise_id,
+            version=version
+        )
+
+    @classmethod
+    async def create_many(cls, enterprise_id: int, items: List[MaterialCreate]) -> BatchOut[MaterialOut]:
+        objs, errors = await Material.create_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            rows=[item.model_dump() for item in items],
+            load_options=cls.get_options(),
+        )
+        return BatchOut[MaterialOut](
+            items=[MaterialOut.model_validate(obj) for obj in objs],
+            errors=batch_errors(errors)
+        )
+
+    @classmethod
+    async def update_many(cls, enterprise_id: int, items: List[MaterialBatchUpdate]) -> BatchOut[MaterialOut]:
+        objs, errors = await Material.update_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            rows=[item.model_dump(exclude_unset=True) for item in items],
+            load_options=cls.get_options(),
+        )
+        return BatchOut[MaterialOut](
+            items=[MaterialOut.model_validate(obj) for obj in objs],
+            errors=batch_errors(errors)
+        )
+
+    @classmethod
+    async def delete_many(cls, enterprise_id: int, ids: List[int]) -> BatchDeleteOut:
+        deleted, errors = await Material.delete_many_by_enterprise(
+            enterprise_id=enterprise_id,
+            ids=ids
         )
+        return BatchDeleteOut(deleted=deleted, errors=batch_errors(errors))
@@ -1,14 +1,25 @@
+from typing import Any
+
 from src.db.models import Method
-from src.serializers.resources import MethodCreate, MethodUpdate, MethodOut
+from src.serializers.resources import (
+    MethodCreate,
+    MethodUpdate,
+    MethodOut,
+    PageParams,
+    Page
+)
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class MethodService:
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs) -> list[MethodOut]:
-        objs = await Method.list_by_enterprise(enterprise_id, **kwargs)
-        print(objs)
-        return [MethodOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(Method, MethodOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[MethodOut]:
+        return await cached_page(Method, enterprise_id, MethodOut, page, **kwargs)
 
     @classmethod
     async def create(cls, data: MethodCreate, enterprise_id: int) -> MethodOut:
@@ -1,17 +1,25 @@
+from typing import Any
+
 from src.db.models import OperationType
 from src.serializers.resources import (
     OperationTypeCreate,
     OperationTypeUpdate,
-    OperationTypeOut
+    OperationTypeOut,
+    PageParams,
+    Page
 )
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class OperationTypeService:
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs) -> list[OperationTypeOut]:
-        objs = await OperationType.list_by_enterprise(enterprise_id, **kwargs)
-        return [OperationTypeOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(OperationType, OperationTypeOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[OperationTypeOut]:
+        return await cached_page(OperationType, enterprise_id, OperationTypeOut, page, **kwargs)
 
     @classmethod
     async def create(cls, data: OperationTypeCreate, enterprise_id: int) -> OperationTypeOut:
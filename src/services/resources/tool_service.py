@@ -4,7 +4,14 @@ from typing import Any
 from sqlalchemy.orm import selectinload, Load
 
 from src.db.models import Tool
-from src.serializers.resources import ToolOut, ToolCreate, ToolUpdate
+from src.serializers.resources import (
+    ToolOut,
+    ToolCreate,
+    ToolUpdate,
+    PageParams,
+    Page
+)
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class ToolService:
@@ -24,13 +31,12 @@ class ToolService:
         return ToolOut.model_validate(obj)
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs: Any) -> list[ToolOut]:
-        objs = await Tool.list_by_enterprise(
-            enterprise_id=enterprise_id,
-            load_options=cls.get_options(),
-            **kwargs
-        )
-        return [ToolOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(Tool, ToolOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[ToolOut]:
+        return await cached_page(Tool, enterprise_id, ToolOut, page, **kwargs)
 
     @classmethod
     async def create(cls, enterprise_id: int, **kwargs: Any) -> ToolOut:
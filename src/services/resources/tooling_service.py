@@ -2,7 +2,14 @@ from typing import Any
 from sqlalchemy.orm import selectinload, Load
 
 from src.db.models import Tooling
-from src.serializers.resources import ToolingCreate, ToolingUpdate, ToolingOut
+from src.serializers.resources import (
+    ToolingCreate,
+    ToolingUpdate,
+    ToolingOut,
+    PageParams,
+    Page
+)
+from src.services.resources.cache import cached_page, resource_tag
 
 
 class ToolingService:
@@ -22,13 +29,12 @@ class ToolingService:
         return ToolingOut.model_validate(obj)
 
     @classmethod
-    async def list(cls, enterprise_id: int, **kwargs: Any) -> list[ToolingOut]:
-        objs = await Tooling.list_by_enterprise(
-            enterprise_id=enterprise_id,
-            load_options=cls.get_options(),
-            **kwargs
-        )
-        return [ToolingOut.model_validate(obj) for obj in objs]
+    async def etag(cls, enterprise_id: int) -> str | None:
+        return await resource_tag(Tooling, ToolingOut, enterprise_id)
+
+    @classmethod
+    async def list(cls, enterprise_id: int, page: PageParams, **kwargs: Any) -> Page[ToolingOut]:
+        return await cached_page(Tooling, enterprise_id, ToolingOut, page, **kwargs)
 
     @classmethod
     async def create(cls, enterprise_id: int, **kwargs: Any) -> ToolingOut:
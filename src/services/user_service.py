@@ -1,25 +1,73 @@
+import logging
+
+from redis.exceptions import RedisError
+
 from config import settings
-from src.auth import token
 from src.clients import captcha, mail
 from src.db import models
+from src.infrastructure.redis import rate_limit
 from src.serializers.user import (
     UserRegister,
     UserLogin,
     LoginResponse,
     UserOut,
 )
+from src.services.auth_service import AuthService
 from src.services.errors import (
     CaptchaNotVerified,
     NotUniqueEmail,
     InvalidCredentials,
-    UserNotVerified
+    UserNotVerified,
+    RateLimited
 )
 
+log = logging.getLogger("auth")
+
 
 class UserService:
     @staticmethod
-    async def register(dto: UserRegister) -> UserOut:
-        if not await captcha.verify_yandex_captcha(dto.captcha, ip='127.0.0.0'):
+    async def throttle(
+            scope: str,
+            ip: str | None,
+            email: str,
+            per_ip: int,
+            per_email: int,
+            window_seconds: int
+    ) -> None:
+        """
+        Скользящее окно попыток по IP и по email - до bcrypt и писем
+        Если Redis недоступен - пропускаем (вход важнее ограничения)
+        :param scope: login / register
+        :param ip: адрес клиента
+        :param email: email из запроса
+        :param per_ip: попыток с одного IP за окно
+        :param per_email: попыток на один email за окно
+        :param window_seconds: окно
+        :return: None
+        """
+        limits = [rate_limit.Limit(f"{scope}:email", email.strip().lower(), per_email, window_seconds)]
+        if ip:
+            limits.append(rate_limit.Limit(f"{scope}:ip", ip, per_ip, window_seconds))
+        try:
+            retry_after = await rate_limit.hit(*limits)
+        except (RedisError, OSError):
+            log.warning("rate limiter unavailable", exc_info=True)
+            return
+        if retry_after:
+            raise RateLimited(
+                "Too many attempts, try again later",
+                headers={"Retry-After": str(retry_after)}
+            )
+
+    @staticmethod
+    async def register(dto: UserRegister, ip: str | None = None) -> UserOut:
+        await UserService.throttle(
+            "register", ip, dto.email,
+            per_ip=settings.REGISTER_LIMIT_PER_IP,
+            per_email=settings.REGISTER_LIMIT_PER_EMAIL,
+            window_seconds=settings.REGISTER_LIMIT_WINDOW_SECONDS
+        )
+        if not await captcha.verify_yandex_captcha(dto.captcha, ip=ip):
             raise CaptchaNotVerified()
         if await models.User.has_email(dto.email):
             raise NotUniqueEmail()
@@ -28,19 +76,25 @@ class UserService:
         return UserOut.model_validate(user)
 
     @staticmethod
-    async def login(dto: UserLogin) -> LoginResponse:
+    async def login(dto: UserLogin, device_id: str, ip: str | None = None) -> LoginResponse:
+        await UserService.throttle(
+            "login", ip, dto.email,
+            per_ip=settings.LOGIN_LIMIT_PER_IP,
+            per_email=settings.LOGIN_LIMIT_PER_EMAIL,
+            window_seconds=settings.LOGIN_LIMIT_WINDOW_SECONDS
+        )
         user = await models.User.get_by_email(dto.email)
         if not user:
             raise InvalidCredentials()
-        is_valid = user.check_password(dto.password)
+        is_valid = await user.check_password(dto.password)
         if not is_valid:
             raise InvalidCredentials()
         if not user.is_verified:
             # заново отправим письмо, потом ошибку
             mail.send_registration_email(user.id, user.email)
             raise UserNotVerified()
-        refresh_token = await models.RefreshToken.create(user.id)
-        access_token = token.generate_access_token(user.id)
+        refresh_token = await models.RefreshToken.create(user.id, device_id)
+        access_token = await AuthService.issue_access_token(user.id)
         return LoginResponse(
             access_token=access_token,
             refresh_token=refresh_token.token,
@@ -49,6 +103,10 @@ class UserService:
         )
 
     @staticmethod
-    async def logout(user_id: int) -> bool:
-        await models.RefreshToken.delete_by_user_id(user_id)
+    async def logout(user_id: int, device_id: str | None = None) -> bool:
+        # выход с устройства; без id устройства - со всех
+        if device_id:
+            await models.RefreshToken.delete_by_device(user_id, device_id)
+        else:
+            await models.RefreshToken.delete_by_user_id(user_id)
         return True
@@ -3,9 +3,9 @@ import asyncio
 import os
 import pytest
 from typing import AsyncIterator, Callable, Awaitable
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncConnection
 from sqlalchemy import event
-from httpx import AsyncClient
+from httpx import AsyncClient, ASGITransport
 
 from config import settings
 
@@ -15,7 +15,9 @@ TEST_DB_DSN = settings.db_orm_url
 # импортируем твой FastAPI app и зависимости
 from main import app  # где ты регаешь exception handlers и роуты
 from src.db.func import get_session_tx  # твоя DI-зависимость
+from src.db import db
 from src.db.base import Base  # где metadata всех моделей
+from src.db.enums import metal_type_enum, enterprise_type_enum, member_role_enum, member_status_enum
 from src.clients import captcha, mail
 
 @pytest.fixture(scope="session")
@@ -27,6 +29,9 @@ async def engine():
     eng = create_async_engine(TEST_DB_DSN, pool_pre_ping=True)
     async with eng.begin() as conn:
         # если не через alembic — создаём схему
+        # enum-типы объявлены с create_type=False - create_all их не создаёт
+        for enum in (metal_type_enum, enterprise_type_enum, member_role_enum, member_status_enum):
+            await conn.run_sync(enum.create, checkfirst=True)
         await conn.run_sync(Base.metadata.create_all)
     yield eng
     await eng.dispose()
@@ -59,6 +64,26 @@ async def db_session(session_factory) -> AsyncIterator[AsyncSession]:
             # откатываем всё, что сделал тест
             await nested.rollback()
 
+@pytest.fixture
+async def uow_connection(engine, monkeypatch) -> AsyncIterator[AsyncConnection]:
+    """
+    Единицы работы кода (request_session, get_session) открывают сессии на одном соединении
+    во внешней транзакции: их коммиты становятся SAVEPOINT'ами, в конце теста всё откатывается
+    """
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+
+        def _new_session() -> AsyncSession:
+            return AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+
+        async def _new_read_session() -> AsyncSession:
+            return _new_session()
+
+        monkeypatch.setattr(db, "new_session", _new_session)
+        monkeypatch.setattr(db, "new_read_session", _new_read_session)
+        yield conn
+        await transaction.rollback()
+
 @pytest.fixture
 async def app_with_overrides(db_session) -> AsyncIterator:
     """
@@ -75,7 +100,7 @@ async def app_with_overrides(db_session) -> AsyncIterator:
 
 @pytest.fixture
 async def client(app_with_overrides) -> AsyncIterator[AsyncClient]:
-    async with AsyncClient(app=app_with_overrides, base_url="http://test") as ac:
+    async with AsyncClient(transport=ASGITransport(app=app_with_overrides), base_url="http://test") as ac:
         yield ac
 
 # моки капчи и почты
@@ -0,0 +1,161 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from main import app
+from src.auth.dep import get_enterprise_by_user_id
+from src.db import get_session, unit_of_work
+from src.db.enums import EnterpriseType, MetalType
+from src.db.models import AssortmentType, Enterprise, Gost, MaterialCategory, User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def catalog(uow_connection) -> dict[str, int]:
+    """
+    Компания со своей категорией и типом сортамента - всё, что нужно материалу
+    """
+    async with unit_of_work():
+        async with get_session() as session:
+            user = User(email="batch@test.local", password="x")
+            session.add(user)
+            await session.flush()
+            enterprise = Enterprise(owner_id=user.id, name="Batch", enterprise_type=EnterpriseType.LegalEntity)
+            session.add(enterprise)
+            await session.flush()
+            category = MaterialCategory(
+                name="Сталь", material_type=MetalType.FERROUS, enterprise_id=enterprise.id, is_general=False
+            )
+            gost = Gost(number="ГОСТ 1050-2013", enterprise_id=enterprise.id, is_general=False)
+            session.add_all([category, gost])
+            await session.flush()
+            assortment_type = AssortmentType(
+                name="Круг", gost_id=gost.id, enterprise_id=enterprise.id, is_general=False
+            )
+            session.add(assortment_type)
+            await session.flush()
+            return {
+                "enterprise_id": enterprise.id,
+                "category_id": category.id,
+                "assortment_type_id": assortment_type.id,
+            }
+
+
+@pytest.fixture
+async def client(catalog) -> AsyncClient:
+    app.dependency_overrides[get_enterprise_by_user_id] = lambda: catalog["enterprise_id"]
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
+
+
+def material(brand: str, catalog: dict[str, int]) -> dict:
+    # поля API: B_D и material_category_id (в модели - DB и category_id)
+    return {
+        "brand": brand,
+        "B_D": 20.0,
+        "height": 1.0,
+        "strength": 2.0,
+        "length": 3.0,
+        "dense": 7.85,
+        "hardness": 200.0,
+        "tear_resistance": 600.0,
+        "elongation": 16.0,
+        "material_category_id": catalog["category_id"],
+        "assortment_type_id": catalog["assortment_type_id"],
+    }
+
+
+async def test_create_materials_batch(client, catalog):
+    items = [material("Сталь 45", catalog), material("Сталь 20", catalog), material("Сталь 45", catalog)]
+
+    response = await client.post("/resources/materials/batch", json={"items": items})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["brand"] for item in body["items"]] == ["Сталь 45", "Сталь 20"]
+    assert all(item["B_D"] == 20.0 for item in body["items"])
+    assert all(item["material_category_id"] == catalog["category_id"] for item in body["items"])
+    assert body["items"][0]["category"]["id"] == catalog["category_id"]
+    # повтор внутри пакета - ошибка элемента, а не всего пакета
+    assert [(error["index"], error["code"]) for error in body["errors"]] == [(2, "CONFLICT")]
+
+
+async def test_update_materials_batch_rejects_swap(client, catalog):
+    created = await client.post(
+        "/resources/materials/batch",
+        json={"items": [material("A-1", catalog), material("B-1", catalog)]},
+    )
+    a, b = (item["id"] for item in created.json()["items"])
+
+    response = await client.patch(
+        "/resources/materials/batch",
+        json={"items": [{"id": a, "brand": "B-1"}, {"id": b, "brand": "A-1"}, {"id": b, "B_D": 30.0}]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    # обмен значениями уникального поля отклоняется по элементам, остальное проходит
+    assert [(error["index"], error["code"]) for error in body["errors"]] == [(0, "CONFLICT"), (1, "CONFLICT")]
+    assert [(item["id"], item["brand"], item["B_D"]) for item in body["items"]] == [(b, "B-1", 30.0)]
+
+
+async def test_update_material_with_stale_version_conflicts(client, catalog):
+    created = await client.post("/resources/materials", json=material("C-1", catalog))
+    obj = created.json()
+    assert obj["version"] == 1
+
+    updated = await client.put(f"/resources/materials/{obj['id']}", json={"brand": "C-2", "version": 1})
+    assert updated.status_code == 200
+    assert (updated.json()["brand"], updated.json()["version"]) == ("C-2", 2)
+
+    # второй клиент прочитал версию 1 и опоздал
+    stale = await client.put(f"/resources/materials/{obj['id']}", json={"brand": "C-3", "version": 1})
+    assert stale.status_code == 409
+    stale = await client.delete(f"/resources/materials/{obj['id']}", params={"version": 1})
+    assert stale.status_code == 409
+
+    deleted = await client.delete(f"/resources/materials/{obj['id']}", params={"version": 2})
+    assert deleted.status_code == 200
+
+
+async def test_update_materials_batch_checks_versions(client, catalog):
+    created = await client.post(
+        "/resources/materials/batch",
+        json={"items": [material("D-1", catalog), material("E-1", catalog)]},
+    )
+    d, e = (item["id"] for item in created.json()["items"])
+
+    response = await client.patch(
+        "/resources/materials/batch",
+        json={"items": [
+            {"id": d, "brand": "D-2", "version": 1},
+            {"id": e, "brand": "E-2", "version": 5},
+            {"id": d, "B_D": 30.0, "version": 2},
+        ]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [(error["index"], error["code"]) for error in body["errors"]] == [(1, "CONFLICT")]
+    assert [(item["id"], item["version"]) for item in body["items"]] == [(d, 3), (d, 3)]
+
+
+async def test_next_cursor_is_readable_cross_origin(client, catalog):
+    await client.post(
+        "/resources/materials/batch",
+        json={"items": [material("F-1", catalog), material("F-2", catalog)]},
+    )
+
+    # запрос фронта с другого origin с cookie (allow_credentials)
+    response = await client.get(
+        "/resources/materials",
+        params={"limit": 1},
+        headers={"Origin": "http://localhost:5174"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.headers["X-Next-Cursor"]
+    # "*" для запросов с credentials браузер не раскрывает - нужен явный список
+    exposed = [value.strip().lower() for value in response.headers["Access-Control-Expose-Headers"].split(",")]
+    assert "x-next-cursor" in exposed
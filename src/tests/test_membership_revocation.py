@@ -0,0 +1,80 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import select
+
+from src.db import get_session, unit_of_work
+from src.db.enums import EnterpriseType, MemberRole
+from src.db.models import Enterprise, EnterpriseMember, User
+from src.infrastructure.celery.membership import resync_membership
+from src.infrastructure.redis import claims_revocation, membership_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def enterprise_id(uow_connection) -> int:
+    async with unit_of_work():
+        async with get_session() as session:
+            owner = User(email="owner@test.local", password="x")
+            session.add(owner)
+            await session.flush()
+            enterprise = Enterprise(owner_id=owner.id, name="Revoke", enterprise_type=EnterpriseType.LegalEntity)
+            session.add(enterprise)
+            await session.flush()
+            return enterprise.id
+
+
+@pytest.fixture
+def redis_calls(monkeypatch) -> list[tuple[str, int]]:
+    """
+    Redis недоступен для отзыва claims, сброс кеша - проходит
+    """
+    calls = []
+
+    async def _revoke(user_id: int) -> None:
+        calls.append(("revoke", user_id))
+        raise RedisConnectionError("redis is down")
+
+    async def _revoke_if_missing(user_id: int, changed_at: float) -> bool:
+        calls.append(("revoke_if_missing", user_id))
+        return True
+
+    async def _invalidate(user_id: int) -> None:
+        calls.append(("invalidate", user_id))
+
+    monkeypatch.setattr(claims_revocation, "revoke", _revoke)
+    monkeypatch.setattr(claims_revocation, "revoke_if_missing", _revoke_if_missing)
+    monkeypatch.setattr(membership_cache, "invalidate", _invalidate)
+    return calls
+
+
+async def join(enterprise_id: int) -> int:
+    async with unit_of_work():
+        async with get_session() as session:
+            user = User(email="member@test.local", password="x")
+            session.add(user)
+            await session.flush()
+            await EnterpriseMember.create_with_session(
+                session, enterprise_id=enterprise_id, user_id=user.id, role=MemberRole.EMPLOYEE
+            )
+            return user.id
+
+
+async def test_membership_change_is_recorded_and_resynced(enterprise_id, redis_calls):
+    user_id = await join(enterprise_id)
+
+    # отказ отзыва не отменил сброс кеша
+    assert ("revoke", user_id) in redis_calls
+    assert ("invalidate", user_id) in redis_calls
+    async with unit_of_work():
+        async with get_session() as session:
+            changed_at = await session.scalar(select(User.membership_changed_at).where(User.id == user_id))
+    assert changed_at is not None
+
+    # celery досылает отзыв по метке в БД
+    redis_calls.clear()
+    async with unit_of_work():
+        revoked = await resync_membership(interval=30)
+    assert revoked >= 1
+    assert ("revoke_if_missing", user_id) in redis_calls
+    assert ("invalidate", user_id) in redis_calls
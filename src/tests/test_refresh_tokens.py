@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from src.db import get_session
+from src.db.models import User
+from src.db.models.users import RefreshToken
+from src.services.errors import RefreshTokenExpired, RefreshTokenInvalid, RefreshTokenRevoked
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def session_token(uow_connection) -> RefreshToken:
+    async with get_session() as session:
+        user = User(email="refresh@test.local", password="x")
+        session.add(user)
+        await session.flush()
+    return await RefreshToken.create(user.id, "device-1")
+
+
+async def set_token(token_id: int, **values) -> None:
+    async with get_session() as session:
+        await session.execute(update(RefreshToken).where(RefreshToken.id == token_id).values(**values))
+
+
+async def device_exists(token_id: int) -> bool:
+    async with get_session() as session:
+        return await session.scalar(select(RefreshToken.id).where(RefreshToken.id == token_id)) is not None
+
+
+async def test_rotate_issues_new_token(session_token):
+    rotated = await RefreshToken.rotate(session_token.token)
+
+    assert rotated.token and rotated.token != session_token.token
+    # новый токен тоже работает
+    assert (await RefreshToken.rotate(rotated.token)).token
+
+
+async def test_concurrent_refresh_within_grace_keeps_session(session_token):
+    rotated = await RefreshToken.rotate(session_token.token)
+
+    # вторая вкладка пришла со старой cookie сразу после первой
+    again = await RefreshToken.rotate(session_token.token)
+
+    assert again.id == rotated.id
+    assert again.token is None
+    assert await device_exists(rotated.id)
+
+
+async def test_reuse_after_grace_revokes_device(session_token):
+    rotated = await RefreshToken.rotate(session_token.token)
+    await set_token(rotated.id, rotated_at=datetime.now() - timedelta(minutes=5))
+
+    with pytest.raises(RefreshTokenRevoked):
+        await RefreshToken.rotate(session_token.token)
+
+    # украденный токен завершает сессию устройства целиком
+    assert not await device_exists(rotated.id)
+    with pytest.raises(RefreshTokenInvalid):
+        await RefreshToken.rotate(rotated.token)
+
+
+async def test_expired_and_unknown_tokens(session_token):
+    await set_token(session_token.id, expires_at=datetime.now() - timedelta(seconds=1))
+
+    with pytest.raises(RefreshTokenExpired):
+        await RefreshToken.rotate(session_token.token)
+    with pytest.raises(RefreshTokenInvalid):
+        await RefreshToken.rotate("unknown")
@@ -0,0 +1,62 @@
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import IntegrityError
+
+from src.db import db, get_session, request_session
+from src.handlers.error_handler import register_exception_handlers
+
+pytestmark = pytest.mark.anyio
+
+
+class _UniqueViolation(Exception):
+    sqlstate = "23505"
+
+
+class _FailingCommitSession:
+    """
+    Сессия, у которой коммит падает, как на отложенном flush уникального индекса
+    """
+
+    def __init__(self) -> None:
+        self.rolled_back = False
+
+    async def commit(self) -> None:
+        raise IntegrityError("INSERT INTO ...", {}, _UniqueViolation())
+
+    async def rollback(self) -> None:
+        self.rolled_back = True
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def failing_session(monkeypatch) -> _FailingCommitSession:
+    session = _FailingCommitSession()
+    monkeypatch.setattr(db, "new_session", lambda: session)
+    return session
+
+
+@pytest.fixture
+def probe_app() -> FastAPI:
+    # как в main.py: единица работы на запрос, коммит до отправки ответа
+    app = FastAPI(dependencies=[Depends(request_session, scope="function")])
+    register_exception_handlers(app)
+
+    @app.post("/write")
+    async def write() -> dict:
+        async with get_session():
+            pass
+        return {"ok": True}
+
+    return app
+
+
+async def test_commit_error_is_translated_before_response(probe_app, failing_session):
+    async with AsyncClient(transport=ASGITransport(app=probe_app), base_url="http://test") as client:
+        response = await client.post("/write")
+
+    # ошибка коммита не должна уйти клиенту как 200 {"ok": true}
+    assert response.status_code == 409
+    assert failing_session.rolled_back
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+import src.db.models  # noqa: F401 - регистрирует все модели
+from src.db.base import Base
+from src.db.enums import SearchMode
+from src.db.utils import orm
+
+pytestmark = pytest.mark.anyio
+
+
+def searchable_models() -> list[tuple[type, str, str]]:
+    """
+    Модели с trgm-индексом: (модель, колонка поиска, имя индекса)
+    """
+    result = []
+    for mapper in Base.registry.mappers:
+        for index in mapper.local_table.indexes:
+            if index.name.endswith("_trgm"):
+                (column,) = index.columns
+                result.append((mapper.class_, column.name, index.name))
+    return sorted(result, key=lambda item: item[2])
+
+
+@pytest.mark.parametrize("mode", [SearchMode.CONTAINS, SearchMode.PREFIX])
+@pytest.mark.parametrize(
+    "model, field, index_name",
+    searchable_models(),
+    ids=lambda value: value if isinstance(value, str) else None
+)
+async def test_search_filter_uses_trgm_index(engine, model, field, index_name, mode):
+    # тот же фильтр, что строят list/page_by_enterprise
+    stmt = select(model.id).where(*orm.build_filters(model, {field: "abc"}, mode))
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+
+    async with engine.connect() as conn:
+        async with conn.begin() as transaction:
+            # таблицы в тестах пустые: без этого планировщику дешевле seq scan,
+            # с ним индекс берётся, только если он вообще подходит к условию
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+            plan = "\n".join(row[0] for row in await conn.execute(text(f"EXPLAIN {sql}")))
+            await transaction.rollback()
+
+    assert index_name in plan, plan
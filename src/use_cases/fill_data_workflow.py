@@ -52,7 +52,7 @@ class FillDataWorkflow:
                     await models.LegalEntity.create_with_session(
                         session=session,
                         enterprise_id=enterprise.id,
-                        **dto.fill.model_dump()
+                        **dto.fill.model_dump(exclude={'legal_entity_profile'})
                     )
                 case EnterpriseType.LegalEntityProfile:
                     legal_entity = dto.fill
@@ -65,7 +65,7 @@ class FillDataWorkflow:
                     legal = await models.LegalEntity.create_with_session(
                         session=session,
                         enterprise_id=enterprise.id,
-                        **legal_entity.model_dump()
+                        **legal_entity.model_dump(exclude={'legal_entity_profile'})
                     )
                     await models.LegalEntityProfile.create_with_session(
                         session=session,